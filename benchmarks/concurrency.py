@@ -0,0 +1,175 @@
+"""
+Compare the sync (threadpool) and async route handlers of /tasks/get_tasks
+under 50, 500 and 5000 concurrent clients
+
+MongoDB is replaced by an in-process collection that sleeps for a fixed
+latency on every operation, so the numbers reflect how many requests each
+handler style can keep in flight rather than the speed of a real database
+
+Usage: python -m benchmarks.concurrency [--latency-ms 50] [--output out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+os.environ.setdefault("SECRET_KEY", "benchmark_secret_key")
+for rate_limit_env in (
+    "RATE_LIMIT_AUTH_IP",
+    "RATE_LIMIT_LOGIN_EMAIL",
+    "RATE_LIMIT_TASKS_IP",
+    "RATE_LIMIT_TASKS_EMAIL",
+):
+    os.environ.setdefault(rate_limit_env, "")
+# Every request has to go through the simulated database latency
+os.environ.setdefault("TASKS_CACHE_SIZE", "0")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from src.auth.auth import Auth, oauth2_scheme  # noqa: E402
+from src.main import app as async_app  # noqa: E402
+from src.tasks.service import Tasks  # noqa: E402
+
+CONCURRENCY_LEVELS = (50, 500, 5000)
+USER_EMAIL = "benchmark@example.com"
+
+
+class SlowCollection:
+    """
+    Collection stand-in that blocks the calling
+    thread for a fixed latency on every operation
+    """
+
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+        self._user = {"_id": "benchmark_id", "email": USER_EMAIL}
+        self._tasks = [
+            {"name": f"Task {i}", "description": "Benchmark", "priority": "Low"}
+            for i in range(10)
+        ]
+
+    def find_one(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        time.sleep(self._latency)
+        return self._user
+
+    def find(self, *args: Any, **kwargs: Any) -> "SlowCursor":
+        time.sleep(self._latency)
+        return SlowCursor(self._tasks)
+
+
+class SlowCursor(list):
+    """
+    Cursor stand-in over an already fetched list
+    """
+
+    def sort(self, *args: Any, **kwargs: Any) -> "SlowCursor":
+        return self
+
+    def limit(self, limit: int) -> "SlowCursor":
+        return SlowCursor(self[:limit])
+
+
+class SlowClient:
+    """
+    MongoClient stand-in exposing a single slow collection
+    """
+
+    def __init__(self, latency: float) -> None:
+        self._collection = SlowCollection(latency)
+
+    def __getitem__(self, name: str) -> "SlowClient":
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+
+def build_sync_app() -> FastAPI:
+    """
+    Build an app with the previous sync handler, which
+    runs on Starlette's default 40 thread pool
+    """
+
+    sync_app = FastAPI()
+
+    @sync_app.post("/tasks/get_tasks")
+    def get_tasks(user_email: str, token: str = Depends(oauth2_scheme)):
+        return {"tasks": Tasks().get_user_tasks(email=user_email, token=token)}
+
+    return sync_app
+
+
+async def run_scenario(
+    app: FastAPI, concurrency: int, total_requests: int, token: str
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    remaining = total_requests
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.post(
+                    f"/tasks/get_tasks?user_email={USER_EMAIL}", headers=headers
+                )
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    token = Auth().create_access_token()
+    client = SlowClient(args.latency_ms / 1000)
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    with patch(
+        "src.database.Database.Database.instantiate_client", return_value=client
+    ):
+        for name, app in (("sync", build_sync_app()), ("async", async_app)):
+            results[name] = {}
+            for concurrency in CONCURRENCY_LEVELS:
+                total_requests = max(2 * concurrency, 1000)
+                stats = asyncio.run(
+                    run_scenario(app, concurrency, total_requests, token)
+                )
+                results[name][str(concurrency)] = stats
+                print(
+                    f"{name:>5} c={concurrency:<5} p50={stats['p50_ms']:>8} ms "
+                    f"p99={stats['p99_ms']:>8} ms rps={stats['rps']:>8}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare the serialization of the /tasks/get_tasks response body
+for 100, 10k and 100k tasks
+
+- before: jsonable_encoder followed by JSONResponse (stdlib json),
+  what FastAPI does with a plain dict returned by a route
+- default: jsonable_encoder followed by ORJSONResponse, what the
+  routes that return a plain dict do now
+- after: ORJSONResponse straight from the task documents, what
+  /tasks/get_tasks does now
+
+Usage: python -m benchmarks.serialization [--output out.json]
+"""
+
+import argparse
+import json
+import statistics
+import timeit
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+TASK_COUNTS = (100, 10_000, 100_000)
+
+
+def build_tasks(task_count: int) -> List[Dict[str, str]]:
+    return [
+        {
+            "name": f"Task {index:06d}",
+            "description": "Benchmark task with a short description",
+            "priority": ("Low", "Medium", "High")[index % 3],
+        }
+        for index in range(task_count)
+    ]
+
+
+def measure(func: Callable[[], Any], task_count: int) -> float:
+    """
+    Time a function and return its median duration in milliseconds
+    """
+
+    number = max(1, 10_000 // task_count)
+    timings = timeit.repeat(func, repeat=5, number=number)
+
+    return round(statistics.median(timings) / number * 1000, 3)
+
+
+def run() -> Dict[str, Dict[str, float]]:
+    results = {}
+
+    for task_count in TASK_COUNTS:
+        content = {"tasks": build_tasks(task_count), "next_cursor": None}
+
+        before = measure(
+            lambda: JSONResponse(jsonable_encoder(content)).body, task_count
+        )
+        default = measure(
+            lambda: ORJSONResponse(jsonable_encoder(content)).body, task_count
+        )
+        after = measure(lambda: ORJSONResponse(content).body, task_count)
+
+        results[str(task_count)] = {
+            "before_ms": before,
+            "default_ms": default,
+            "after_ms": after,
+            "speedup": round(before / after, 1),
+        }
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run()
+
+    print(f"{'tasks':>8} {'before ms':>12} {'default ms':>12} {'after ms':>12}")
+    for task_count, metrics in results.items():
+        print(
+            f"{task_count:>8} {metrics['before_ms']:>12} {metrics['default_ms']:>12}"
+            f" {metrics['after_ms']:>12}  x{metrics['speedup']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
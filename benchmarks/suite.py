@@ -0,0 +1,403 @@
+"""
+Reproducible benchmark suite of the API
+
+Runs against the in-process app with the in-memory database backend,
+so no database or network is needed. It measures:
+
+- micro-benchmarks of the token, password and task listing code paths
+- HTTP load scenarios of every endpoint through an in-process ASGI client
+
+Usage:
+    python -m benchmarks.suite run [--output results.json] [--quick]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.2]
+
+compare exits with status 1 when any metric regresses beyond the threshold
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+os.environ.setdefault("SECRET_KEY", "benchmark_secret_key")
+for rate_limit_env in (
+    "RATE_LIMIT_AUTH_IP",
+    "RATE_LIMIT_LOGIN_EMAIL",
+    "RATE_LIMIT_TASKS_IP",
+    "RATE_LIMIT_TASKS_EMAIL",
+):
+    os.environ.setdefault(rate_limit_env, "")
+
+import httpx  # noqa: E402
+
+from src.auth.auth import Auth, token_cache  # noqa: E402
+from src.auth.hashing import (  # noqa: E402
+    PASSWORD_HASHING_QUEUE_SIZE,
+    PASSWORD_HASHING_WORKERS,
+    pwd_context,
+)
+from src.database.Database import Database  # noqa: E402
+from src.database.indexes import Indexes  # noqa: E402
+from src.database.memory import InMemoryClient  # noqa: E402
+from src.main import app  # noqa: E402
+from src.tasks.exceptions import TaskAlreadyExists, TaskDoesNotExist  # noqa: E402
+from src.tasks.schemas import Task  # noqa: E402
+from src.tasks.service import Tasks, tasks_cache  # noqa: E402
+
+TASK_COUNTS = (10, 1000, 10000)
+WRITE_TASK_COUNTS = (1000, 100000)
+PASSWORD = "benchmark_password"
+LOWER_IS_BETTER = {"median_us", "p50_ms", "p99_ms"}
+HIGHER_IS_BETTER = {"rps"}
+
+
+def use_in_memory_database() -> InMemoryClient:
+    """
+    Replace the process-wide MongoDB client
+    with a fresh in-memory one
+    """
+
+    Database.close_client()
+    client = InMemoryClient()
+    Database._client = client
+    Indexes().sync()
+
+    return client
+
+
+def seed_user(client: InMemoryClient, email: str, task_count: int) -> None:
+    """
+    Insert a user with a number of tasks
+    """
+
+    user_id = client["users_db"]["users_collection"].insert_one(
+        {"name": "Benchmark", "email": email, "password": pwd_context.hash(PASSWORD)}
+    ).inserted_id
+
+    if task_count:
+        client["users_db"]["tasks_collection"].insert_many(
+            [
+                {
+                    "user_id": user_id,
+                    "name": f"Task {index:06d}",
+                    "description": "Benchmark task",
+                    "priority": ("Low", "Medium", "High")[index % 3],
+                }
+                for index in range(task_count)
+            ]
+        )
+
+
+def measure(func: Callable[[], Any], repeat: int, number: int) -> Dict[str, float]:
+    """
+    Time a function and return its per call statistics in microseconds
+    """
+
+    timings = [
+        seconds / number * 1e6
+        for seconds in timeit.repeat(func, repeat=repeat, number=number)
+    ]
+
+    return {
+        "median_us": round(statistics.median(timings), 2),
+        "min_us": round(min(timings), 2),
+    }
+
+
+def run_micro_benchmarks(quick: bool) -> Dict[str, Dict[str, float]]:
+    results = {}
+    auth = Auth()
+    token = auth.create_access_token()
+    password_hash = pwd_context.hash(PASSWORD)
+
+    def decode_token_uncached() -> None:
+        token_cache.clear()
+        auth.decode_token(token)
+
+    results["create_access_token"] = measure(auth.create_access_token, 5, 200)
+    results["decode_token_uncached"] = measure(decode_token_uncached, 5, 200)
+    results["decode_token_cached"] = measure(lambda: auth.decode_token(token), 5, 200)
+    results["pwd_context_hash"] = measure(lambda: pwd_context.hash(PASSWORD), 3, 1)
+    results["pwd_context_verify"] = measure(
+        lambda: pwd_context.verify(PASSWORD, password_hash), 3, 1
+    )
+
+    for task_count in TASK_COUNTS[:2] if quick else TASK_COUNTS:
+        client = use_in_memory_database()
+        email = f"micro_{task_count}@example.com"
+        seed_user(client, email, task_count)
+        tasks = Tasks()
+
+        def get_user_tasks_uncached() -> None:
+            tasks_cache.clear()
+            tasks.get_user_tasks(email=email, token=token)
+
+        results[f"get_user_tasks_{task_count}"] = measure(
+            get_user_tasks_uncached, 3, 1
+        )
+        results[f"get_user_tasks_cached_{task_count}"] = measure(
+            lambda: tasks.get_user_tasks(email=email, token=token), 3, 5
+        )
+        results[f"get_user_tasks_page_{task_count}"] = measure(
+            lambda: tasks.get_user_tasks(email=email, token=token, limit=50), 3, 5
+        )
+
+    # Writes find the task by its name in the unique index, so their
+    # cost should not grow with the number of tasks of the user
+    new_task = Task(name="New task", description="Benchmark task", priority="Low")
+    existing_task = Task(name="Task 000000", description="Benchmark", priority="Low")
+
+    for task_count in WRITE_TASK_COUNTS:
+        client = use_in_memory_database()
+        email = f"write_{task_count}@example.com"
+        seed_user(client, email, task_count)
+        tasks = Tasks()
+
+        def add_and_delete_task() -> None:
+            tasks.add_task(email=email, new_task=new_task, token=token)
+            tasks.delete_task(email=email, task_name=new_task.name, token=token)
+
+        def add_duplicate_task() -> None:
+            try:
+                tasks.add_task(email=email, new_task=existing_task, token=token)
+            except TaskAlreadyExists:
+                pass
+
+        def delete_missing_task() -> None:
+            try:
+                tasks.delete_task(email=email, task_name="Missing", token=token)
+            except TaskDoesNotExist:
+                pass
+
+        results[f"add_delete_task_{task_count}"] = measure(
+            add_and_delete_task, 3, 100
+        )
+        results[f"add_duplicate_task_{task_count}"] = measure(
+            add_duplicate_task, 3, 100
+        )
+        results[f"delete_missing_task_{task_count}"] = measure(
+            delete_missing_task, 3, 100
+        )
+
+    return results
+
+
+async def run_http_scenario(
+    name: str,
+    requests: List[Tuple[str, str, Dict[str, Any]]],
+    concurrency: int,
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    queue = list(reversed(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+
+        async def worker() -> None:
+            while queue:
+                method, url, kwargs = queue.pop()
+                start = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    raise RuntimeError(
+                        f"{name}: {response.status_code} {response.text}"
+                    )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+def run_http_benchmarks(quick: bool) -> Dict[str, Dict[str, float]]:
+    results = {}
+    client = use_in_memory_database()
+    bcrypt_requests = 10 if quick else 40
+    task_requests = 200 if quick else 1000
+    concurrency = 20
+    # Stay within the password hashing pool so that no request is rejected
+    bcrypt_concurrency = min(
+        concurrency, PASSWORD_HASHING_WORKERS + PASSWORD_HASHING_QUEUE_SIZE
+    )
+
+    email = "http@example.com"
+    seed_user(client, email, 100)
+    headers = {"Authorization": f"Bearer {Auth().create_access_token()}"}
+
+    def task_json(index: int) -> Dict[str, str]:
+        return {"name": f"New {index}", "description": "Benchmark", "priority": "Low"}
+
+    scenarios = {
+        "register": [
+            (
+                "POST",
+                "/auth/register",
+                {
+                    "json": {
+                        "name": "Benchmark",
+                        "email": f"register_{index}@example.com",
+                        "password": PASSWORD,
+                    }
+                },
+            )
+            for index in range(bcrypt_requests)
+        ],
+        "token": [
+            ("POST", "/auth/token", {"data": {"username": email, "password": PASSWORD}})
+        ]
+        * bcrypt_requests,
+        "get_tasks": [
+            ("POST", f"/tasks/get_tasks?user_email={email}", {"headers": headers})
+        ]
+        * task_requests,
+        "get_tasks_not_modified": [
+            (
+                "POST",
+                f"/tasks/get_tasks?user_email={email}",
+                {"headers": {**headers, "If-None-Match": '"0"'}},
+            )
+        ]
+        * task_requests,
+        "add_task": [
+            (
+                "PATCH",
+                f"/tasks/add_task?user_email={email}",
+                {"headers": headers, "json": task_json(index)},
+            )
+            for index in range(task_requests)
+        ],
+        "delete_task": [
+            (
+                "PATCH",
+                f"/tasks/delete_task?user_email={email}&task_name=New {index}",
+                {"headers": headers},
+            )
+            for index in range(task_requests)
+        ],
+        "bulk_tasks": [
+            (
+                "PATCH",
+                f"/tasks/bulk_tasks?user_email={email}",
+                {
+                    "headers": headers,
+                    "json": {
+                        "operations": [
+                            {"op": "add", "task": task_json(index * 100 + offset)}
+                            for offset in range(100)
+                        ]
+                    },
+                },
+            )
+            for index in range(task_requests // 10)
+        ],
+    }
+
+    for name, requests in scenarios.items():
+        scenario_concurrency = (
+            bcrypt_concurrency if name in ("register", "token") else concurrency
+        )
+        results[name] = asyncio.run(
+            run_http_scenario(name, requests, scenario_concurrency)
+        )
+
+    return results
+
+
+def run(output: str, quick: bool) -> Dict[str, Any]:
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+        },
+        "micro": run_micro_benchmarks(quick),
+        "http": run_http_benchmarks(quick),
+    }
+
+    Database._client = None
+
+    for group in ("micro", "http"):
+        for name, metrics in results[group].items():
+            formatted = " ".join(f"{key}={value}" for key, value in metrics.items())
+            print(f"{group:>5} {name:<30} {formatted}")
+
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    return results
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(current_path) as current_file:
+        current = json.load(current_file)
+
+    regressions = 0
+
+    for group in ("micro", "http"):
+        for name, metrics in current.get(group, {}).items():
+            for metric, value in metrics.items():
+                base_value = baseline.get(group, {}).get(name, {}).get(metric)
+
+                if not base_value or metric not in LOWER_IS_BETTER | HIGHER_IS_BETTER:
+                    continue
+
+                change = (value - base_value) / base_value
+                regressed = (
+                    change > threshold
+                    if metric in LOWER_IS_BETTER
+                    else change < -threshold
+                )
+                regressions += regressed
+                print(
+                    f"{'REGRESSION' if regressed else 'ok':<10} {group}.{name}.{metric}"
+                    f" {base_value} -> {value} ({change:+.1%})"
+                )
+
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--output", help="Write the results as JSON to this path")
+    run_parser.add_argument("--quick", action="store_true")
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args.output, args.quick)
+    else:
+        sys.exit(compare(args.baseline, args.current, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
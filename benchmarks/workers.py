@@ -0,0 +1,204 @@
+"""
+Measure how the throughput of the production server scales with its workers
+
+Starts python -m src.server with 1, 2, 4... workers up to the number of CPUs
+and loads POST /tasks/get_tasks from several client processes. With the
+default in-memory database every worker has its own data, so the requests
+look up a user that does not exist, going through the token check, the rate
+limits, the user lookup and the error response. With --mongodb-uri a user
+with 100 tasks is seeded and listed instead
+
+Usage: python -m benchmarks.workers [--duration 10] [--clients 4] [--output out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark_secret_key")
+
+import httpx  # noqa: E402
+
+from src.auth.auth import Auth  # noqa: E402
+
+USER_EMAIL = "workers@example.com"
+PASSWORD = "benchmark_password"
+
+
+def get_worker_counts(cpus: int) -> List[int]:
+    """
+    Get 1, 2, 4... workers up to the number of CPUs
+    """
+
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+
+    return counts
+
+
+def start_server(workers: int, port: int, mongodb_uri: Optional[str]) -> Any:
+    """
+    Start the production server and wait until every worker is ready
+    """
+
+    environment = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "SERVER_PORT": str(port),
+        "SERVER_MAX_REQUESTS": "0",
+        "RATE_LIMIT_AUTH_IP": "",
+        "RATE_LIMIT_LOGIN_EMAIL": "",
+        "RATE_LIMIT_TASKS_IP": "",
+        "RATE_LIMIT_TASKS_EMAIL": "",
+    }
+
+    if mongodb_uri:
+        environment.update(DATABASE_BACKEND="mongodb", MONGODB_URI=mongodb_uri)
+    else:
+        environment.update(DATABASE_BACKEND="memory")
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server"],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 60
+    ready = 0
+
+    # The readiness probe of every worker has to answer before loading
+    while ready < workers * 5 and time.monotonic() < deadline:
+        try:
+            response = httpx.get(f"http://127.0.0.1:{port}/readyz", timeout=1)
+            ready = ready + 1 if response.status_code == 200 else 0
+        except httpx.HTTPError:
+            ready = 0
+        time.sleep(0.1)
+
+    return server
+
+
+def seed_user(base_url: str) -> None:
+    """
+    Register the benchmark user with 100 tasks through the API
+    """
+
+    httpx.post(
+        f"{base_url}/auth/register",
+        json={
+            "name": "Benchmark",
+            "email": USER_EMAIL,
+            "password": PASSWORD,
+            "tasks": [
+                {"name": f"Task {index}", "description": "Benchmark", "priority": "Low"}
+                for index in range(100)
+            ],
+        },
+    )
+
+
+async def load(
+    base_url: str, token: str, concurrency: int, duration: float
+) -> List[float]:
+    latencies: List[float] = []
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency)
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post(
+                    f"/tasks/get_tasks?user_email={USER_EMAIL}", headers=headers
+                )
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code in (200, 404), response.text
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return latencies
+
+
+def run_client(arguments: Dict[str, Any]) -> List[float]:
+    return asyncio.run(load(**arguments))
+
+
+def run_scenario(
+    workers: int, args: argparse.Namespace, token: str
+) -> Dict[str, float]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(workers, args.port, args.mongodb_uri)
+
+    try:
+        if args.mongodb_uri:
+            seed_user(base_url)
+
+        client_arguments = {
+            "base_url": base_url,
+            "token": token,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+        }
+
+        with multiprocessing.Pool(args.clients) as pool:
+            latencies = [
+                latency
+                for client_latencies in pool.map(
+                    run_client, [client_arguments] * args.clients
+                )
+                for latency in client_latencies
+            ]
+    finally:
+        server.terminate()
+        server.wait()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "rps": round(len(latencies) / args.duration, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, nargs="*")
+    parser.add_argument("--mongodb-uri")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    token = Auth().create_access_token()
+    results: Dict[str, Dict[str, float]] = {}
+
+    for workers in args.workers or get_worker_counts(os.cpu_count() or 1):
+        stats = run_scenario(workers, args, token)
+        results[str(workers)] = stats
+        print(
+            f"workers={workers:<3} p50={stats['p50_ms']:>8} ms "
+            f"p99={stats['p99_ms']:>8} ms rps={stats['rps']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,223 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 
 from src.auth.exceptions import TokenError
+from src.metrics import Counter, Gauge, registry, timed
 
 load_dotenv()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+
+
+class TokenCache:
+    """
+    Class in charge of remembering the claims of
+    the tokens that were already verified, until
+    they expire, so that the signature of a token
+    is only checked once
+
+    Tokens are stored by their SHA-256 digest and
+    the least recently used one is evicted when
+    the cache is full
+
+    Attributes
+    ----------
+    _max_size : int
+        Maximum number of cached tokens
+    _entries : OrderedDict[bytes, Tuple[float, Dict[str, Any]]]
+        Expiration and claims of every cached token
+    _lock : threading.Lock
+        Lock guarding the entries and the counters
+    _hits : int
+        Number of tokens found in the cache
+    _misses : int
+        Number of tokens not found in the cache
+    _evictions : int
+        Number of tokens evicted to make room
+
+    Methods
+    -------
+    get()
+        Get the claims of a cached token
+    set()
+        Cache the claims of a verified token
+    clear()
+        Remove every cached token
+    stats()
+        Get the counters of the cache
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE) -> None:
+        """
+        Initialize TokenCache class
+        """
+
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """
+        Get the key of a token in the cache
+
+        Parameters
+        ----------
+        token : str
+            Token to be cached
+
+        Returns
+        -------
+        bytes
+            SHA-256 digest of the token
+        """
+
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the claims of a cached token
+        that has not expired yet
+
+        Parameters
+        ----------
+        token : str
+            Token to be looked up
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Claims of the token if cached
+        """
+
+        digest = self._digest(token)
+
+        with self._lock:
+            entry = self._entries.get(digest)
+
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[digest]
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self._hits += 1
+
+            return entry[1]
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """
+        Cache the claims of a verified token,
+        tokens without expiration are not cached
+
+        Parameters
+        ----------
+        token : str
+            Verified token
+        claims : Dict[str, Any]
+            Claims of the token
+        """
+
+        expiration = claims.get("exp")
+
+        if not isinstance(expiration, (int, float)) or self._max_size <= 0:
+            return
+
+        digest = self._digest(token)
+
+        with self._lock:
+            self._entries[digest] = (expiration, claims)
+            self._entries.move_to_end(digest)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove every cached token
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the counters of the cache
+
+        Returns
+        -------
+        Dict[str, int]
+            Hits, misses, evictions and size
+        """
+
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
+
+
+token_cache = TokenCache()
+
+for stat_name, metric_class in (
+    ("hits", Counter),
+    ("misses", Counter),
+    ("evictions", Counter),
+    ("size", Gauge),
+):
+    registry.register(
+        metric_class(
+            f"token_cache_{stat_name}" + ("_total" if metric_class is Counter else ""),
+            f"Verified token cache {stat_name}",
+            function=lambda stat_name=stat_name: token_cache.stats()[stat_name],
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def get_signing_key(secret_key: str, algorithm: str) -> Key:
+    """
+    Build the key used to sign and verify the tokens
+    once instead of on every encode and decode
+
+    Parameters
+    ----------
+    secret_key : str
+        Secret of the key
+    algorithm : str
+        Algorithm of the key
+
+    Returns
+    -------
+    Key
+        Signing key
+    """
+
+    return jwk.construct(secret_key, algorithm)
+
 
 class Auth:
     """
@@ -22,6 +229,8 @@ class Auth:
     ----------
     _secret_key : str
         Key to use in the token generation
+    _signing_key : Union[Key, str, None]
+        Precomputed key, the secret if it is not set
     _algorithm : str
         Algorithm to encode the data
     _expire_minutes : int
@@ -31,6 +240,8 @@ class Auth:
     -------
     create_access_token()
         Create access token
+    decode_token()
+        Decode token to check if it is valid
     """
 
     def __init__(self):
@@ -41,6 +252,11 @@ class Auth:
         self._secret_key = os.getenv("SECRET_KEY")
         self._algorithm = "HS256"
         self._expire_minutes = 30
+        self._signing_key: Union[Key, str, None] = (
+            get_signing_key(self._secret_key, self._algorithm)
+            if self._secret_key
+            else self._secret_key
+        )
 
     def create_access_token(self) -> str:
         """
@@ -54,19 +270,28 @@ class Auth:
 
         return jwt.encode(
             {"exp": datetime.utcnow() + timedelta(minutes=self._expire_minutes)},
-            self._secret_key,
+            self._signing_key,
             algorithm=self._algorithm,
         )
 
-    def decode_token(self, token: str) -> None:
+    @timed("decode_token")
+    def decode_token(self, token: str) -> Dict[str, Any]:
         """
-        Decode token to check if it is valid
+        Decode token to check if it is valid,
+        skipping the signature check for tokens
+        that were already verified and have
+        not expired yet
 
         Parameters
         ----------
         token : str
             Token to be decoded
 
+        Returns
+        -------
+        Dict[str, Any]
+            Claims of the token
+
         Raises
         ------
         TokenError
@@ -74,7 +299,18 @@ class Auth:
             arises when decoding a token
         """
 
+        claims = token_cache.get(token)
+
+        if claims is not None:
+            return claims
+
         try:
-            jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
+            claims = jwt.decode(
+                token, self._signing_key, algorithms=[self._algorithm]
+            )
         except JWTError:
             raise TokenError("Invalid token")
+
+        token_cache.set(token, claims)
+
+        return claims
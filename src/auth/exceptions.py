@@ -24,3 +24,10 @@ class TokenError(Exception):
     Error occurring when a problem
     arises when decoding a token
     """
+
+
+class PasswordHashingUnavailable(HTTPException):
+    """
+    Error occurring when the password
+    hashing pool is saturated
+    """
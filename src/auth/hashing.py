@@ -0,0 +1,236 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from passlib.context import CryptContext
+
+from src.auth.exceptions import PasswordHashingUnavailable
+from src.metrics import Counter, Gauge, registry, timed
+
+T = TypeVar("T")
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+PASSWORD_HASHING_QUEUE_SIZE = int(
+    os.getenv("PASSWORD_HASHING_QUEUE_SIZE", 4 * PASSWORD_HASHING_WORKERS)
+)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordHasher:
+    """
+    Class in charge of running the bcrypt hashing
+    and verification on a dedicated, bounded pool
+    of threads so that a burst of logins cannot
+    starve the rest of the requests
+
+    Operations are rejected straight away when all
+    the workers are busy and the queue is full
+
+    Attributes
+    ----------
+    _workers : int
+        Number of hashing threads
+    _queue_size : int
+        Maximum number of operations waiting for a thread
+    _executor : Optional[ThreadPoolExecutor]
+        Pool of hashing threads
+    _lock : threading.Lock
+        Lock guarding the pool and the statistics
+    _pending : int
+        Operations running or waiting for a thread
+    _stats : Dict[str, float]
+        Hashing latency and rejection statistics
+
+    Methods
+    -------
+    hash()
+        Hash a password
+    verify()
+        Verify a password against a hash
+    warm_up()
+        Load the bcrypt backend in the pool
+    stats()
+        Get the statistics of the pool
+    shutdown()
+        Stop the hashing threads
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASHING_WORKERS,
+        queue_size: int = PASSWORD_HASHING_QUEUE_SIZE,
+    ) -> None:
+        """
+        Initialize PasswordHasher class
+        """
+
+        self._workers = workers
+        self._queue_size = queue_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "operations": 0,
+            "rejected": 0,
+            "latency_seconds_sum": 0.0,
+            "latency_seconds_max": 0.0,
+        }
+
+    def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a hashing operation on the pool and
+        wait for its result
+
+        Parameters
+        ----------
+        func : Callable[..., T]
+            Hashing operation
+        *args : Any
+            Arguments of the operation
+
+        Returns
+        -------
+        T
+            Result of the operation
+
+        Raises
+        ------
+        PasswordHashingUnavailable
+            Error occurring when the password
+            hashing pool is saturated
+        """
+
+        with self._lock:
+            if self._pending >= self._workers + self._queue_size:
+                self._stats["rejected"] += 1
+                raise PasswordHashingUnavailable(
+                    status_code=503,
+                    detail="Service busy, try again later",
+                    headers={"Retry-After": "1"},
+                )
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="password-hashing"
+                )
+
+            self._pending += 1
+            executor = self._executor
+
+        start = time.perf_counter()
+
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            latency = time.perf_counter() - start
+
+            with self._lock:
+                self._pending -= 1
+                self._stats["operations"] += 1
+                self._stats["latency_seconds_sum"] += latency
+                self._stats["latency_seconds_max"] = max(
+                    self._stats["latency_seconds_max"], latency
+                )
+
+    @timed("password_hash")
+    def hash(self, password: str) -> str:
+        """
+        Hash a password
+
+        Parameters
+        ----------
+        password : str
+            Plain password
+
+        Returns
+        -------
+        str
+            Hash of the password
+        """
+
+        return self._run(pwd_context.hash, password)
+
+    @timed("password_verify")
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a hash
+
+        Parameters
+        ----------
+        password : str
+            Plain password
+        hashed_password : str
+            Stored hash of the password
+
+        Returns
+        -------
+        bool
+            Whether the password matches the hash
+        """
+
+        return self._run(pwd_context.verify, password, hashed_password)
+
+    def warm_up(self) -> None:
+        """
+        Start the hashing threads and load the
+        bcrypt backend so that the first login
+        does not pay for it
+        """
+
+        self._run(pwd_context.handler("bcrypt").get_backend)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the statistics of the pool
+
+        Returns
+        -------
+        Dict[str, float]
+            Queue depth, size of the pool,
+            hashing latency and rejections
+        """
+
+        with self._lock:
+            return {
+                **self._stats,
+                "queue_depth": max(self._pending - self._workers, 0),
+                "in_progress": min(self._pending, self._workers),
+                "workers": self._workers,
+                "queue_size": self._queue_size,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop the hashing threads
+        """
+
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+for stat_name, metric_class in (
+    ("queue_depth", Gauge),
+    ("in_progress", Gauge),
+    ("workers", Gauge),
+    ("rejected", Counter),
+):
+    registry.register(
+        metric_class(
+            f"password_hashing_{stat_name}"
+            + ("_total" if metric_class is Counter else ""),
+            f"Password hashing pool {stat_name.replace('_', ' ')}",
+            function=lambda stat_name=stat_name: password_hasher.stats()[stat_name],
+        )
+    )
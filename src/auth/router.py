@@ -5,20 +5,30 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from src.auth.schemas import LoginUser, RegisterUser
 from src.auth.service import User
+from src.rate_limit import AUTH_IP_RATE_LIMIT, LOGIN_EMAIL_RATE_LIMIT
+from src.utils import run_in_db_pool
 
 auth_router = APIRouter(prefix="/auth")
 
 
-@auth_router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(user: RegisterUser):
-    registered_user_id = User().register_user(user=user)
+@auth_router.post(
+    "/register",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(AUTH_IP_RATE_LIMIT)],
+)
+async def register_user(user: RegisterUser):
+    registered_user_id = await run_in_db_pool(User().register_user, user=user)
     return {"detail": f"User registered with ID {registered_user_id}"}
 
 
-@auth_router.post("/token", status_code=status.HTTP_200_OK)
-def login_user(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+@auth_router.post(
+    "/token",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(AUTH_IP_RATE_LIMIT), Depends(LOGIN_EMAIL_RATE_LIMIT)],
+)
+async def login_user(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
     user_credentials = LoginUser(email=form_data.username, password=form_data.password)
-    login_response = User().login_user(user=user_credentials)
+    login_response = await run_in_db_pool(User().login_user, user=user_credentials)
     return {
         "user_data": login_response["user_data"],
         "access_token": login_response["token"],
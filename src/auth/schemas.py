@@ -1,13 +1,30 @@
-from typing import Any, List
+from typing import List
 
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel, SecretStr, model_validator
+
+from src.tasks.schemas import Task
 
 
 class RegisterUser(BaseModel):
     name: str
     email: str
     password: SecretStr
-    tasks: List[Any] = []
+    tasks: List[Task] = []
+
+    @model_validator(mode="after")
+    def check_unique_task_names(self) -> "RegisterUser":
+        """
+        Reject users with two tasks of the same
+        name before anything is written, since the
+        tasks are unique by name for every user
+        """
+
+        names = {task.name for task in self.tasks}
+
+        if len(names) != len(self.tasks):
+            raise ValueError("Every task must have a different name")
+
+        return self
 
 
 class LoginUser(BaseModel):
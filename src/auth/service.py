@@ -1,15 +1,17 @@
 from typing import Dict
 
 from bson.objectid import ObjectId
-from passlib.context import CryptContext
+from pymongo.errors import DuplicateKeyError
 
 from src.auth.auth import Auth
 from src.auth.exceptions import UserAlreadyExists, UserBadCredentials
+from src.auth.hashing import password_hasher, pwd_context
 from src.auth.schemas import LoginUser, RegisterUser
 from src.database.Database import Database
+from src.database.indexes import USERS_EMAIL_INDEX, missing_unique_indexes
 from src.utils import Utils
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+LOGIN_USER_PROJECTION = {"_id": 0, "name": 1, "email": 1, "password": 1}
 
 
 class User:
@@ -23,6 +25,8 @@ class User:
         MongoDB client
     _users_collection : pymongo.collection.Collection
         Users collection
+    _tasks_collection : pymongo.collection.Collection
+        Tasks collection
 
     Methods
     -------
@@ -39,6 +43,7 @@ class User:
 
         self._db_client = Database().instantiate_client()
         self._users_collection = self._db_client["users_db"]["users_collection"]
+        self._tasks_collection = self._db_client["users_db"]["tasks_collection"]
         self._auth = Auth()
 
     def register_user(self, user: RegisterUser) -> ObjectId:
@@ -63,21 +68,33 @@ class User:
         """
 
         user_email = user.email
-        user_password = pwd_context.hash(user.password.get_secret_value())
 
-        if Utils().get_user(user_email=user_email):
+        # Without the unique index the existing user has to be looked up
+        if USERS_EMAIL_INDEX in missing_unique_indexes and (
+            self._users_collection.find_one({"email": user_email}, {"_id": 1})
+        ):
             raise UserAlreadyExists(status_code=409, detail="User already exists")
 
-        registered_user_id = self._users_collection.insert_one(
-            {
-                "name": user.name,
-                "email": user_email,
-                "password": user_password,
-                "tasks": user.tasks,
-            }
-        ).inserted_id
+        user_password = password_hasher.hash(user.password.get_secret_value())
+
+        try:
+            registered_user_id = self._users_collection.insert_one(
+                {
+                    "name": user.name,
+                    "email": user_email,
+                    "password": user_password,
+                }
+            ).inserted_id
+        except DuplicateKeyError:
+            raise UserAlreadyExists(status_code=409, detail="User already exists")
 
-        self._db_client.close()
+        if user.tasks:
+            self._tasks_collection.insert_many(
+                [
+                    {"user_id": registered_user_id, **task.model_dump()}
+                    for task in user.tasks
+                ]
+            )
 
         return registered_user_id
 
@@ -105,7 +122,9 @@ class User:
         user_email = user.email
         user_password = user.password.get_secret_value()
 
-        user = Utils().get_user(user_email=user_email)
+        user = Utils().get_user(
+            user_email=user_email, projection=LOGIN_USER_PROJECTION
+        )
 
         if not user:
             raise UserBadCredentials(
@@ -114,7 +133,7 @@ class User:
                 headers=LOGIN_ERROR_HEADERS,
             )
 
-        if not pwd_context.verify(user_password, user["password"]):
+        if not password_hasher.verify(user_password, user["password"]):
             raise UserBadCredentials(
                 status_code=LOGIN_ERROR_CODE,
                 detail=LOGIN_ERROR_MSG,
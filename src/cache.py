@@ -0,0 +1,386 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Keys whose last invalidation is remembered, older ones share the oldest one
+CACHE_MAX_GENERATIONS = 10000
+
+# Seconds the generation of a key is kept in Redis after its last invalidation
+REDIS_GENERATION_TTL_SECONDS = 86400
+
+# Store a value only if the key was not invalidated since it was read
+REDIS_SET_IF_GENERATION = """
+if (tonumber(redis.call("GET", KEYS[2])) or 0) == tonumber(ARGV[2]) then
+    redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class CacheBackend:
+    """
+    Base class of the cache backends
+
+    Every deletion takes the next generation so that
+    a value read from the database before a write
+    cannot be stored after that write invalidated it.
+    Only the last CACHE_MAX_GENERATIONS invalidated keys
+    are remembered, the other keys are considered
+    invalidated at the newest forgotten generation
+
+    Attributes
+    ----------
+    _ttl : float
+        Seconds a value is kept in the cache
+    _generation : int
+        Number of invalidations of the cache
+    _generations : OrderedDict[str, int]
+        Generation of the last invalidation of the
+        most recently invalidated keys, oldest first
+    _oldest_generation : int
+        Newest generation that was forgotten
+    _lock : threading.Lock
+        Lock guarding the state of the cache
+    _stats : Dict[str, int]
+        Hits, misses and evictions of the cache
+
+    Methods
+    -------
+    generation()
+        Get the generation of a key
+    get()
+        Get a cached value
+    set()
+        Cache a value
+    delete()
+        Invalidate a cached value
+    clear()
+        Remove every cached value
+    stats()
+        Get the statistics of the cache
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """
+        Initialize CacheBackend class
+        """
+
+        self._ttl = ttl
+        self._generation = 0
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._oldest_generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def generation(self, key: str) -> int:
+        """
+        Get the generation of a key, to be passed
+        to set() after reading from the database
+
+        Parameters
+        ----------
+        key : str
+            Key of the value
+
+        Returns
+        -------
+        int
+            Current generation
+        """
+
+        with self._lock:
+            return self._generation
+
+    def _invalidated_since(self, key: str, generation: Optional[int]) -> bool:
+        """
+        Check whether a key was invalidated after a
+        generation, must be called holding the lock
+        """
+
+        if generation is None:
+            return False
+
+        return self._generations.get(key, self._oldest_generation) > generation
+
+    def _count(self, stat_name: str) -> None:
+        with self._lock:
+            self._stats[stat_name] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value
+
+        Parameters
+        ----------
+        key : str
+            Key of the value
+
+        Returns
+        -------
+        Optional[Any]
+            Cached value if present and not expired
+        """
+
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Cache a value unless the key was
+        invalidated since the given generation
+
+        Parameters
+        ----------
+        key : str
+            Key of the value
+        value : Any
+            JSON serializable value
+        generation : Optional[int]
+            Generation of the key when the value was read
+        """
+
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """
+        Invalidate a cached value
+
+        Parameters
+        ----------
+        key : str
+            Key of the value
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._generations[key] = self._generation
+            self._generations.move_to_end(key)
+
+            while len(self._generations) > CACHE_MAX_GENERATIONS:
+                _, self._oldest_generation = self._generations.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every cached value
+        """
+
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the statistics of the cache
+
+        Returns
+        -------
+        Dict[str, float]
+            Hits, misses, evictions, entries and bytes
+        """
+
+        with self._lock:
+            return {**self._stats, "entries": 0, "bytes": 0}
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Cache backend that keeps the values in the
+    process, evicting the least recently used
+    one when the cache is full
+
+    Attributes
+    ----------
+    _max_entries : int
+        Maximum number of cached values
+    _entries : OrderedDict[str, Tuple[float, Any, int]]
+        Expiration, value and size of every entry
+    _bytes : int
+        Approximate size of the cached values
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        """
+        Initialize InMemoryCacheBackend class
+        """
+
+        super().__init__(ttl=ttl)
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] <= time.monotonic():
+                self._pop(key)
+                entry = None
+
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+
+            return entry[1]
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        if self._max_entries <= 0:
+            return
+
+        size = len(json.dumps(value, default=str))
+
+        with self._lock:
+            if self._invalidated_since(key, generation):
+                return
+
+            if key in self._entries:
+                self._pop(key)
+
+            self._entries[key] = (time.monotonic() + self._ttl, value, size)
+            self._bytes += size
+
+            while len(self._entries) > self._max_entries:
+                self._pop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        super().delete(key)
+
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend shared by every process through
+    Redis, requires the optional redis package
+
+    The generations are kept in Redis too and checked
+    in the same script that stores a value, so that a
+    write in any process stops the others from storing
+    the value they read before it
+
+    Attributes
+    ----------
+    _client : Any
+        Redis client
+    _prefix : str
+        Prefix of the keys stored in Redis
+    _generation_prefix : str
+        Prefix of the generations stored in Redis
+    """
+
+    def __init__(
+        self, ttl: float, url: str, prefix: str = "tasks:", client: Any = None
+    ) -> None:
+        """
+        Initialize RedisCacheBackend class
+        """
+
+        super().__init__(ttl=ttl)
+
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "The redis cache backend requires: pip install redis"
+                )
+
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self._prefix = prefix
+        self._generation_prefix = "generations:" + prefix
+
+    def generation(self, key: str) -> int:
+        return int(self._client.get(self._generation_prefix + key) or 0)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._client.get(self._prefix + key)
+
+        if value is None:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        serialized_value = json.dumps(value, default=str)
+        ttl = max(int(self._ttl), 1)
+
+        if generation is None:
+            self._client.set(self._prefix + key, serialized_value, ex=ttl)
+            return
+
+        self._client.eval(
+            REDIS_SET_IF_GENERATION,
+            2,
+            self._prefix + key,
+            self._generation_prefix + key,
+            serialized_value,
+            generation,
+            ttl,
+        )
+
+    def delete(self, key: str) -> None:
+        pipeline = self._client.pipeline()
+        pipeline.incr(self._generation_prefix + key)
+        pipeline.expire(self._generation_prefix + key, REDIS_GENERATION_TTL_SECONDS)
+        pipeline.delete(self._prefix + key)
+        pipeline.execute()
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self._prefix + "*"):
+            self._client.delete(key)
+
+
+def create_cache_backend(
+    backend: str, ttl: float, max_entries: int, url: Optional[str] = None
+) -> CacheBackend:
+    """
+    Create the cache backend selected in the configuration
+
+    Parameters
+    ----------
+    backend : str
+        "memory" or "redis"
+    ttl : float
+        Seconds a value is kept in the cache
+    max_entries : int
+        Maximum number of values of the in-memory cache
+    url : Optional[str]
+        URL of the Redis server
+
+    Returns
+    -------
+    CacheBackend
+        Cache backend
+    """
+
+    if backend == "redis":
+        return RedisCacheBackend(ttl=ttl, url=url or "redis://localhost:6379/0")
+
+    return InMemoryCacheBackend(ttl=ttl, max_entries=max_entries)
@@ -0,0 +1,268 @@
+import os
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.metrics import Counter, Gauge, registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 500))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+COMPRESSION_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",")
+    if encoding.strip()
+]
+
+COMPRESSION_INPUT_BYTES = registry.register(
+    Counter(
+        "http_compression_input_bytes_total",
+        "Bytes of the responses before compression",
+        labelnames=("encoding",),
+    )
+)
+COMPRESSION_OUTPUT_BYTES = registry.register(
+    Counter(
+        "http_compression_output_bytes_total",
+        "Bytes of the responses after compression",
+        labelnames=("encoding",),
+    )
+)
+# Gauge because a tiny streamed chunk can grow when compressed
+COMPRESSION_SAVED_BYTES = registry.register(
+    Gauge(
+        "http_compression_saved_bytes",
+        "Bytes saved by compressing the responses",
+        labelnames=("encoding",),
+    )
+)
+
+
+class GzipCompressor:
+    """
+    Incremental gzip compressor
+    """
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, wbits=31)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        """
+        Compress a chunk, flushing it so that it
+        can be decoded as soon as it is received
+        """
+
+        mode = zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class BrotliCompressor:
+    """
+    Incremental brotli compressor
+    """
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        """
+        Compress a chunk, flushing it so that it
+        can be decoded as soon as it is received
+        """
+
+        output = self._compressor.process(data)
+        if finish:
+            return output + self._compressor.finish()
+        return output + self._compressor.flush()
+
+
+class ZstdCompressor:
+    """
+    Incremental zstd compressor
+    """
+
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(
+            level=COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        """
+        Compress a chunk, flushing it so that it
+        can be decoded as soon as it is received
+        """
+
+        mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if finish
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+COMPRESSORS: Dict[str, Callable[[], Any]] = {"gzip": GzipCompressor}
+
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def negotiate_encoding(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """
+    Choose the encoding of a response from
+    the Accept-Encoding header of the request
+
+    Parameters
+    ----------
+    accept_encoding : str
+        Accept-Encoding header of the request
+    encodings : List[str]
+        Supported encodings by order of preference
+
+    Returns
+    -------
+    Optional[str]
+        Encoding with the highest weight, ties are
+        broken by preference, None if there is none
+    """
+
+    weights = {}
+
+    for item in accept_encoding.split(","):
+        encoding, _, parameters = item.strip().partition(";")
+        weight = 1.0
+
+        if parameters.strip().startswith("q="):
+            try:
+                weight = float(parameters.strip()[2:])
+            except ValueError:
+                weight = 0.0
+
+        if encoding:
+            weights[encoding.strip().lower()] = weight
+
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -index, encoding)
+        for index, encoding in enumerate(encodings)
+    ]
+    candidates = [candidate for candidate in candidates if candidate[0] > 0]
+
+    return max(candidates)[2] if candidates else None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware in charge of compressing the
+    responses with the best encoding accepted by
+    the client
+
+    Responses smaller than the minimum size and
+    responses that are already encoded are sent
+    as they are. Streaming responses are compressed
+    chunk by chunk
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        encodings: Optional[List[str]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [
+            encoding
+            for encoding in (
+                COMPRESSION_ENCODINGS if encodings is None else encodings
+            )
+            if encoding in COMPRESSORS
+        ]
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Dict[str, Any] = {}
+        compressor = None
+        started = False
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal compressor, started
+
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if not started:
+                started = True
+                headers = MutableHeaders(raw=start_message["headers"])
+
+                if "content-encoding" in headers or (
+                    not more_body and len(body) < self.minimum_size
+                ):
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = COMPRESSORS[encoding]()
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+
+                # The compressed body is not byte-identical to the original one
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+
+                compressed_body = compressor.compress(body, finish=not more_body)
+
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(compressed_body))
+
+                await send(start_message)
+            elif compressor is None:
+                await send(message)
+                return
+            else:
+                compressed_body = compressor.compress(body, finish=not more_body)
+
+            COMPRESSION_INPUT_BYTES.inc(len(body), encoding=encoding)
+            COMPRESSION_OUTPUT_BYTES.inc(len(compressed_body), encoding=encoding)
+            COMPRESSION_SAVED_BYTES.inc(
+                len(body) - len(compressed_body), encoding=encoding
+            )
+
+            await send({**message, "body": compressed_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,39 +1,101 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
+import pymongo
 from pymongo import MongoClient
 
 from src.database.exceptions import ClientError, CredentialsNotFound, DatabaseError
+from src.database.memory import InMemoryClient
+from src.metrics import PoolMetricsListener, timed
 
 load_dotenv()
 
+POOL_OPTIONS_ENV = {
+    "maxPoolSize": "MONGODB_MAX_POOL_SIZE",
+    "minPoolSize": "MONGODB_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGODB_MAX_IDLE_TIME_MS",
+    "waitQueueTimeoutMS": "MONGODB_WAIT_QUEUE_TIMEOUT_MS",
+}
+
 
 class Database:
     """
     Class in charge of handling
     the connection to the database
 
+    The MongoDB client is shared by the
+    whole process so that every service
+    reuses the same connection pool
+
+    When DATABASE_BACKEND is "memory" an in-memory
+    client that implements the same API is used
+    instead, so that the application runs without
+    MongoDB for tests, development and benchmarks
+
     Attributes
     ----------
     _MONGODB_URI : str
         Database connection string
+    _backend : str
+        "mongodb" or "memory"
+    _pool_options : Dict[str, int]
+        Connection pool options read from the .env file
+    _client : Optional[MongoClient]
+        Process-wide MongoDB client
+    _client_lock : threading.Lock
+        Lock guarding the creation of the client
 
     Methods
     -------
     instantiate_client()
-        Instantiate MongoDB client
+        Get the process-wide MongoDB client
+    warm_up()
+        Open the minimum connections of the pool
+    ping()
+        Check the connection to the database
+    close_client()
+        Close the process-wide MongoDB client
     """
 
+    _client: Optional[MongoClient] = None
+    _client_lock = threading.Lock()
+
     def __init__(self) -> None:
         """
         Initialize Database class
         """
 
         self._MONGODB_URI = os.getenv("MONGODB_URI")
+        self._backend = os.getenv("DATABASE_BACKEND", "mongodb")
+        self._pool_options = self._get_pool_options()
+
+    @staticmethod
+    def _get_pool_options() -> Dict[str, int]:
+        """
+        Read the connection pool options that
+        are defined in the .env file
 
+        Returns
+        -------
+        Dict[str, int]
+            Connection pool options
+        """
+
+        return {
+            option: int(os.getenv(env_name))
+            for option, env_name in POOL_OPTIONS_ENV.items()
+            if os.getenv(env_name)
+        }
+
+    @timed("db_client_acquire")
     def instantiate_client(self) -> MongoClient:
         """
-        Instantiate MongoDB client
+        Get the process-wide MongoDB client,
+        creating it and checking the connection
+        only the first time it is requested
 
         Returns
         -------
@@ -50,17 +112,107 @@ class Database:
             Error when connecting to MongoDB database
         """
 
+        if Database._client is not None:
+            return Database._client
+
+        with Database._client_lock:
+            if Database._client is None:
+                Database._client = self._create_client()
+
+        return Database._client
+
+    def _create_client(self) -> MongoClient:
+        """
+        Create a new MongoDB client and
+        check the connection to the database
+
+        Returns
+        -------
+        MongoClient
+            MongoDB client
+        """
+
+        if self._backend == "memory":
+            return InMemoryClient()
+
         if not self._MONGODB_URI:
             raise CredentialsNotFound("MongoDB URI not found in .env")
 
         try:
-            client = MongoClient(self._MONGODB_URI)
+            client = MongoClient(
+                self._MONGODB_URI,
+                event_listeners=[PoolMetricsListener()],
+                **self._pool_options,
+            )
         except Exception:
             raise ClientError("An error occurred instantiating the MongoDB client")
 
         try:
             client.admin.command("ping")
         except Exception:
+            client.close()
             raise DatabaseError("An error occurred in the database connection")
 
         return client
+
+    def warm_up(self) -> None:
+        """
+        Create the process-wide client and open
+        the minimum connections of the pool at
+        the same time, instead of on the first requests
+        """
+
+        client = self.instantiate_client()
+        connections = self._pool_options.get("minPoolSize", 1)
+
+        # The client already opened a connection when it was created
+        if connections <= 0:
+            return
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(
+                executor.map(
+                    lambda _: client.admin.command("ping"), range(connections)
+                )
+            )
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        """
+        Check the connection to the database
+        using the process-wide client, without
+        creating it if it does not exist
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds to wait for the answer
+
+        Returns
+        -------
+        bool
+            Whether the database answered the ping
+        """
+
+        client = Database._client
+
+        if client is None:
+            return False
+
+        try:
+            with pymongo.timeout(timeout):
+                client.admin.command("ping")
+        except Exception:
+            return False
+
+        return True
+
+    @classmethod
+    def close_client(cls) -> None:
+        """
+        Close the process-wide MongoDB client
+        """
+
+        with cls._client_lock:
+            if cls._client is not None:
+                cls._client.close()
+                cls._client = None
@@ -0,0 +1,226 @@
+"""
+Declare the indexes required by the hot queries and keep them in sync
+
+Usage: python -m src.database.indexes [--explain]
+"""
+
+import argparse
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from src.database.Database import Database
+
+logger = logging.getLogger(__name__)
+
+DATABASE_NAME = "users_db"
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users_collection": [
+        IndexModel([("email", ASCENDING)], unique=True),
+    ],
+    "tasks_collection": [
+        IndexModel([("user_id", ASCENDING), ("name", ASCENDING)], unique=True),
+        IndexModel(
+            [("user_id", ASCENDING), ("priority", ASCENDING), ("name", ASCENDING)]
+        ),
+    ],
+}
+
+USERS_EMAIL_INDEX = "users_collection.email_1"
+TASKS_NAME_INDEX = "tasks_collection.user_id_1_name_1"
+
+# Unique indexes that do not exist, the writes relying on
+# them check for duplicates themselves until they are created
+missing_unique_indexes: Set[str] = set()
+
+HOT_QUERIES: Dict[str, Dict[str, Any]] = {
+    "get_user": {
+        "collection": "users_collection",
+        "filter": {"email": ""},
+    },
+    "get_user_tasks": {
+        "collection": "tasks_collection",
+        "filter": {"user_id": None},
+        "sort": [("name", ASCENDING)],
+    },
+    "get_user_tasks_by_priority": {
+        "collection": "tasks_collection",
+        "filter": {"user_id": None, "priority": ""},
+        "sort": [("priority", ASCENDING), ("name", ASCENDING)],
+    },
+}
+
+
+class Indexes:
+    """
+    Class in charge of creating the declared
+    indexes and reporting the differences with
+    the indexes that exist in the database
+
+    Attributes
+    ----------
+    _db_client : pymongo.MongoClient
+        MongoDB client
+    _database : pymongo.database.Database
+        Database of the application
+
+    Methods
+    -------
+    sync()
+        Create the missing indexes and report drift
+    explain_hot_queries()
+        Get the winning plan of the hot queries
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize Indexes class
+        """
+
+        self._db_client = Database().instantiate_client()
+        self._database = self._db_client[DATABASE_NAME]
+
+    def sync(self) -> Dict[str, List[str]]:
+        """
+        Create the declared indexes that are missing,
+        which is a no-op for the ones that already exist,
+        and report the indexes that differ from the
+        declaration or are not declared at all
+
+        An index that cannot be built, such as a unique
+        index over legacy duplicates, is reported as
+        drift so that the application still starts, and
+        the unique ones are added to missing_unique_indexes
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            Created indexes and drift messages
+        """
+
+        report: Dict[str, List[str]] = {"created": [], "drift": []}
+
+        for collection_name, index_models in INDEXES.items():
+            collection = self._database[collection_name]
+            existing_indexes = collection.index_information()
+            missing_models = []
+
+            for index_model in index_models:
+                document = index_model.document
+                existing_index = existing_indexes.get(document["name"])
+                full_name = f"{collection_name}.{document['name']}"
+
+                if existing_index is None:
+                    missing_models.append(index_model)
+                    continue
+
+                if existing_index.get("unique", False) != document.get(
+                    "unique", False
+                ):
+                    report["drift"].append(f"{full_name} differs in uniqueness")
+
+                if document.get("unique") and not existing_index.get("unique"):
+                    missing_unique_indexes.add(full_name)
+                else:
+                    missing_unique_indexes.discard(full_name)
+
+            declared_names = {model.document["name"] for model in index_models}
+            for index_name in existing_indexes:
+                if index_name != "_id_" and index_name not in declared_names:
+                    report["drift"].append(
+                        f"{collection_name}.{index_name} is not declared"
+                    )
+
+            # One at a time so that a failing index does not block the others
+            for index_model in missing_models:
+                full_name = f"{collection_name}.{index_model.document['name']}"
+
+                try:
+                    collection.create_indexes([index_model])
+                except OperationFailure as error:
+                    report["drift"].append(f"{full_name} could not be created: {error}")
+                    if index_model.document.get("unique"):
+                        missing_unique_indexes.add(full_name)
+                else:
+                    report["created"].append(full_name)
+                    missing_unique_indexes.discard(full_name)
+
+        for message in report["drift"]:
+            logger.warning("Index drift: %s", message)
+
+        return report
+
+    @staticmethod
+    def _get_plan_summary(plan: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Walk down a query plan to find how
+        the documents are read
+
+        Parameters
+        ----------
+        plan : Dict[str, Any]
+            Winning plan of a query
+
+        Returns
+        -------
+        Dict[str, Optional[str]]
+            Stages of the plan and used index
+        """
+
+        stages = []
+        index_name = None
+
+        while plan:
+            stages.append(plan.get("stage"))
+            index_name = plan.get("indexName", index_name)
+            plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+
+        return {"stages": " <- ".join(filter(None, stages)), "index": index_name}
+
+    def explain_hot_queries(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Get the winning plan of the hot queries
+        to check that they use an index
+
+        Returns
+        -------
+        Dict[str, Dict[str, Optional[str]]]
+            Plan summary of every hot query
+        """
+
+        plans = {}
+
+        for query_name, query in HOT_QUERIES.items():
+            cursor = self._database[query["collection"]].find(query["filter"])
+
+            if "sort" in query:
+                cursor = cursor.sort(query["sort"])
+
+            winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+            plans[query_name] = self._get_plan_summary(winning_plan)
+
+            if "COLLSCAN" in plans[query_name]["stages"]:
+                logger.warning("Query %s does a collection scan", query_name)
+
+        return plans
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--explain", action="store_true")
+    args = parser.parse_args()
+
+    indexes = Indexes()
+    sync_report = indexes.sync()
+
+    for created_index in sync_report["created"]:
+        print(f"Created {created_index}")
+    for drift_message in sync_report["drift"]:
+        print(f"Drift: {drift_message}")
+
+    if args.explain:
+        for hot_query, plan_summary in indexes.explain_hot_queries().items():
+            print(f"{hot_query}: {plan_summary['stages']} ({plan_summary['index']})")
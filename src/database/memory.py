@@ -0,0 +1,907 @@
+import copy
+import itertools
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from bson.objectid import ObjectId
+from pymongo import (
+    ASCENDING,
+    DeleteMany,
+    DeleteOne,
+    IndexModel,
+    InsertOne,
+    UpdateMany,
+    ReturnDocument,
+    UpdateOne,
+)
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+COMPARISON_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+OPERATORS = {
+    "$eq",
+    "$ne",
+    "$in",
+    "$nin",
+    "$exists",
+    "$regex",
+    "$options",
+    *COMPARISON_OPERATORS,
+}
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Turn a value into a hashable index key
+    """
+
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """
+    Order missing values before the rest, like MongoDB
+    """
+
+    return (0, 0) if value is None else (1, value)
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    """
+    Evaluate a comparison operator of a filter
+    """
+
+    if value is None:
+        return False
+
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        return value <= operand
+    except TypeError:
+        return False
+
+
+def _is_operator_condition(condition: Any) -> bool:
+    """
+    Check whether a condition of a filter uses
+    operators instead of matching a value
+    """
+
+    return isinstance(condition, dict) and any(key in OPERATORS for key in condition)
+
+
+def _matches_condition(document: Dict[str, Any], field: str, condition: Any) -> bool:
+    """
+    Check the condition of a field of a filter
+    """
+
+    value = document.get(field)
+
+    if not _is_operator_condition(condition):
+        if isinstance(value, list) and not isinstance(condition, list):
+            return condition in value
+        if condition is None:
+            return value is None
+        return field in document and value == condition
+
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            matched = _matches_condition(document, field, operand)
+        elif operator == "$ne":
+            matched = not _matches_condition(document, field, operand)
+        elif operator == "$in":
+            matched = any(_matches_condition(document, field, item) for item in operand)
+        elif operator == "$nin":
+            matched = not any(
+                _matches_condition(document, field, item) for item in operand
+            )
+        elif operator == "$exists":
+            matched = (field in document) == bool(operand)
+        elif operator == "$regex":
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            matched = isinstance(value, str) and bool(re.search(operand, value, flags))
+        elif operator == "$options":
+            matched = True
+        elif operator in COMPARISON_OPERATORS:
+            matched = _compare(value, operator, operand)
+        else:
+            raise NotImplementedError(f"Query operator {operator}")
+
+        if not matched:
+            return False
+
+    return True
+
+
+def matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """
+    Check whether a document matches a MongoDB filter
+
+    Supported operators are $and, $or, $eq, $ne,
+    $in, $nin, $gt, $gte, $lt, $lte, $exists and $regex
+
+    Parameters
+    ----------
+    document : Dict[str, Any]
+        Document to be checked
+    query : Dict[str, Any]
+        MongoDB filter
+
+    Returns
+    -------
+    bool
+        Whether the document matches
+    """
+
+    for field, condition in query.items():
+        if field == "$and":
+            matched = all(matches(document, item) for item in condition)
+        elif field == "$or":
+            matched = any(matches(document, item) for item in condition)
+        else:
+            matched = _matches_condition(document, field, condition)
+
+        if not matched:
+            return False
+
+    return True
+
+
+def _project(
+    document: Dict[str, Any], projection: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Copy the fields of a document selected by a projection
+    """
+
+    if not projection:
+        return copy.deepcopy(document)
+
+    include_id = projection.get("_id", 1)
+    included = [
+        field for field, value in projection.items() if value and field != "_id"
+    ]
+
+    if included:
+        fields = (["_id"] if include_id else []) + included
+        return {
+            field: copy.deepcopy(document[field])
+            for field in fields
+            if field in document
+        }
+
+    excluded = {field for field, value in projection.items() if not value}
+    return {
+        field: copy.deepcopy(value)
+        for field, value in document.items()
+        if field not in excluded
+    }
+
+
+class InMemoryIndex:
+    """
+    Hash index of a collection, keyed by the
+    values of its fields and by the value of
+    its first field alone for prefix lookups
+
+    Attributes
+    ----------
+    name : str
+        Name of the index
+    fields : List[str]
+        Indexed fields
+    unique : bool
+        Whether two documents can have the same key
+    _entries : Dict[Tuple[Any, ...], Set[Any]]
+        IDs of the documents of every key
+    _prefixes : Dict[Any, Set[Any]]
+        IDs of the documents of every value of the first field
+    """
+
+    def __init__(self, name: str, fields: List[str], unique: bool) -> None:
+        """
+        Initialize InMemoryIndex class
+        """
+
+        self.name = name
+        self.fields = fields
+        self.unique = unique
+        self._entries: Dict[Tuple[Any, ...], Set[Any]] = {}
+        self._prefixes: Dict[Any, Set[Any]] = {}
+
+    def key(self, document: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(_freeze(document.get(field)) for field in self.fields)
+
+    def add(self, document: Dict[str, Any]) -> None:
+        key = self.key(document)
+        self._entries.setdefault(key, set()).add(document["_id"])
+        self._prefixes.setdefault(key[0], set()).add(document["_id"])
+
+    def remove(self, document: Dict[str, Any]) -> None:
+        key = self.key(document)
+
+        for index, index_key in ((self._entries, key), (self._prefixes, key[0])):
+            ids = index.get(index_key)
+            if ids is not None:
+                ids.discard(document["_id"])
+                if not ids:
+                    del index[index_key]
+
+    def conflicts(self, document: Dict[str, Any]) -> bool:
+        """
+        Check whether a unique key is already
+        used by another document
+        """
+
+        if not self.unique:
+            return False
+
+        ids = self._entries.get(self.key(document), set())
+        return bool(ids - {document["_id"]})
+
+    def _key_values(self, query: Dict[str, Any]) -> List[List[Any]]:
+        """
+        Get the values allowed by the equality and $in
+        conditions of a filter on the leading fields
+        """
+
+        values: List[List[Any]] = []
+
+        for field in self.fields:
+            condition = query.get(field)
+
+            if field not in query:
+                break
+            if isinstance(condition, dict) and set(condition) == {"$in"}:
+                values.append([_freeze(item) for item in condition["$in"]])
+            elif _is_operator_condition(condition):
+                break
+            else:
+                values.append([_freeze(condition)])
+
+        return values
+
+    def score(self, query: Dict[str, Any]) -> Optional[Tuple[bool, int]]:
+        """
+        Rate how much the index narrows a filter
+        without reading it, a lookup of the full
+        key is better than one of the first field
+
+        Parameters
+        ----------
+        query : Dict[str, Any]
+            MongoDB filter
+
+        Returns
+        -------
+        Optional[Tuple[bool, int]]
+            Whether the full key is used and
+            its number of fields, None if the
+            index cannot be used
+        """
+
+        values = self._key_values(query)
+
+        if not values:
+            return None
+
+        is_full_key = len(values) == len(self.fields)
+        return is_full_key, len(self.fields) if is_full_key else 0
+
+    def candidates(self, query: Dict[str, Any]) -> Set[Any]:
+        """
+        Get the IDs of the documents that can match
+        the equality and $in conditions of a filter,
+        which must not be modified
+
+        Parameters
+        ----------
+        query : Dict[str, Any]
+            MongoDB filter that the index can be used for
+
+        Returns
+        -------
+        Set[Any]
+            IDs of the candidates
+        """
+
+        values = self._key_values(query)
+
+        if len(values) == len(self.fields):
+            keys = list(itertools.product(*values))
+            entries = self._entries
+        else:
+            keys = values[0]
+            entries = self._prefixes
+
+        if len(keys) == 1:
+            return entries.get(keys[0], set())
+
+        ids: Set[Any] = set()
+        for key in keys:
+            ids |= entries.get(key, set())
+
+        return ids
+
+
+class InMemoryCursor:
+    """
+    Cursor over the documents of an
+    in-memory collection that match a filter,
+    read when it is first iterated
+
+    Attributes
+    ----------
+    _collection : InMemoryCollection
+        Collection to be read
+    _query : Dict[str, Any]
+        MongoDB filter
+    _projection : Optional[Dict[str, Any]]
+        Fields to be returned
+    _sort : List[Tuple[str, int]]
+        Fields and directions of the sorting
+    _limit : int
+        Maximum number of documents, 0 for no limit
+    _documents : Optional[Iterator[Dict[str, Any]]]
+        Documents once the cursor is read
+    """
+
+    def __init__(
+        self,
+        collection: "InMemoryCollection",
+        query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Initialize InMemoryCursor class
+        """
+
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._limit = 0
+        self._documents: Optional[Iterator[Dict[str, Any]]] = None
+
+    def sort(
+        self,
+        key_or_list: Union[str, List[Tuple[str, int]]],
+        direction: int = ASCENDING,
+    ) -> "InMemoryCursor":
+        if isinstance(key_or_list, str):
+            self._sort = [(key_or_list, direction)]
+        else:
+            self._sort = list(key_or_list)
+        return self
+
+    def limit(self, limit: int) -> "InMemoryCursor":
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> "InMemoryCursor":
+        return self
+
+    def close(self) -> None:
+        self._documents = iter(())
+
+    def explain(self) -> Dict[str, Any]:
+        index = self._collection._find_index(self._query)
+        plan: Dict[str, Any] = {"stage": "COLLSCAN"}
+
+        if index is not None:
+            plan = {
+                "stage": "FETCH",
+                "inputStage": {"stage": "IXSCAN", "indexName": index.name},
+            }
+
+        return {"queryPlanner": {"winningPlan": plan}}
+
+    def __iter__(self) -> "InMemoryCursor":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._documents is None:
+            documents = self._collection._find(self._query, self._sort, self._limit)
+            self._documents = iter(
+                [_project(document, self._projection) for document in documents]
+            )
+
+        return next(self._documents)
+
+
+class InMemoryCollection:
+    """
+    Collection kept in the process that implements the
+    subset of pymongo.collection.Collection used by
+    the application, with hash indexes so that the
+    lookups by email and by task name do not scan
+    the whole collection
+
+    Attributes
+    ----------
+    name : str
+        Name of the collection
+    _documents : Dict[Any, Dict[str, Any]]
+        Documents by ID
+    _positions : Dict[Any, int]
+        Insertion order of the documents, which
+        is the order of unsorted queries
+    _indexes : Dict[str, InMemoryIndex]
+        Indexes by name
+    _lock : threading.RLock
+        Lock guarding the documents and the indexes
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize InMemoryCollection class
+        """
+
+        self.name = name
+        self._documents: Dict[Any, Dict[str, Any]] = {}
+        self._positions: Dict[Any, int] = {}
+        self._inserted = itertools.count()
+        self._indexes: Dict[str, InMemoryIndex] = {}
+        self._lock = threading.RLock()
+
+    def _find_index(self, query: Dict[str, Any]) -> Optional[InMemoryIndex]:
+        """
+        Get the index that narrows a filter the most
+        """
+
+        best_index, best_score = None, None
+
+        for index in self._indexes.values():
+            score = index.score(query)
+            if score is not None and (best_score is None or score > best_score):
+                best_index, best_score = index, score
+
+        return best_index
+
+    def _candidates(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the documents that can match a filter,
+        using the conditions of a top-level $and too
+        """
+
+        conditions = dict(query)
+        for item in query.get("$and", []):
+            for field, condition in item.items():
+                conditions.setdefault(field, condition)
+
+        id_condition = conditions.get("_id")
+
+        if "_id" in conditions and not _is_operator_condition(id_condition):
+            ids = [id_condition]
+        elif isinstance(id_condition, dict) and set(id_condition) == {"$in"}:
+            ids = id_condition["$in"]
+        else:
+            ids = None
+
+        if ids is not None:
+            return [self._documents[_id] for _id in ids if _id in self._documents]
+
+        index = self._find_index(conditions)
+
+        if index is None:
+            return list(self._documents.values())
+
+        return [self._documents[_id] for _id in index.candidates(conditions)]
+
+    def _find(
+        self, query: Dict[str, Any], sort: List[Tuple[str, int]], limit: int
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            documents = [
+                document
+                for document in self._candidates(query)
+                if matches(document, query)
+            ]
+
+            documents.sort(key=lambda document: self._positions[document["_id"]])
+
+        for field, direction in reversed(sort):
+            documents.sort(
+                key=lambda document: _sort_key(document.get(field)),
+                reverse=direction < 0,
+            )
+
+        return documents[:limit] if limit else documents
+
+    def _check_unique(self, document: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            if index.conflicts(document):
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} "
+                    f"index: {index.name}",
+                    DUPLICATE_KEY_ERROR_CODE,
+                )
+
+    def _insert(self, document: Dict[str, Any]) -> Any:
+        document.setdefault("_id", ObjectId())
+
+        if document["_id"] in self._documents:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.name} index: _id_",
+                DUPLICATE_KEY_ERROR_CODE,
+            )
+
+        stored_document = copy.deepcopy(document)
+        self._check_unique(stored_document)
+        self._documents[stored_document["_id"]] = stored_document
+        self._positions[stored_document["_id"]] = next(self._inserted)
+
+        for index in self._indexes.values():
+            index.add(stored_document)
+
+        return stored_document["_id"]
+
+    def _remove(self, document: Dict[str, Any]) -> None:
+        for index in self._indexes.values():
+            index.remove(document)
+        del self._documents[document["_id"]]
+        del self._positions[document["_id"]]
+
+    @staticmethod
+    def _apply_update(
+        document: Dict[str, Any], update: Dict[str, Any], is_insert: bool
+    ) -> Dict[str, Any]:
+        """
+        Get a copy of a document with the
+        $set, $unset, $inc and $setOnInsert
+        operators of an update applied
+        """
+
+        updated_document = copy.deepcopy(document)
+
+        for operator, fields in update.items():
+            if operator == "$setOnInsert" and not is_insert:
+                continue
+
+            for field, value in fields.items():
+                if operator in ("$set", "$setOnInsert"):
+                    updated_document[field] = copy.deepcopy(value)
+                elif operator == "$unset":
+                    updated_document.pop(field, None)
+                elif operator == "$inc":
+                    updated_document[field] = updated_document.get(field, 0) + value
+                else:
+                    raise NotImplementedError(f"Update operator {operator}")
+
+        return updated_document
+
+    def _update(
+        self,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        upsert: bool,
+        multi: bool,
+    ) -> Dict[str, Any]:
+        """
+        Update the documents matching a filter
+
+        Returns
+        -------
+        Dict[str, Any]
+            Raw result with n, nModified and upserted
+        """
+
+        documents = self._find(query, [], 0 if multi else 1)
+
+        if not documents:
+            if not upsert:
+                return {"n": 0, "nModified": 0}
+
+            new_document = {
+                field: condition
+                for field, condition in query.items()
+                if not field.startswith("$") and not isinstance(condition, dict)
+            }
+            upserted_id = self._insert(
+                self._apply_update(new_document, update, is_insert=True)
+            )
+            return {"n": 1, "nModified": 0, "upserted": upserted_id}
+
+        modified = 0
+
+        for document in documents:
+            updated_document = self._apply_update(document, update, is_insert=False)
+
+            if updated_document == document:
+                continue
+
+            self._check_unique(updated_document)
+
+            for index in self._indexes.values():
+                index.remove(document)
+            self._documents[document["_id"]] = updated_document
+            for index in self._indexes.values():
+                index.add(updated_document)
+
+            modified += 1
+
+        return {"n": len(documents), "nModified": modified}
+
+    def find(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> InMemoryCursor:
+        return InMemoryCursor(self, filter or {}, projection)
+
+    def find_one(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        return next(self.find(filter, projection).limit(1), None)
+
+    def count_documents(self, filter: Dict[str, Any]) -> int:
+        return len(self._find(filter, [], 0))
+
+    def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        with self._lock:
+            return InsertOneResult(self._insert(document), True)
+
+    def insert_many(
+        self, documents: List[Dict[str, Any]], ordered: bool = True
+    ) -> InsertManyResult:
+        self.bulk_write(
+            [InsertOne(document) for document in documents], ordered=ordered
+        )
+        return InsertManyResult([document["_id"] for document in documents], True)
+
+    def update_one(
+        self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False
+    ) -> UpdateResult:
+        with self._lock:
+            return UpdateResult(self._update(filter, update, upsert, False), True)
+
+    def update_many(
+        self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False
+    ) -> UpdateResult:
+        with self._lock:
+            return UpdateResult(self._update(filter, update, upsert, True), True)
+
+    def find_one_and_update(
+        self,
+        filter: Dict[str, Any],
+        update: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        return_document: bool = ReturnDocument.BEFORE,
+        upsert: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            documents = self._find(filter, [], 1)
+            result = self._update(filter, update, upsert, False)
+
+            if documents:
+                _id = documents[0]["_id"]
+            elif "upserted" in result:
+                _id = result["upserted"]
+            else:
+                return None
+
+            if return_document == ReturnDocument.BEFORE:
+                return _project(documents[0], projection) if documents else None
+
+            return _project(self._documents[_id], projection)
+
+    def delete_one(self, filter: Dict[str, Any]) -> DeleteResult:
+        with self._lock:
+            documents = self._find(filter, [], 1)
+            for document in documents:
+                self._remove(document)
+            return DeleteResult({"n": len(documents)}, True)
+
+    def delete_many(self, filter: Dict[str, Any]) -> DeleteResult:
+        with self._lock:
+            documents = self._find(filter, [], 0)
+            for document in documents:
+                self._remove(document)
+            return DeleteResult({"n": len(documents)}, True)
+
+    def bulk_write(self, requests: List[Any], ordered: bool = True) -> BulkWriteResult:
+        """
+        Apply InsertOne, UpdateOne, UpdateMany, DeleteOne
+        and DeleteMany requests, raising BulkWriteError
+        with the index of every failed one
+        """
+
+        result: Dict[str, Any] = {
+            "writeErrors": [],
+            "writeConcernErrors": [],
+            "nInserted": 0,
+            "nUpserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "upserted": [],
+        }
+
+        with self._lock:
+            for index, request in enumerate(requests):
+                try:
+                    if isinstance(request, InsertOne):
+                        self._insert(request._doc)
+                        result["nInserted"] += 1
+                    elif isinstance(request, (DeleteOne, DeleteMany)):
+                        limit = 1 if isinstance(request, DeleteOne) else 0
+                        documents = self._find(request._filter, [], limit)
+                        for document in documents:
+                            self._remove(document)
+                        result["nRemoved"] += len(documents)
+                    elif isinstance(request, (UpdateOne, UpdateMany)):
+                        raw_result = self._update(
+                            request._filter,
+                            request._doc,
+                            bool(request._upsert),
+                            isinstance(request, UpdateMany),
+                        )
+                        if "upserted" in raw_result:
+                            result["nUpserted"] += 1
+                            result["upserted"].append(
+                                {"index": index, "_id": raw_result["upserted"]}
+                            )
+                        else:
+                            result["nMatched"] += raw_result["n"]
+                            result["nModified"] += raw_result["nModified"]
+                    else:
+                        raise NotImplementedError(f"Bulk request {request!r}")
+                except DuplicateKeyError as error:
+                    result["writeErrors"].append(
+                        {
+                            "index": index,
+                            "code": error.code,
+                            "errmsg": str(error),
+                            "op": request,
+                        }
+                    )
+                    if ordered:
+                        break
+
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+
+        return BulkWriteResult(result, True)
+
+    def create_index(
+        self, keys: Union[str, List[Tuple[str, int]]], **kwargs: Any
+    ) -> str:
+        return self.create_indexes([IndexModel(keys, **kwargs)])[0]
+
+    def create_indexes(self, indexes: List[IndexModel]) -> List[str]:
+        names = []
+
+        with self._lock:
+            for index_model in indexes:
+                document = index_model.document
+                name = document["name"]
+
+                if name not in self._indexes:
+                    index = InMemoryIndex(
+                        name=name,
+                        fields=list(document["key"]),
+                        unique=document.get("unique", False),
+                    )
+                    for stored_document in self._documents.values():
+                        if index.conflicts(stored_document):
+                            raise DuplicateKeyError(
+                                f"E11000 duplicate key error collection: "
+                                f"{self.name} index: {name}",
+                                DUPLICATE_KEY_ERROR_CODE,
+                            )
+                        index.add(stored_document)
+                    self._indexes[name] = index
+
+                names.append(name)
+
+        return names
+
+    def index_information(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            information: Dict[str, Dict[str, Any]] = {"_id_": {"key": [("_id", 1)]}}
+
+            for name, index in self._indexes.items():
+                information[name] = {
+                    "key": [(field, ASCENDING) for field in index.fields]
+                }
+                if index.unique:
+                    information[name]["unique"] = True
+
+        return information
+
+    def drop(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._positions.clear()
+            self._indexes.clear()
+
+
+class InMemoryDatabase:
+    """
+    Database kept in the process whose
+    collections are created on first access
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize InMemoryDatabase class
+        """
+
+        self.name = name
+        self._collections: Dict[str, InMemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = InMemoryCollection(name)
+            return self._collections[name]
+
+    def command(self, command: str) -> Dict[str, Any]:
+        if command != "ping":
+            raise NotImplementedError(f"Command {command}")
+        return {"ok": 1.0}
+
+
+class InMemoryClient:
+    """
+    Client of an in-memory database that stands in for
+    pymongo.MongoClient when DATABASE_BACKEND is "memory",
+    so that the whole API runs without MongoDB
+
+    Attributes
+    ----------
+    admin : InMemoryDatabase
+        Database answering the ping command
+    _databases : Dict[str, InMemoryDatabase]
+        Databases by name
+
+    Methods
+    -------
+    drop_database()
+        Remove every collection of a database
+    close()
+        Kept for compatibility with MongoClient
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize InMemoryClient class
+        """
+
+        self.admin = InMemoryDatabase("admin")
+        self._databases: Dict[str, InMemoryDatabase] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        with self._lock:
+            if name not in self._databases:
+                self._databases[name] = InMemoryDatabase(name)
+            return self._databases[name]
+
+    def drop_database(self, name: str) -> None:
+        with self._lock:
+            self._databases.pop(name, None)
+
+    def close(self) -> None:
+        pass
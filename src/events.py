@@ -0,0 +1,548 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+
+import orjson
+
+from src.metrics import Counter, Gauge, registry
+
+TASK_EVENTS_BUFFER_SIZE = int(os.getenv("TASK_EVENTS_BUFFER_SIZE", 100))
+TASK_EVENTS_MAX_SUBSCRIPTIONS = int(os.getenv("TASK_EVENTS_MAX_SUBSCRIPTIONS", 10))
+TASK_EVENTS_KEEP_ALIVE_SECONDS = float(
+    os.getenv("TASK_EVENTS_KEEP_ALIVE_SECONDS", 15)
+)
+
+TASK_EVENTS_PUBLISHED = registry.register(
+    Counter(
+        "task_events_published_total",
+        "Task events published",
+        labelnames=("type",),
+    )
+)
+TASK_EVENTS_OVERFLOWS = registry.register(
+    Counter(
+        "task_events_overflows_total",
+        "Subscriptions closed because their buffer was full",
+    )
+)
+
+
+class Subscription:
+    """
+    Buffer of the events of a user waiting to be
+    sent to one client, filled from any thread and
+    consumed from the event loop of the client
+
+    When a slow client lets the buffer fill up,
+    the subscription is closed as overflowed instead
+    of growing or slowing down the writers, and the
+    client reloads the task list when reconnecting
+
+    Attributes
+    ----------
+    email : str
+        Email of the user
+    overflowed : bool
+        Whether events were lost
+    closed : bool
+        Whether no more events will be received
+    _buffer_size : int
+        Maximum number of buffered events
+    _buffer : Deque[Dict[str, Any]]
+        Events not sent yet
+    _lock : threading.Lock
+        Lock guarding the buffer
+    _loop : asyncio.AbstractEventLoop
+        Event loop of the client
+    _ready : asyncio.Event
+        Event set when there is something to send
+
+    Methods
+    -------
+    push()
+        Buffer an event
+    close()
+        Stop receiving events
+    get()
+        Wait for the buffered events
+    """
+
+    def __init__(self, email: str, buffer_size: int) -> None:
+        """
+        Initialize Subscription class, it
+        must be created in the event loop of the client
+        """
+
+        self.email = email
+        self.overflowed = False
+        self.closed = False
+        self._buffer_size = buffer_size
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def _wake_up(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # The event loop of the client is already closed
+            pass
+
+    def push(self, event: Dict[str, Any]) -> None:
+        """
+        Buffer an event, closing the subscription
+        if the buffer is full
+
+        Parameters
+        ----------
+        event : Dict[str, Any]
+            Event to be sent
+        """
+
+        with self._lock:
+            if self.closed:
+                return
+
+            if len(self._buffer) >= self._buffer_size:
+                self._buffer.clear()
+                self.overflowed = True
+                self.closed = True
+                TASK_EVENTS_OVERFLOWS.inc()
+            else:
+                self._buffer.append(event)
+
+        self._wake_up()
+
+    def close(self) -> None:
+        """
+        Stop receiving events, the
+        buffered ones can still be read
+        """
+
+        with self._lock:
+            self.closed = True
+
+        self._wake_up()
+
+    async def get(self, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait for the buffered events, without
+        waiting once the subscription is closed
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds to wait for an event
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Buffered events, empty if none
+            arrived before the timeout
+        """
+
+        if not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        with self._lock:
+            self._ready.clear()
+            events = list(self._buffer)
+            self._buffer.clear()
+
+        return events
+
+
+class LocalEventBroker:
+    """
+    Broker that only delivers the events
+    to the subscriptions of the process
+
+    Attributes
+    ----------
+    is_shared : bool
+        Whether the events reach other processes
+
+    Methods
+    -------
+    start()
+        Start delivering the published events
+    publish()
+        Publish an event of a user
+    close()
+        Stop delivering events
+    """
+
+    is_shared = False
+
+    def start(self, deliver: Callable[[str, Dict[str, Any]], None]) -> None:
+        """
+        Start delivering the published events
+
+        Parameters
+        ----------
+        deliver : Callable[[str, Dict[str, Any]], None]
+            Function receiving the email and
+            the event of every published event
+        """
+
+        self._deliver = deliver
+
+    def publish(self, email: str, event: Dict[str, Any]) -> None:
+        """
+        Publish an event of a user
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        event : Dict[str, Any]
+            JSON serializable event
+        """
+
+        self._deliver(email, event)
+
+    def close(self) -> None:
+        """
+        Stop delivering events
+        """
+
+
+class RedisEventBroker(LocalEventBroker):
+    """
+    Broker that shares the events between
+    processes through Redis pub/sub, requires
+    the optional redis package
+
+    Attributes
+    ----------
+    _client : Any
+        Redis client
+    _prefix : str
+        Prefix of the channels
+    _thread : Any
+        Thread listening to the channels
+    """
+
+    is_shared = True
+
+    def __init__(
+        self, url: str, prefix: str = "task_events:", client: Any = None
+    ) -> None:
+        """
+        Initialize RedisEventBroker class
+        """
+
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "The redis task events broker requires: pip install redis"
+                )
+
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self._prefix = prefix
+        self._thread: Any = None
+
+    def start(self, deliver: Callable[[str, Dict[str, Any]], None]) -> None:
+        def handle_message(message: Dict[str, Any]) -> None:
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            deliver(channel.removeprefix(self._prefix), json.loads(message["data"]))
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{self._prefix + "*": handle_message})
+        self._thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def publish(self, email: str, event: Dict[str, Any]) -> None:
+        self._client.publish(self._prefix + email, json.dumps(event, default=str))
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+class TaskEventsHub:
+    """
+    Class in charge of fanning out the task
+    events of every user to his connected clients
+
+    Events are published through a broker, so that
+    with a shared broker the clients connected to
+    any process receive the writes of every process
+
+    Attributes
+    ----------
+    _broker : LocalEventBroker
+        Broker of the events
+    _buffer_size : int
+        Maximum number of buffered events per client
+    _max_subscriptions : int
+        Maximum number of clients per user
+    _subscriptions : Dict[str, Set[Subscription]]
+        Subscriptions of every user
+    _lock : threading.Lock
+        Lock guarding the subscriptions
+    _started : bool
+        Whether the broker is delivering events
+
+    Methods
+    -------
+    subscribe()
+        Start receiving the events of a user
+    unsubscribe()
+        Stop receiving the events of a user
+    publish()
+        Publish an event of a user
+    close()
+        Close every subscription
+    subscriptions()
+        Get the number of subscriptions
+    """
+
+    def __init__(
+        self,
+        broker: LocalEventBroker,
+        buffer_size: int = TASK_EVENTS_BUFFER_SIZE,
+        max_subscriptions: int = TASK_EVENTS_MAX_SUBSCRIPTIONS,
+    ) -> None:
+        """
+        Initialize TaskEventsHub class
+        """
+
+        self._broker = broker
+        self._buffer_size = buffer_size
+        self._max_subscriptions = max_subscriptions
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def subscribe(self, email: str) -> Optional[Subscription]:
+        """
+        Start receiving the events of a user
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+
+        Returns
+        -------
+        Optional[Subscription]
+            New subscription, None if the user
+            has too many clients connected
+        """
+
+        subscription = Subscription(email=email, buffer_size=self._buffer_size)
+
+        with self._lock:
+            if not self._started:
+                self._broker.start(self._deliver)
+                self._started = True
+
+            user_subscriptions = self._subscriptions.setdefault(email, set())
+
+            if len(user_subscriptions) >= self._max_subscriptions:
+                return None
+
+            user_subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop receiving the events of a user
+
+        Parameters
+        ----------
+        subscription : Subscription
+            Subscription to be removed
+        """
+
+        subscription.close()
+
+        with self._lock:
+            user_subscriptions = self._subscriptions.get(subscription.email, set())
+            user_subscriptions.discard(subscription)
+
+            if not user_subscriptions:
+                self._subscriptions.pop(subscription.email, None)
+
+    def _deliver(self, email: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            user_subscriptions = list(self._subscriptions.get(email, ()))
+
+        for subscription in user_subscriptions:
+            subscription.push(event)
+
+    def publish(self, email: str, event: Dict[str, Any]) -> None:
+        """
+        Publish an event of a user, without doing
+        anything when nobody could be listening
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        event : Dict[str, Any]
+            JSON serializable event with a type
+        """
+
+        if not self._broker.is_shared and email not in self._subscriptions:
+            return
+
+        TASK_EVENTS_PUBLISHED.inc(type=event["type"])
+        self._broker.publish(email, event)
+
+    def close(self) -> None:
+        """
+        Close every subscription and stop the
+        broker so that the clients disconnect on shutdown
+        """
+
+        with self._lock:
+            subscriptions = [
+                subscription
+                for user_subscriptions in self._subscriptions.values()
+                for subscription in user_subscriptions
+            ]
+            self._subscriptions.clear()
+
+            if self._started:
+                self._broker.close()
+                self._started = False
+
+        for subscription in subscriptions:
+            subscription.close()
+
+    def subscriptions(self) -> int:
+        """
+        Get the number of subscriptions
+
+        Returns
+        -------
+        int
+            Clients connected to the process
+        """
+
+        with self._lock:
+            return sum(
+                len(subscriptions) for subscriptions in self._subscriptions.values()
+            )
+
+
+async def stream_events(
+    subscription: Subscription,
+    keep_alive: float = TASK_EVENTS_KEEP_ALIVE_SECONDS,
+    expires_at: Optional[float] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Format the events of a subscription as
+    Server-Sent Events until it is closed
+    or the token of the client expires
+
+    A comment is sent when there are no events
+    so that proxies keep the connection open, an
+    overflow event is sent when events were lost and
+    an auth_expired event is sent when the token
+    expires, after which the client has to reconnect
+    with a new token
+
+    Parameters
+    ----------
+    subscription : Subscription
+        Subscription of the client
+    keep_alive : float
+        Seconds between comments when idle
+    expires_at : Optional[float]
+        Expiration time of the token of the client
+
+    Yields
+    ------
+    bytes
+        Server-Sent Events
+    """
+
+    yield b": connected\n\n"
+
+    while True:
+        timeout = keep_alive
+
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+
+            if remaining <= 0:
+                yield b"event: auth_expired\ndata: {}\n\n"
+                return
+
+            timeout = min(timeout, remaining)
+
+        events = await subscription.get(timeout=timeout)
+
+        if subscription.overflowed:
+            yield b"event: overflow\ndata: {}\n\n"
+            return
+
+        if not events:
+            if subscription.closed:
+                return
+
+            if expires_at is None or time.time() < expires_at:
+                yield b": keep-alive\n\n"
+            continue
+
+        yield b"".join(
+            b"event: %s\ndata: %s\n\n" % (event["type"].encode(), orjson.dumps(event))
+            for event in events
+        )
+
+
+def create_event_broker(backend: str, url: Optional[str] = None) -> LocalEventBroker:
+    """
+    Create the task events broker selected in the configuration
+
+    Parameters
+    ----------
+    backend : str
+        "memory" or "redis"
+    url : Optional[str]
+        URL of the Redis server
+
+    Returns
+    -------
+    LocalEventBroker
+        Task events broker
+    """
+
+    if backend == "redis":
+        return RedisEventBroker(url=url or "redis://localhost:6379/0")
+
+    return LocalEventBroker()
+
+
+task_events = TaskEventsHub(
+    broker=create_event_broker(
+        backend=os.getenv("TASK_EVENTS_BACKEND", "memory"),
+        url=os.getenv("REDIS_URL"),
+    )
+)
+
+registry.register(
+    Gauge(
+        "task_events_subscriptions",
+        "Clients receiving task events",
+        function=task_events.subscriptions,
+    )
+)
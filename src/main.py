@@ -1,11 +1,94 @@
-from fastapi import FastAPI
+import asyncio
+import signal
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import anyio
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import (
+    JSONResponse,
+    ORJSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+)
 
+from src.auth.auth import Auth
+from src.auth.hashing import password_hasher
 from src.auth.router import auth_router
+from src.compression import CompressionMiddleware
+from src.database.Database import Database
+from src.database.indexes import Indexes
+from src.events import task_events
+from src.metrics import (
+    HTTP_REQUESTS_IN_FLIGHT,
+    MONGODB_CONNECTIONS,
+    MetricsMiddleware,
+    registry,
+)
 from src.tasks.router import tasks_router
+from src.utils import get_db_threads_in_use, run_in_db_pool
+
+
+def install_shutdown_hook(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Answer 503 to the readiness probe and close the
+    task event streams as soon as the server receives
+    SIGINT or SIGTERM, uvicorn only runs the lifespan
+    shutdown once every connection is closed, which
+    the streams would never do on their own
+
+    The handlers installed by the server keep running
+    after the hook, the event loop is woken up by the
+    signal whatever the Python handler is
+
+    Parameters
+    ----------
+    loop : asyncio.AbstractEventLoop
+        Event loop of the server
+    """
+
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous_handler = signal.getsignal(sig)
+
+        def handle_signal(signum, frame, previous_handler=previous_handler):
+            app.state.status = "draining"
+            # The handler can interrupt the event loop while it holds the
+            # locks of the hub, so the streams are closed from the loop
+            try:
+                loop.call_soon_threadsafe(task_events.close)
+            except RuntimeError:
+                # The event loop is already closed
+                pass
+            if callable(previous_handler):
+                previous_handler(signum, frame)
+
+        signal.signal(sig, handle_signal)
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.status = "starting"
+    await run_in_db_pool(Database().warm_up)
+    await run_in_db_pool(Indexes().sync)
+    await anyio.to_thread.run_sync(password_hasher.warm_up)
+    Auth()
+    install_shutdown_hook(asyncio.get_running_loop())
+    app.state.status = "ready"
+    yield
+    # uvicorn has already waited for the requests in flight
+    app.state.status = "draining"
+    task_events.close()
+    password_hasher.shutdown()
+    Database.close_client()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.state.status = "starting"
 
 origins = ["http://localhost:3000", "https://task-manager-frontend-six.vercel.app"]
 
@@ -15,12 +98,61 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(tasks_router)
 
 
+def get_pool_state() -> Dict[str, float]:
+    """
+    Get the state of the MongoDB connection
+    pool and of the database threads
+    """
+
+    return {
+        "open_connections": MONGODB_CONNECTIONS.get(state="open"),
+        "checked_out_connections": MONGODB_CONNECTIONS.get(state="checked_out"),
+        "db_threads_in_use": get_db_threads_in_use(),
+        "requests_in_flight": HTTP_REQUESTS_IN_FLIGHT.get(),
+    }
+
+
 @app.get("/")
 def redirect_to_docs():
     return RedirectResponse("/docs")
+
+
+@app.get("/healthz")
+async def health_check():
+    if not await run_in_db_pool(Database().ping):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "pool": get_pool_state()},
+        )
+    return {"status": "ok", "pool": get_pool_state()}
+
+
+@app.get("/readyz")
+async def readiness_check():
+    if app.state.status != "ready":
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": app.state.status, "pool": get_pool_state()},
+        )
+    if not await run_in_db_pool(Database().ping):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "pool": get_pool_state()},
+        )
+    return {"status": "ready", "pool": get_pool_state()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,432 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    Format a set of labels in the Prometheus text format
+
+    Parameters
+    ----------
+    names : Sequence[str]
+        Names of the labels
+    values : Sequence[str]
+        Values of the labels
+
+    Returns
+    -------
+    str
+        Formatted labels, empty if there are none
+    """
+
+    if not names:
+        return ""
+
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """
+    Base class of the metrics, handling the name,
+    the help text and the labels of the samples
+
+    Attributes
+    ----------
+    name : str
+        Name of the metric
+    documentation : str
+        Help text of the metric
+    labelnames : Tuple[str, ...]
+        Names of the labels of the metric
+    _lock : threading.Lock
+        Lock guarding the samples
+
+    Methods
+    -------
+    render()
+        Render the metric in the Prometheus text format
+    """
+
+    type_name = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """
+        Initialize Metric class
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """
+        Render the metric in the Prometheus text format
+
+        Returns
+        -------
+        str
+            Help, type and samples of the metric
+        """
+
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples(),
+        ]
+
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    Metric whose value only goes up, it can
+    also be read from a function when rendered
+    """
+
+    type_name = "counter"
+
+    def __init__(
+        self,
+        *args: Any,
+        function: Optional[Callable[[], float]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._function = function
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Increase the value of the metric
+        """
+
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        """
+        Get the value of the metric
+        """
+
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {self._function()}"]
+
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in values.items()
+        ]
+
+
+class Gauge(Counter):
+    """
+    Metric whose value can go up and down, it can
+    also be read from a function when rendered
+    """
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """
+        Set the value of the metric
+        """
+
+        with self._lock:
+            self._values[self._label_values(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Decrease the value of the metric
+        """
+
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """
+    Metric that counts observations in
+    cumulative buckets
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        *args: Any,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record an observation
+        """
+
+        key = self._label_values(labels)
+        with self._lock:
+            # Bucket counts followed by the sum and the count
+            values = self._values.setdefault(key, [0] * (len(self._buckets) + 2))
+            for index, bucket in enumerate(self._buckets):
+                if value <= bucket:
+                    values[index] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """
+        Record the time spent inside the context
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = {key: list(value) for key, value in self._values.items()}
+
+        samples = []
+        bucket_labelnames = self.labelnames + ("le",)
+
+        for key, value in values.items():
+            for bucket, count in zip(self._buckets, value):
+                bucket_labels = _format_labels(bucket_labelnames, key + (str(bucket),))
+                samples.append(f"{self.name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels(bucket_labelnames, key + ("+Inf",))
+            samples.append(f"{self.name}_bucket{inf_labels} {value[-1]}")
+            labels = _format_labels(self.labelnames, key)
+            samples.append(f"{self.name}_sum{labels} {value[-2]}")
+            samples.append(f"{self.name}_count{labels} {value[-1]}")
+
+        return samples
+
+
+class Registry:
+    """
+    Class in charge of holding the metrics
+    and rendering them for the /metrics endpoint
+
+    Attributes
+    ----------
+    _metrics : Dict[str, Metric]
+        Registered metrics by name
+
+    Methods
+    -------
+    register()
+        Register a metric
+    render()
+        Render every metric in the Prometheus text format
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize Registry class
+        """
+
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        """
+        Register a metric and return it
+        """
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format
+        """
+
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Latency of the HTTP requests",
+        labelnames=("method", "route", "status"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests being served")
+)
+STAGE_DURATION = registry.register(
+    Histogram(
+        "stage_duration_seconds",
+        "Latency of the stages of a request",
+        labelnames=("stage",),
+    )
+)
+MONGODB_CONNECTIONS = registry.register(
+    Gauge(
+        "mongodb_connections",
+        "Open MongoDB connections by state",
+        labelnames=("state",),
+    )
+)
+MONGODB_CHECKOUT_FAILURES = registry.register(
+    Counter(
+        "mongodb_connection_checkout_failures_total",
+        "Connections that could not be checked out of the pool",
+        labelnames=("reason",),
+    )
+)
+
+
+def timed(stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorate a function so that its latency is
+    recorded as a stage of the request
+
+    Parameters
+    ----------
+    stage : str
+        Name of the stage
+
+    Returns
+    -------
+    Callable[[Callable[..., Any]], Callable[..., Any]]
+        Decorator of the function
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with STAGE_DURATION.time(stage=stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Class in charge of keeping track of the
+    connections of the MongoDB pool
+    """
+
+    def pool_created(self, event: Any) -> None:
+        pass
+
+    def pool_ready(self, event: Any) -> None:
+        pass
+
+    def pool_cleared(self, event: Any) -> None:
+        pass
+
+    def pool_closed(self, event: Any) -> None:
+        pass
+
+    def connection_created(self, event: Any) -> None:
+        MONGODB_CONNECTIONS.inc(state="open")
+
+    def connection_ready(self, event: Any) -> None:
+        pass
+
+    def connection_closed(self, event: Any) -> None:
+        MONGODB_CONNECTIONS.dec(state="open")
+
+    def connection_check_out_started(self, event: Any) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: Any) -> None:
+        MONGODB_CHECKOUT_FAILURES.inc(reason=event.reason)
+
+    def connection_checked_out(self, event: Any) -> None:
+        MONGODB_CONNECTIONS.inc(state="checked_out")
+
+    def connection_checked_in(self, event: Any) -> None:
+        MONGODB_CONNECTIONS.dec(state="checked_out")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware in charge of recording the
+    latency of every HTTP request by route and
+    the number of requests in flight
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status_code,
+            )
@@ -0,0 +1,335 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, Request
+
+from src.auth.auth import Auth
+from src.auth.exceptions import TokenError
+from src.metrics import Counter, registry
+
+RATE_LIMIT_PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+
+RATE_LIMIT_REJECTED = registry.register(
+    Counter(
+        "rate_limit_rejected_total",
+        "Requests rejected by the rate limiter",
+        labelnames=("rule",),
+    )
+)
+
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class TooManyRequests(HTTPException):
+    """
+    Error occurring when a client exceeds
+    the rate limit of a route
+    """
+
+
+class InMemoryRateLimitBackend:
+    """
+    Rate limit backend that keeps the token
+    buckets in the process, forgetting the least
+    recently used one when there are too many
+
+    Attributes
+    ----------
+    _max_keys : int
+        Maximum number of buckets
+    _buckets : OrderedDict[str, Tuple[float, float]]
+        Tokens and last update of every bucket
+    _lock : threading.Lock
+        Lock guarding the buckets
+
+    Methods
+    -------
+    acquire()
+        Take a token from a bucket
+    """
+
+    is_blocking = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS) -> None:
+        """
+        Initialize InMemoryRateLimitBackend class
+        """
+
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, capacity: int) -> float:
+        """
+        Take a token from a bucket
+
+        Parameters
+        ----------
+        key : str
+            Key of the bucket
+        rate : float
+            Tokens added to the bucket every second
+        capacity : int
+            Maximum number of tokens of the bucket
+
+        Returns
+        -------
+        float
+            Seconds until a token is available,
+            0 if the token was taken
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            wait = 0.0
+
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def clear(self) -> None:
+        """
+        Remove every bucket
+        """
+
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimitBackend:
+    """
+    Rate limit backend that keeps the token
+    buckets in Redis so that they are shared by
+    every process, requires the optional redis package
+
+    Attributes
+    ----------
+    _client : Any
+        Redis client
+    _prefix : str
+        Prefix of the keys stored in Redis
+
+    Methods
+    -------
+    acquire()
+        Take a token from a bucket
+    """
+
+    is_blocking = True
+
+    def __init__(
+        self, url: str, prefix: str = "rate_limit:", client: Any = None
+    ) -> None:
+        """
+        Initialize RedisRateLimitBackend class
+        """
+
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "The redis rate limit backend requires: pip install redis"
+                )
+
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self._prefix = prefix
+
+    def acquire(self, key: str, rate: float, capacity: int) -> float:
+        wait = self._client.eval(
+            REDIS_TOKEN_BUCKET_SCRIPT,
+            1,
+            self._prefix + key,
+            rate,
+            capacity,
+            time.time(),
+        )
+
+        return float(wait)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self._prefix + "*"):
+            self._client.delete(key)
+
+
+if os.getenv("RATE_LIMIT_BACKEND", "memory") == "redis":
+    rate_limit_backend: Any = RedisRateLimitBackend(
+        url=os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+    )
+else:
+    rate_limit_backend = InMemoryRateLimitBackend()
+
+
+async def client_ip(request: Request) -> Optional[str]:
+    """
+    Get the IP address of the client, run uvicorn
+    with --proxy-headers behind a proxy
+    """
+
+    return request.client.host if request.client else None
+
+
+async def authorized_email(request: Request) -> Optional[str]:
+    """
+    Get the email of the user_email query parameter,
+    only once the bearer token is valid so that requests
+    with bogus tokens cannot use up the budget of a user
+    """
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        Auth().decode_token(token=token)
+    except TokenError:
+        return None
+
+    return request.query_params.get("user_email")
+
+
+async def form_email(request: Request) -> Optional[str]:
+    """
+    Get the email of the username field of a login form
+    """
+
+    username = (await request.form()).get("username")
+
+    return username if isinstance(username, str) else None
+
+
+class RateLimit:
+    """
+    Dependency in charge of rejecting the requests
+    that exceed a token bucket rate limit before
+    the route does any work
+
+    The limit is read from an environment variable
+    as "<requests>/<second|minute|hour>", an empty
+    value disables it
+
+    Attributes
+    ----------
+    name : str
+        Name of the rule
+    rate : float
+        Requests allowed every second
+    capacity : int
+        Maximum burst of requests
+    _key : Callable[[Request], Awaitable[Optional[str]]]
+        Function getting the key of the bucket
+    """
+
+    def __init__(
+        self,
+        name: str,
+        env_name: str,
+        default: str,
+        key: Callable[[Request], Awaitable[Optional[str]]],
+    ) -> None:
+        """
+        Initialize RateLimit class
+        """
+
+        self.name = name
+        self.rate, self.capacity = self._parse(os.getenv(env_name, default))
+        self._key = key
+
+    @staticmethod
+    def _parse(limit: str) -> Tuple[float, int]:
+        """
+        Parse a rate limit
+
+        Parameters
+        ----------
+        limit : str
+            Rate limit such as "10/minute"
+
+        Returns
+        -------
+        Tuple[float, int]
+            Requests allowed every second and maximum
+            burst, 0 requests if there is no limit
+        """
+
+        if not limit:
+            return 0.0, 0
+
+        requests, _, period = limit.partition("/")
+
+        return int(requests) / RATE_LIMIT_PERIODS[period.strip()], int(requests)
+
+    async def __call__(self, request: Request) -> None:
+        if not self.capacity:
+            return
+
+        key = await self._key(request)
+
+        if not key:
+            return
+
+        bucket_key = f"{self.name}:{key.strip().lower()}"
+
+        if rate_limit_backend.is_blocking:
+            wait = await anyio.to_thread.run_sync(
+                rate_limit_backend.acquire, bucket_key, self.rate, self.capacity
+            )
+        else:
+            wait = rate_limit_backend.acquire(bucket_key, self.rate, self.capacity)
+
+        if wait:
+            RATE_LIMIT_REJECTED.inc(rule=self.name)
+            raise TooManyRequests(
+                status_code=429,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+
+AUTH_IP_RATE_LIMIT = RateLimit("auth_ip", "RATE_LIMIT_AUTH_IP", "30/minute", client_ip)
+LOGIN_EMAIL_RATE_LIMIT = RateLimit(
+    "login_email", "RATE_LIMIT_LOGIN_EMAIL", "10/minute", form_email
+)
+TASKS_IP_RATE_LIMIT = RateLimit(
+    "tasks_ip", "RATE_LIMIT_TASKS_IP", "1200/minute", client_ip
+)
+TASKS_EMAIL_RATE_LIMIT = RateLimit(
+    "tasks_email", "RATE_LIMIT_TASKS_EMAIL", "600/minute", authorized_email
+)
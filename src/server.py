@@ -0,0 +1,313 @@
+"""
+Run the API in production with several uvicorn workers
+
+Usage: python -m src.server
+"""
+
+import functools
+import logging
+import os
+import random
+import signal
+import sys
+import threading
+from multiprocessing.context import SpawnProcess
+from socket import socket
+from types import FrameType
+from typing import Dict, List, Optional
+
+import uvicorn
+from uvicorn._subprocess import get_subprocess
+
+logger = logging.getLogger("uvicorn.error")
+
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 8000))
+SERVER_KEEP_ALIVE_SECONDS = int(os.getenv("SERVER_KEEP_ALIVE_SECONDS", 75))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", 2048))
+SERVER_LIMIT_CONCURRENCY = int(os.getenv("SERVER_LIMIT_CONCURRENCY", 1000))
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", 10000))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 1000))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "false").lower() == "true"
+SERVER_DB_CONNECTIONS = int(os.getenv("SERVER_DB_CONNECTIONS", 100))
+
+HANDLED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+# Exit code of a worker that could not start, as in uvicorn
+STARTUP_FAILURE = 3
+
+# Stores kept in the memory of every worker unless they use Redis
+SHARED_STORE_BACKENDS = (
+    "TASKS_CACHE_BACKEND",
+    "TASK_EVENTS_BACKEND",
+    "RATE_LIMIT_BACKEND",
+)
+
+
+def get_process_local_stores() -> List[str]:
+    """
+    Get the stores that are not shared between
+    the workers because they do not use Redis
+
+    Returns
+    -------
+    List[str]
+        Variables selecting the backend of the stores
+    """
+
+    return [
+        name
+        for name in SHARED_STORE_BACKENDS
+        if os.getenv(name, "memory").lower() != "redis"
+    ]
+
+
+def get_worker_count() -> int:
+    """
+    Get the number of workers, WEB_CONCURRENCY or one
+    per CPU, but only one by default while a store is
+    kept in the memory of every worker, since the
+    workers would not see the cache invalidations,
+    the task events and the rate limits of each other
+
+    Returns
+    -------
+    int
+        Number of workers
+    """
+
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+
+    if get_process_local_stores():
+        return 1
+
+    return os.cpu_count() or 1
+
+
+def get_worker_environment(
+    workers: int, db_connections: int, cpus: int
+) -> Dict[str, str]:
+    """
+    Size the pools of every worker from the totals of
+    the server, without overriding the variables that
+    are already set
+
+    Parameters
+    ----------
+    workers : int
+        Number of workers
+    db_connections : int
+        MongoDB connections of the whole server
+    cpus : int
+        Number of CPUs
+
+    Returns
+    -------
+    Dict[str, str]
+        Environment variables to be set in the workers
+    """
+
+    environment = {
+        # DB_THREADPOOL_SIZE follows the pool size when it is not set
+        "MONGODB_MAX_POOL_SIZE": str(max(1, db_connections // workers)),
+        "PASSWORD_HASHING_WORKERS": str(max(1, cpus // workers)),
+    }
+
+    return {
+        name: value for name, value in environment.items() if not os.getenv(name)
+    }
+
+
+def get_worker_config() -> uvicorn.Config:
+    """
+    Get the configuration of a worker, every worker
+    restarts after a different number of requests so
+    that they do not restart at the same time
+
+    Returns
+    -------
+    uvicorn.Config
+        Configuration of the worker
+    """
+
+    max_requests = None
+
+    if SERVER_MAX_REQUESTS:
+        max_requests = SERVER_MAX_REQUESTS + random.randint(
+            0, SERVER_MAX_REQUESTS_JITTER
+        )
+
+    return uvicorn.Config(
+        "src.main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        loop="uvloop",
+        http="httptools",
+        timeout_keep_alive=SERVER_KEEP_ALIVE_SECONDS,
+        backlog=SERVER_BACKLOG,
+        limit_concurrency=SERVER_LIMIT_CONCURRENCY or None,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        access_log=SERVER_ACCESS_LOG,
+        proxy_headers=True,
+    )
+
+
+def run_worker(server: uvicorn.Server, sockets: List[socket]) -> None:
+    """
+    Run a worker on the shared sockets, exiting with
+    STARTUP_FAILURE when it could not start, since
+    uvicorn returns normally when the startup of the
+    application fails
+
+    Parameters
+    ----------
+    server : uvicorn.Server
+        Server of the worker
+    sockets : List[socket]
+        Sockets shared by the workers
+    """
+
+    server.run(sockets=sockets)
+
+    if not server.started:
+        sys.exit(STARTUP_FAILURE)
+
+
+class WorkerSupervisor:
+    """
+    Class in charge of running the workers on a
+    shared socket and starting a new worker every
+    time one exits after reaching its maximum number
+    of requests, the server is stopped when a worker
+    fails instead of restarting it forever
+
+    Attributes
+    ----------
+    _workers : int
+        Number of workers
+    _sockets : List[socket]
+        Sockets shared by the workers
+    _processes : List[Optional[SpawnProcess]]
+        Process of every worker
+    _should_exit : threading.Event
+        Event set when the server is stopped
+
+    Methods
+    -------
+    run()
+        Run the workers until the server is stopped
+    """
+
+    def __init__(self, workers: int) -> None:
+        """
+        Initialize WorkerSupervisor class
+        """
+
+        self._workers = workers
+        self._sockets: List[socket] = []
+        self._processes: List[Optional[SpawnProcess]] = [None] * workers
+        self._should_exit = threading.Event()
+
+    def _signal_handler(self, sig: int, frame: Optional[FrameType]) -> None:
+        self._should_exit.set()
+
+    def _start_worker(self, index: int) -> None:
+        config = get_worker_config()
+        server = uvicorn.Server(config=config)
+        process = get_subprocess(
+            config=config,
+            target=functools.partial(run_worker, server),
+            sockets=self._sockets,
+        )
+        process.start()
+        self._processes[index] = process
+
+    def _check_workers(self) -> bool:
+        for index, process in enumerate(self._processes):
+            if process is None or process.is_alive():
+                continue
+
+            if process.exitcode != 0:
+                logger.error(
+                    "Worker [%d] exited with code %s, stopping the server",
+                    process.pid,
+                    process.exitcode,
+                )
+                return False
+
+            logger.info("Worker [%d] exited, starting a new one", process.pid)
+            self._start_worker(index)
+
+        return True
+
+    def run(self) -> int:
+        """
+        Run the workers until the server is stopped,
+        stopping them gracefully on SIGINT or SIGTERM
+        or when a worker fails
+
+        Returns
+        -------
+        int
+            Exit code of the server, 1 if a worker failed
+        """
+
+        config = get_worker_config()
+        config.configure_logging()
+        self._sockets = [config.bind_socket()]
+
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, self._signal_handler)
+
+        os.environ.update(
+            get_worker_environment(
+                workers=self._workers,
+                db_connections=SERVER_DB_CONNECTIONS,
+                cpus=os.cpu_count() or 1,
+            )
+        )
+
+        local_stores = get_process_local_stores()
+
+        if self._workers > 1 and local_stores:
+            logger.warning(
+                "%s not set to redis, every worker has its own cache, task "
+                "events and rate limits",
+                ", ".join(local_stores),
+            )
+
+        logger.info("Starting %d workers [%d]", self._workers, os.getpid())
+
+        for index in range(self._workers):
+            self._start_worker(index)
+
+        exit_code = 0
+
+        while not self._should_exit.wait(0.5):
+            if not self._check_workers():
+                exit_code = 1
+                break
+
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+
+        for process in self._processes:
+            if process is not None:
+                process.join(SERVER_GRACEFUL_TIMEOUT + 5)
+                if process.is_alive():
+                    process.kill()
+
+        for server_socket in self._sockets:
+            server_socket.close()
+
+        logger.info("Stopped the workers [%d]", os.getpid())
+
+        return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(WorkerSupervisor(workers=get_worker_count()).run())
@@ -22,12 +22,43 @@ class UserDoesNotExists(HTTPException):
 class TaskAlreadyExists(HTTPException):
     """
     Error occurring when the new task that
-    is trying to be inserted already exists
+    is trying to be inserted, or the new name
+    of a task, already exists
     """
 
 
 class TaskDoesNotExist(HTTPException):
     """
-    Error occurring when the task you
-    are trying to delete does not exist
+    Error occurring when the task you are
+    trying to delete or update does not exist
+    """
+
+
+class InvalidCursor(HTTPException):
+    """
+    Error occurring when the pagination cursor
+    cannot be decoded or does not match the
+    requested sorting
+    """
+
+
+class TasksNotModified(HTTPException):
+    """
+    Error occurring when the task list
+    has not changed since the version
+    the client already has
+    """
+
+
+class InvalidImportFile(HTTPException):
+    """
+    Error occurring when an imported file
+    cannot be read as NDJSON or CSV tasks
+    """
+
+
+class TooManySubscriptions(HTTPException):
+    """
+    Error occurring when a user has too many
+    clients receiving the events of his tasks
     """
@@ -0,0 +1,155 @@
+"""
+Move the tasks embedded in the user documents to the tasks collection
+
+The migration walks the users that still have an embedded task list in
+batches ordered by ID, so it can be stopped and started again at any time.
+Run it while the API is in "dual" storage mode and switch
+TASKS_STORAGE_MODE to "collection" once it reports no pending users
+
+Usage: python -m src.tasks.migration [--batch-size 500]
+"""
+
+import argparse
+from typing import Any, Dict, List
+
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, UpdateOne
+
+from src.database.Database import Database
+from src.database.indexes import Indexes
+
+
+class TasksMigration:
+    """
+    Class in charge of moving the embedded
+    tasks of the users to the tasks collection
+
+    Attributes
+    ----------
+    _db_client : pymongo.MongoClient
+        MongoDB client
+    _users_collection : pymongo.collection.Collection
+        Users collection
+    _tasks_collection : pymongo.collection.Collection
+        Tasks collection
+    _batch_size : int
+        Number of users read per batch
+
+    Methods
+    -------
+    migrate_user()
+        Move the embedded tasks of a user
+    run()
+        Migrate every user with embedded tasks
+    """
+
+    def __init__(self, batch_size: int = 500) -> None:
+        """
+        Initialize TasksMigration class
+        """
+
+        self._db_client = Database().instantiate_client()
+        self._users_collection = self._db_client["users_db"]["users_collection"]
+        self._tasks_collection = self._db_client["users_db"]["tasks_collection"]
+        self._batch_size = batch_size
+
+    def migrate_user(self, user_id: ObjectId) -> int:
+        """
+        Copy the embedded tasks of a user to the tasks
+        collection and remove them from the user document
+        only if they did not change in the meantime
+
+        Parameters
+        ----------
+        user_id : ObjectId
+            ID of the user
+
+        Returns
+        -------
+        int
+            Number of tasks inserted in the tasks collection
+        """
+
+        inserted_ids: Dict[str, Any] = {}
+
+        while True:
+            user = self._users_collection.find_one(
+                {"_id": user_id, "tasks": {"$exists": True}}, {"tasks": 1}
+            )
+
+            if not user:
+                return len(inserted_ids)
+
+            embedded_tasks: List[Dict[str, Any]] = user["tasks"]
+            embedded_names = {task["name"] for task in embedded_tasks}
+
+            stale_ids = [
+                inserted_ids.pop(name)
+                for name in list(inserted_ids)
+                if name not in embedded_names
+            ]
+            if stale_ids:
+                self._tasks_collection.delete_many({"_id": {"$in": stale_ids}})
+
+            if embedded_tasks:
+                result = self._tasks_collection.bulk_write(
+                    [
+                        UpdateOne(
+                            {"user_id": user_id, "name": task["name"]},
+                            {"$setOnInsert": task},
+                            upsert=True,
+                        )
+                        for task in embedded_tasks
+                    ],
+                    ordered=False,
+                )
+                for index, upserted_id in result.upserted_ids.items():
+                    inserted_ids[embedded_tasks[index]["name"]] = upserted_id
+
+            if self._users_collection.update_one(
+                {"_id": user_id, "tasks": embedded_tasks}, {"$unset": {"tasks": ""}}
+            ).modified_count:
+                return len(inserted_ids)
+
+    def run(self) -> Dict[str, int]:
+        """
+        Migrate every user with embedded tasks
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of migrated users and tasks
+        """
+
+        summary = {"users": 0, "tasks": 0}
+        query: Dict[str, Any] = {"tasks": {"$exists": True}}
+
+        while True:
+            batch = list(
+                self._users_collection.find(query, {"_id": 1})
+                .sort("_id", ASCENDING)
+                .limit(self._batch_size)
+            )
+
+            if not batch:
+                return summary
+
+            for user in batch:
+                summary["tasks"] += self.migrate_user(user_id=user["_id"])
+                summary["users"] += 1
+
+            query["_id"] = {"$gt": batch[-1]["_id"]}
+            print(f"Migrated {summary['users']} users and {summary['tasks']} tasks")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    Indexes().sync()
+    migration_summary = TasksMigration(batch_size=args.batch_size).run()
+    print(
+        f"Migration finished: {migration_summary['users']} users and "
+        f"{migration_summary['tasks']} tasks"
+    )
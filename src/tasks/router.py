@@ -1,27 +1,187 @@
-from fastapi import APIRouter, Depends, status
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
 
 from src.auth.auth import oauth2_scheme
-from src.tasks.schemas import Task
+from src.compression import negotiate_encoding
+from src.events import Subscription, stream_events, task_events
+from src.rate_limit import TASKS_EMAIL_RATE_LIMIT, TASKS_IP_RATE_LIMIT
+from src.tasks.exceptions import TooManySubscriptions
+from src.tasks.schemas import BulkTaskOperations, Task, TaskUpdate
 from src.tasks.service import Tasks
+from src.utils import iterate_in_db_pool, run_in_db_pool
+
+
+class TaskEventsResponse(StreamingResponse):
+    """
+    Server-Sent Events response that removes its
+    subscription when the response ends, even when
+    the client disconnects before the stream starts
+
+    Attributes
+    ----------
+    subscription : Subscription
+        Subscription of the client
+    """
+
+    def __init__(
+        self, content: AsyncIterator[bytes], subscription: Subscription
+    ) -> None:
+        """
+        Initialize TaskEventsResponse class
+        """
+
+        super().__init__(
+            content,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            task_events.unsubscribe(self.subscription)
+
 
-tasks_router = APIRouter(prefix="/tasks")
+tasks_router = APIRouter(
+    prefix="/tasks",
+    dependencies=[Depends(TASKS_IP_RATE_LIMIT), Depends(TASKS_EMAIL_RATE_LIMIT)],
+)
 
 
 @tasks_router.post("/get_tasks", status_code=status.HTTP_200_OK)
-def get_tasks(user_email: str, token: str = Depends(oauth2_scheme)):
-    get_tasks_response = Tasks().get_user_tasks(email=user_email, token=token)
-    return {"tasks": get_tasks_response}
+async def get_tasks(
+    user_email: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    priority: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    sort: Literal["name", "-name", "priority", "-priority"] = "name",
+    if_none_match: Optional[str] = Header(None),
+    token: str = Depends(oauth2_scheme),
+):
+    get_tasks_response = await run_in_db_pool(
+        Tasks().get_user_tasks,
+        email=user_email,
+        token=token,
+        limit=limit,
+        cursor=cursor,
+        priority=priority,
+        name_prefix=name_prefix,
+        sort=sort,
+        if_none_match=if_none_match,
+    )
+    # The tasks are plain documents, so jsonable_encoder is skipped
+    etag = get_tasks_response.pop("etag")
+    return ORJSONResponse(get_tasks_response, headers={"ETag": etag})
 
 
 @tasks_router.patch("/add_task", status_code=status.HTTP_200_OK)
-def add_task(user_email: str, task: Task, token: str = Depends(oauth2_scheme)):
-    add_task_response = Tasks().add_task(email=user_email, new_task=task, token=token)
+async def add_task(user_email: str, task: Task, token: str = Depends(oauth2_scheme)):
+    add_task_response = await run_in_db_pool(
+        Tasks().add_task, email=user_email, new_task=task, token=token
+    )
     return {"detail": add_task_response}
 
 
 @tasks_router.patch("/delete_task", status_code=status.HTTP_200_OK)
-def delete_task(user_email: str, task_name: str, token: str = Depends(oauth2_scheme)):
-    delete_task_response = Tasks().delete_task(
-        email=user_email, task_name=task_name, token=token
+async def delete_task(
+    user_email: str, task_name: str, token: str = Depends(oauth2_scheme)
+):
+    delete_task_response = await run_in_db_pool(
+        Tasks().delete_task, email=user_email, task_name=task_name, token=token
     )
     return {"detail": delete_task_response}
+
+
+@tasks_router.patch("/update_task", status_code=status.HTTP_200_OK)
+async def update_task(
+    user_email: str,
+    task_name: str,
+    task_update: TaskUpdate,
+    token: str = Depends(oauth2_scheme),
+):
+    update_task_response = await run_in_db_pool(
+        Tasks().update_task,
+        email=user_email,
+        task_name=task_name,
+        task_update=task_update,
+        token=token,
+    )
+    return update_task_response
+
+
+@tasks_router.patch("/bulk_tasks", status_code=status.HTTP_200_OK)
+async def bulk_tasks(
+    user_email: str,
+    bulk_operations: BulkTaskOperations,
+    token: str = Depends(oauth2_scheme),
+):
+    bulk_tasks_response = await run_in_db_pool(
+        Tasks().bulk_tasks,
+        email=user_email,
+        operations=bulk_operations.operations,
+        token=token,
+    )
+    return bulk_tasks_response
+
+
+@tasks_router.post("/export_tasks", status_code=status.HTTP_200_OK)
+async def export_tasks(
+    user_email: str,
+    accept_encoding: Optional[str] = Header(None),
+    token: str = Depends(oauth2_scheme),
+):
+    compress = negotiate_encoding(accept_encoding or "", ["gzip"]) == "gzip"
+    export_chunks = await run_in_db_pool(
+        Tasks().export_tasks, email=user_email, token=token, compress=compress
+    )
+    headers = {
+        "Content-Disposition": 'attachment; filename="tasks.ndjson"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        iterate_in_db_pool(export_chunks),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+@tasks_router.patch("/import_tasks", status_code=status.HTTP_200_OK)
+async def import_tasks(
+    user_email: str, file: UploadFile, token: str = Depends(oauth2_scheme)
+):
+    is_csv = (file.filename or "").lower().endswith(".csv") or (
+        file.content_type == "text/csv"
+    )
+    import_tasks_response = await run_in_db_pool(
+        Tasks().import_tasks,
+        email=user_email,
+        tasks_file=file.file,
+        file_format="csv" if is_csv else "ndjson",
+        token=token,
+    )
+    return import_tasks_response
+
+
+@tasks_router.get("/events", status_code=status.HTTP_200_OK)
+async def task_events_stream(user_email: str, token: str = Depends(oauth2_scheme)):
+    expires_at = await run_in_db_pool(
+        Tasks().check_user, email=user_email, token=token
+    )
+    subscription = task_events.subscribe(user_email)
+    if subscription is None:
+        raise TooManySubscriptions(
+            status_code=429, detail="Too many connections for the user"
+        )
+
+    # Idle clients wait on the hub, MongoDB is only read when connecting
+    return TaskEventsResponse(
+        stream_events(subscription, expires_at=expires_at), subscription
+    )
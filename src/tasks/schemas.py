@@ -1,7 +1,82 @@
-from pydantic import BaseModel
+import os
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+TASKS_BULK_MAX_OPERATIONS = int(os.getenv("TASKS_BULK_MAX_OPERATIONS", 1000))
 
 
 class Task(BaseModel):
     name: str
     description: str
     priority: str
+
+
+class TaskUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    priority: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "TaskUpdate":
+        """
+        Reject updates that do not change any field
+        """
+
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("At least one field has to be updated")
+
+        return self
+
+
+class AddTaskOperation(BaseModel):
+    op: Literal["add"]
+    task: Task
+
+
+class DeleteTaskOperation(BaseModel):
+    op: Literal["delete"]
+    name: str
+
+
+class UpdateTaskOperation(BaseModel):
+    op: Literal["update"]
+    name: str
+    task: Task
+
+
+TaskOperation = Annotated[
+    Union[AddTaskOperation, DeleteTaskOperation, UpdateTaskOperation],
+    Field(discriminator="op"),
+]
+
+
+class BulkTaskOperations(BaseModel):
+    operations: List[TaskOperation] = Field(
+        min_length=1, max_length=TASKS_BULK_MAX_OPERATIONS
+    )
+
+    @model_validator(mode="after")
+    def check_unique_names(self) -> "BulkTaskOperations":
+        """
+        Reject batches that touch the same task more
+        than once, so that the operations do not
+        depend on the order they are applied in
+        """
+
+        names = set()
+
+        for operation in self.operations:
+            operation_names = set()
+
+            if operation.op != "add":
+                operation_names.add(operation.name)
+            if operation.op != "delete":
+                operation_names.add(operation.task.name)
+
+            if names & operation_names:
+                raise ValueError("Every task can only appear in one operation")
+
+            names |= operation_names
+
+        return self
@@ -1,17 +1,76 @@
-from typing import Any, Dict, List, Union
+import base64
+import csv
+import io
+import json
+import os
+import re
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+import orjson
+from pydantic import ValidationError
+from pymongo import (
+    ASCENDING,
+    DESCENDING,
+    DeleteOne,
+    InsertOne,
+    ReturnDocument,
+    UpdateOne,
+)
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from src.auth.auth import Auth
 from src.auth.exceptions import TokenError
+from src.cache import create_cache_backend
 from src.database.Database import Database
+from src.database.indexes import TASKS_NAME_INDEX, missing_unique_indexes
+from src.events import task_events
+from src.metrics import STAGE_DURATION, Counter, Gauge, registry
 from src.tasks.exceptions import (
+    InvalidCursor,
+    InvalidImportFile,
     NotAuthorizedError,
     TaskAlreadyExists,
     TaskDoesNotExist,
+    TasksNotModified,
     UserDoesNotExists,
 )
-from src.tasks.schemas import Task
+from src.tasks.migration import TasksMigration
+from src.tasks.schemas import Task, TaskOperation, TaskUpdate
 from src.utils import Utils
 
+TASKS_STORAGE_MODE = os.getenv("TASKS_STORAGE_MODE", "dual")
+
+SORT_FIELDS = {"name": ["name"], "priority": ["priority", "name"]}
+
+TASKS_EXPORT_BATCH_SIZE = int(os.getenv("TASKS_EXPORT_BATCH_SIZE", 500))
+TASKS_IMPORT_BATCH_SIZE = int(os.getenv("TASKS_IMPORT_BATCH_SIZE", 500))
+
+# Only the first invalid rows are reported so that the response stays small
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+tasks_cache = create_cache_backend(
+    backend=os.getenv("TASKS_CACHE_BACKEND", "memory"),
+    ttl=float(os.getenv("TASKS_CACHE_TTL_SECONDS", 30)),
+    max_entries=int(os.getenv("TASKS_CACHE_SIZE", 10000)),
+    url=os.getenv("REDIS_URL"),
+)
+
+for stat_name, metric_class in (
+    ("hits", Counter),
+    ("misses", Counter),
+    ("evictions", Counter),
+    ("entries", Gauge),
+    ("bytes", Gauge),
+):
+    registry.register(
+        metric_class(
+            f"tasks_cache_{stat_name}" + ("_total" if metric_class is Counter else ""),
+            f"Task list cache {stat_name}",
+            function=lambda stat_name=stat_name: tasks_cache.stats()[stat_name],
+        )
+    )
+
 
 class Tasks:
     """
@@ -19,41 +78,290 @@ class Tasks:
     the actions related to
     the tasks of a user
 
+    Tasks are stored in their own collection,
+    one document per task keyed by the ID of
+    the user. While TASKS_STORAGE_MODE is "dual"
+    the tasks still embedded in a user document
+    are migrated the first time the user is accessed
+
+    Every write increases the tasks_version of the
+    user, which is sent as the ETag of the task list.
+    The full task list of a user is cached in
+    tasks_cache and invalidated on every write,
+    which is also published to task_events
+
     Attributes
     ----------
     _db_client : pymongo.MongoClient
         MongoDB client
     _users_collection : pymongo.collection.Collection
         Users collection
+    _tasks_collection : pymongo.collection.Collection
+        Tasks collection
+    _dual_read : bool
+        Whether the embedded tasks are migrated on access
     _auth : Auth
         Authentication handler
 
     Methods
     -------
     get_user_tasks()
-        Obtain the tasks associated with a
-        user by searching for him by email
+        Obtain a page of the tasks associated
+        with a user by searching for him by email
     add_task()
         Add new task to a user's task list
     delete_task()
         Delete task from user's task list
+    update_task()
+        Update some fields of a task in place
+    bulk_tasks()
+        Apply a batch of operations to a user's task list
+    export_tasks()
+        Stream all the tasks of a user as NDJSON
+    import_tasks()
+        Add the tasks of an NDJSON or CSV file
+    check_user()
+        Check the token and that a user exists
     """
 
     def __init__(self) -> None:
         """
-        Initialize User class
+        Initialize Tasks class
         """
 
         self._db_client = Database().instantiate_client()
         self._users_collection = self._db_client["users_db"]["users_collection"]
+        self._tasks_collection = self._db_client["users_db"]["tasks_collection"]
+        self._dual_read = TASKS_STORAGE_MODE == "dual"
         self._auth = Auth()
 
+    def _get_user(self, email: str) -> Dict[str, Any]:
+        """
+        Get the ID and the version of the tasks
+        of a user, moving his embedded tasks to
+        the tasks collection first when running
+        in dual mode
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+
+        Returns
+        -------
+        Dict[str, Any]
+            ID of the user and version of his tasks
+
+        Raises
+        ------
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        """
+
+        projection = {"_id": 1, "tasks_version": 1}
+
+        if self._dual_read:
+            projection["tasks"] = 1
+
+        user = Utils().get_user(user_email=email, projection=projection)
+
+        if not user:
+            raise UserDoesNotExists(status_code=404, detail="User not found in DB")
+
+        if "tasks" in user:
+            TasksMigration().migrate_user(user_id=user["_id"])
+
+        return {"_id": user["_id"], "tasks_version": user.get("tasks_version", 0)}
+
+    def _check_name_available(self, user_id: Any, name: str) -> None:
+        """
+        Check that a user has no task with a name
+        while the unique index on the task names is
+        missing, otherwise the index rejects duplicates
+
+        Parameters
+        ----------
+        user_id : Any
+            ID of the user
+        name : str
+            Name of the task
+
+        Raises
+        ------
+        TaskAlreadyExists
+            Error occurring when the new task that
+            is trying to be inserted, or the new name
+            of a task, already exists
+        """
+
+        if TASKS_NAME_INDEX not in missing_unique_indexes:
+            return
+
+        if self._tasks_collection.find_one(
+            {"user_id": user_id, "name": name}, {"_id": 1}
+        ):
+            raise TaskAlreadyExists(status_code=409, detail="Task already exists")
+
+    def _increase_version(self, user_id: Any) -> None:
+        """
+        Increase the version of the tasks of a user,
+        always after the write so that a reader never
+        gets the new version with the old tasks
+
+        Parameters
+        ----------
+        user_id : Any
+            ID of the user
+        """
+
+        with STAGE_DURATION.time(stage="tasks_write"):
+            self._users_collection.update_one(
+                {"_id": user_id}, {"$inc": {"tasks_version": 1}}
+            )
+
+    @staticmethod
+    def _check_modified(
+        version: int, if_none_match: Optional[str], query_key: str = ""
+    ) -> str:
+        """
+        Get the ETag of a version of the tasks
+        and check it against If-None-Match, every
+        page and filter has its own ETag so that
+        the tag of one is never valid for another
+
+        Parameters
+        ----------
+        version : int
+            Version of the tasks of the user
+        if_none_match : Optional[str]
+            If-None-Match header of the request
+        query_key : str
+            Parameters of a page or a filtered
+            list, empty for the full task list
+
+        Returns
+        -------
+        str
+            ETag of the tasks
+
+        Raises
+        ------
+        TasksNotModified
+            Error occurring when the task list
+            has not changed since the version
+            the client already has
+        """
+
+        if query_key:
+            etag = f'"{version}-{zlib.crc32(query_key.encode()):08x}"'
+        else:
+            etag = f'"{version}"'
+
+        if if_none_match:
+            etags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+            if etag in etags or "*" in etags:
+                raise TasksNotModified(
+                    status_code=304, detail="Not modified", headers={"ETag": etag}
+                )
+
+        return etag
+
+    @staticmethod
+    def _encode_cursor(sort: str, task: Dict[str, Any]) -> str:
+        """
+        Encode the position of the last task
+        of a page as an opaque cursor
+
+        Parameters
+        ----------
+        sort : str
+            Sorting of the page
+        task : Dict[str, Any]
+            Last task of the page
+
+        Returns
+        -------
+        str
+            Cursor of the next page
+        """
+
+        values = [task.get(field) for field in SORT_FIELDS[sort.lstrip("-")]]
+        cursor = json.dumps({"sort": sort, "after": values}).encode()
+
+        return base64.urlsafe_b64encode(cursor).decode()
+
+    @staticmethod
+    def _decode_cursor(sort: str, cursor: str) -> Dict[str, Any]:
+        """
+        Build the query that selects the
+        tasks that come after a cursor
+
+        Parameters
+        ----------
+        sort : str
+            Sorting of the page
+        cursor : str
+            Cursor of the page
+
+        Returns
+        -------
+        Dict[str, Any]
+            Query of the tasks after the cursor
+
+        Raises
+        ------
+        InvalidCursor
+            Error occurring when the pagination cursor
+            cannot be decoded or does not match the
+            requested sorting
+        """
+
+        fields = SORT_FIELDS[sort.lstrip("-")]
+
+        try:
+            decoded_cursor = json.loads(base64.urlsafe_b64decode(cursor))
+            values = list(decoded_cursor["after"])
+            is_valid = decoded_cursor["sort"] == sort and len(values) == len(fields)
+        except (ValueError, TypeError, KeyError):
+            is_valid = False
+
+        if not is_valid:
+            raise InvalidCursor(status_code=400, detail="Invalid cursor")
+
+        operator = "$lt" if sort.startswith("-") else "$gt"
+
+        conditions = [
+            {
+                **{field: value for field, value in zip(fields[:index], values)},
+                fields[index]: {operator: values[index]},
+            }
+            for index in range(len(fields))
+        ]
+
+        return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
     def get_user_tasks(
-        self, email: str, token: str
-    ) -> List[Union[Any, Dict[str, Any]]]:
+        self,
+        email: str,
+        token: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        priority: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        sort: str = "name",
+        if_none_match: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
-        Obtain the tasks associated with a
-        user by searching for him by email
+        Obtain a page of the tasks associated
+        with a user by searching for him by email
+
+        Filtering, sorting and pagination
+        are resolved by MongoDB, the full
+        task list is served from the cache.
+        The tasks are not loaded when the
+        client already has their version
 
         Parameters
         ----------
@@ -61,11 +369,26 @@ class Tasks:
             Email of the user
         token : str
             Bearer token
+        limit : Optional[int]
+            Maximum number of tasks of the page,
+            all the tasks are returned if not set
+        cursor : Optional[str]
+            Cursor returned with the previous page
+        priority : Optional[str]
+            Only return tasks with this priority
+        name_prefix : Optional[str]
+            Only return tasks whose name starts with it
+        sort : str
+            Field to sort by, prefixed with "-"
+            for descending order
+        if_none_match : Optional[str]
+            ETags of the versions the client has
 
         Returns
         -------
-        List[Union[Any, Dict[str, Any]]]
-           Tasks associated with the user
+        Dict[str, Any]
+           Tasks of the page, the cursor of the
+           next page if there is one and the ETag
 
         Raises
         ------
@@ -75,6 +398,14 @@ class Tasks:
         UserDoesNotExists
             Error occurring when a user
             is not found in the database
+        InvalidCursor
+            Error occurring when the pagination cursor
+            cannot be decoded or does not match the
+            requested sorting
+        TasksNotModified
+            Error occurring when the task list
+            has not changed since the version
+            the client already has
         """
 
         try:
@@ -82,12 +413,62 @@ class Tasks:
         except TokenError:
             raise NotAuthorizedError(status_code=401, detail="Not authorized")
 
-        user = Utils().get_user(user_email=email)
+        is_cacheable = (
+            not limit and not cursor and priority is None and not name_prefix
+        ) and sort == "name"
 
-        if not user:
-            raise UserDoesNotExists(status_code=404, detail="User not found in DB")
+        if is_cacheable:
+            cached = tasks_cache.get(email)
+
+            if cached is not None:
+                etag = self._check_modified(cached["version"], if_none_match)
+                return {"tasks": cached["tasks"], "next_cursor": None, "etag": etag}
+
+            generation = tasks_cache.generation(email)
+
+        user = self._get_user(email=email)
+        query_key = (
+            ""
+            if is_cacheable
+            else orjson.dumps([limit, cursor, priority, name_prefix, sort]).decode()
+        )
+        etag = self._check_modified(user["tasks_version"], if_none_match, query_key)
+
+        query: Dict[str, Any] = {"user_id": user["_id"]}
+
+        if priority is not None:
+            query["priority"] = priority
+
+        if name_prefix:
+            query["name"] = {"$regex": f"^{re.escape(name_prefix)}"}
+
+        if cursor:
+            query = {"$and": [query, self._decode_cursor(sort=sort, cursor=cursor)]}
+
+        direction = DESCENDING if sort.startswith("-") else ASCENDING
 
-        return user["tasks"]
+        tasks_cursor = self._tasks_collection.find(
+            query, {"_id": 0, "user_id": 0}
+        ).sort([(field, direction) for field in SORT_FIELDS[sort.lstrip("-")]])
+
+        if limit:
+            tasks_cursor = tasks_cursor.limit(limit + 1)
+
+        tasks = list(tasks_cursor)
+        next_cursor = None
+
+        if limit and len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = self._encode_cursor(sort=sort, task=tasks[-1])
+
+        if is_cacheable:
+            tasks_cache.set(
+                email,
+                {"version": user["tasks_version"], "tasks": tasks},
+                generation=generation,
+            )
+
+        return {"tasks": tasks, "next_cursor": next_cursor, "etag": etag}
 
     def add_task(self, email: str, new_task: Task, token: str) -> str:
         """
@@ -112,6 +493,9 @@ class Tasks:
         NotAuthorizedError
             Error occurring when a request or an action
             could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
         TaskAlreadyExists
             Error occurring when the new task that
             is trying to be inserted already exists
@@ -122,22 +506,24 @@ class Tasks:
         except TokenError:
             raise NotAuthorizedError(status_code=401, detail="Not authorized")
 
-        user = Utils().get_user(user_email=email)
-
-        user_id = user["_id"]
-        tasks = user["tasks"]
+        user = self._get_user(email=email)
+        self._check_name_available(user_id=user["_id"], name=new_task.name)
 
-        new_task_dict = new_task.model_dump()
-
-        for task in tasks:
-            if task["name"] == new_task_dict["name"]:
-                raise TaskAlreadyExists(status_code=409, detail="Task already exists")
-
-        tasks.append(new_task_dict)
+        try:
+            with STAGE_DURATION.time(stage="tasks_write"):
+                self._tasks_collection.insert_one(
+                    {"user_id": user["_id"], **new_task.model_dump()}
+                )
+        except DuplicateKeyError:
+            raise TaskAlreadyExists(status_code=409, detail="Task already exists")
 
-        self._users_collection.update_one({"email": email}, {"$set": {"tasks": tasks}})
+        self._increase_version(user_id=user["_id"])
+        tasks_cache.delete(email)
+        task_events.publish(
+            email, {"type": "task_added", "task": new_task.model_dump()}
+        )
 
-        return f"Tasks updated for the user with ID {user_id}"
+        return f"Tasks updated for the user with ID {user['_id']}"
 
     def delete_task(self, email: str, task_name: str, token: str) -> str:
         """
@@ -156,6 +542,18 @@ class Tasks:
         -------
         str
             ID of the updated user
+
+        Raises
+        ------
+        NotAuthorizedError
+            Error occurring when a request or an action
+            could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        TaskDoesNotExist
+            Error occurring when the task you
+            are trying to delete does not exist
         """
 
         try:
@@ -163,22 +561,595 @@ class Tasks:
         except TokenError:
             raise NotAuthorizedError(status_code=401, detail="Not authorized")
 
-        user = Utils().get_user(user_email=email)
+        user = self._get_user(email=email)
 
-        user_id = user["_id"]
-        tasks = user["tasks"]
+        with STAGE_DURATION.time(stage="tasks_write"):
+            deleted_count = self._tasks_collection.delete_one(
+                {"user_id": user["_id"], "name": task_name}
+            ).deleted_count
 
-        updated_tasks = []
+        if not deleted_count:
+            raise TaskDoesNotExist(status_code=404, detail="Task does not exist")
 
-        for task in tasks:
-            if not task["name"] == task_name:
-                updated_tasks.append(task)
+        self._increase_version(user_id=user["_id"])
+        tasks_cache.delete(email)
+        task_events.publish(email, {"type": "task_deleted", "name": task_name})
 
-        if tasks == updated_tasks:
+        return f"Tasks updated for the user with ID {user['_id']}"
+
+    def update_task(
+        self, email: str, task_name: str, task_update: TaskUpdate, token: str
+    ) -> Dict[str, Any]:
+        """
+        Update some fields of a task, or rename it,
+        with a single write that only sets the fields
+        present in the update and returns the task
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        task_name : str
+            Task to be updated
+        task_update : TaskUpdate
+            Fields to be updated
+        token : str
+            Bearer token
+
+        Returns
+        -------
+        Dict[str, Any]
+            ID of the updated user and the updated task
+
+        Raises
+        ------
+        NotAuthorizedError
+            Error occurring when a request or an action
+            could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        TaskDoesNotExist
+            Error occurring when the task you are
+            trying to delete or update does not exist
+        TaskAlreadyExists
+            Error occurring when the new name
+            of the task is already used
+        """
+
+        try:
+            self._auth.decode_token(token=token)
+        except TokenError:
+            raise NotAuthorizedError(status_code=401, detail="Not authorized")
+
+        user = self._get_user(email=email)
+
+        if task_update.name is not None and task_update.name != task_name:
+            self._check_name_available(user_id=user["_id"], name=task_update.name)
+
+        try:
+            with STAGE_DURATION.time(stage="tasks_write"):
+                task = self._tasks_collection.find_one_and_update(
+                    {"user_id": user["_id"], "name": task_name},
+                    {"$set": task_update.model_dump(exclude_none=True)},
+                    projection={"_id": 0, "user_id": 0},
+                    return_document=ReturnDocument.AFTER,
+                )
+        except DuplicateKeyError:
+            raise TaskAlreadyExists(status_code=409, detail="Task already exists")
+
+        if task is None:
             raise TaskDoesNotExist(status_code=404, detail="Task does not exist")
 
-        self._users_collection.update_one(
-            {"email": email}, {"$set": {"tasks": updated_tasks}}
+        self._increase_version(user_id=user["_id"])
+        tasks_cache.delete(email)
+        task_events.publish(
+            email, {"type": "task_updated", "name": task_name, "task": task}
         )
 
-        return f"Tasks updated for the user with ID {user_id}"
+        return {
+            "detail": f"Tasks updated for the user with ID {user['_id']}",
+            "task": task,
+        }
+
+    @staticmethod
+    def _operation_event(operation: TaskOperation) -> Dict[str, Any]:
+        """
+        Get the task event published
+        when an operation is applied
+
+        Parameters
+        ----------
+        operation : TaskOperation
+            Applied operation
+
+        Returns
+        -------
+        Dict[str, Any]
+            Task event
+        """
+
+        if operation.op == "add":
+            return {"type": "task_added", "task": operation.task.model_dump()}
+
+        if operation.op == "delete":
+            return {"type": "task_deleted", "name": operation.name}
+
+        return {
+            "type": "task_updated",
+            "name": operation.name,
+            "task": operation.task.model_dump(),
+        }
+
+    def bulk_tasks(
+        self, email: str, operations: List[TaskOperation], token: str
+    ) -> Dict[str, Any]:
+        """
+        Apply a batch of add, delete and update
+        operations to a user's task list with a
+        single bulk write
+
+        The operations that would fail are
+        found with one query before writing
+        and reported without being sent
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        operations : List[TaskOperation]
+            Operations touching different tasks
+        token : str
+            Bearer token
+
+        Returns
+        -------
+        Dict[str, Any]
+            ID of the updated user and
+            the result of every operation
+
+        Raises
+        ------
+        NotAuthorizedError
+            Error occurring when a request or an action
+            could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        """
+
+        try:
+            self._auth.decode_token(token=token)
+        except TokenError:
+            raise NotAuthorizedError(status_code=401, detail="Not authorized")
+
+        user = self._get_user(email=email)
+
+        names = set()
+        for operation in operations:
+            if operation.op != "add":
+                names.add(operation.name)
+            if operation.op != "delete":
+                names.add(operation.task.name)
+
+        existing_names = {
+            task["name"]
+            for task in self._tasks_collection.find(
+                {"user_id": user["_id"], "name": {"$in": list(names)}},
+                {"_id": 0, "name": 1},
+            )
+        }
+
+        results: List[Dict[str, Any]] = []
+        requests: List[Any] = []
+        request_results: List[Dict[str, Any]] = []
+        request_events: List[Dict[str, Any]] = []
+
+        for operation in operations:
+            if operation.op == "add":
+                result = {"op": "add", "name": operation.task.name}
+                if operation.task.name in existing_names:
+                    result.update(status_code=409, detail="Task already exists")
+                else:
+                    result.update(status_code=200, detail="Task added")
+                    new_task = {"user_id": user["_id"], **operation.task.model_dump()}
+                    requests.append(InsertOne(new_task))
+            else:
+                result = {"op": operation.op, "name": operation.name}
+                if operation.name not in existing_names:
+                    result.update(status_code=404, detail="Task does not exist")
+                elif operation.op == "delete":
+                    result.update(status_code=200, detail="Task deleted")
+                    requests.append(
+                        DeleteOne({"user_id": user["_id"], "name": operation.name})
+                    )
+                elif (
+                    operation.task.name != operation.name
+                    and operation.task.name in existing_names
+                ):
+                    result.update(status_code=409, detail="Task already exists")
+                else:
+                    result.update(status_code=200, detail="Task updated")
+                    requests.append(
+                        UpdateOne(
+                            {"user_id": user["_id"], "name": operation.name},
+                            {"$set": operation.task.model_dump()},
+                        )
+                    )
+
+            results.append(result)
+            if result["status_code"] == 200:
+                request_results.append(result)
+                request_events.append(self._operation_event(operation))
+
+        if requests:
+            try:
+                with STAGE_DURATION.time(stage="tasks_write"):
+                    self._tasks_collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as error:
+                for write_error in error.details["writeErrors"]:
+                    request_results[write_error["index"]].update(
+                        {"status_code": 409, "detail": "Task already exists"}
+                        if write_error["code"] == 11000
+                        else {"status_code": 500, "detail": "Task could not be written"}
+                    )
+
+            if any(result["status_code"] == 200 for result in request_results):
+                self._increase_version(user_id=user["_id"])
+                tasks_cache.delete(email)
+
+            for result, event in zip(request_results, request_events):
+                if result["status_code"] == 200:
+                    task_events.publish(email, event)
+
+        return {
+            "detail": f"Tasks updated for the user with ID {user['_id']}",
+            "results": results,
+        }
+
+    def export_tasks(
+        self, email: str, token: str, compress: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Stream all the tasks of a user as NDJSON,
+        one chunk per batch of the MongoDB cursor,
+        so that memory does not grow with the
+        number of tasks
+
+        The token and the user are checked before
+        returning so that errors are raised before
+        the response starts
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        token : str
+            Bearer token
+        compress : bool
+            Whether to gzip the chunks
+
+        Returns
+        -------
+        Iterator[bytes]
+            Chunks of the export
+
+        Raises
+        ------
+        NotAuthorizedError
+            Error occurring when a request or an action
+            could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        """
+
+        try:
+            self._auth.decode_token(token=token)
+        except TokenError:
+            raise NotAuthorizedError(status_code=401, detail="Not authorized")
+
+        user = self._get_user(email=email)
+
+        tasks_cursor = (
+            self._tasks_collection.find(
+                {"user_id": user["_id"]}, {"_id": 0, "user_id": 0}
+            )
+            .sort([("name", ASCENDING)])
+            .batch_size(TASKS_EXPORT_BATCH_SIZE)
+        )
+
+        return self._export_chunks(tasks_cursor=tasks_cursor, compress=compress)
+
+    @staticmethod
+    def _export_chunks(tasks_cursor: Any, compress: bool) -> Iterator[bytes]:
+        """
+        Encode the tasks of a cursor as NDJSON chunks
+
+        Parameters
+        ----------
+        tasks_cursor : pymongo.cursor.Cursor
+            Cursor of the tasks
+        compress : bool
+            Whether to gzip the chunks
+
+        Yields
+        ------
+        bytes
+            NDJSON lines of a batch of tasks, flushed
+            so that every chunk can be decoded on arrival
+        """
+
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        lines: List[bytes] = []
+
+        def encode(data: bytes) -> bytes:
+            if compressor is None:
+                return data
+            return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        try:
+            for task in tasks_cursor:
+                lines.append(
+                    orjson.dumps(task, default=str, option=orjson.OPT_APPEND_NEWLINE)
+                )
+
+                if len(lines) >= TASKS_EXPORT_BATCH_SIZE:
+                    yield encode(b"".join(lines))
+                    lines = []
+
+            if lines:
+                yield encode(b"".join(lines))
+
+            if compressor is not None:
+                yield compressor.flush()
+        finally:
+            tasks_cursor.close()
+
+    @staticmethod
+    def _read_import_rows(
+        tasks_file: BinaryIO, file_format: str
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Read the rows of an imported file one at a time
+
+        Parameters
+        ----------
+        tasks_file : BinaryIO
+            NDJSON or CSV file
+        file_format : str
+            "ndjson" or "csv"
+
+        Yields
+        ------
+        Tuple[int, Any]
+            Line number and row, None if the
+            line is not valid JSON
+
+        Raises
+        ------
+        InvalidImportFile
+            Error occurring when an imported file
+            cannot be read as NDJSON or CSV tasks
+        """
+
+        text_file = io.TextIOWrapper(
+            tasks_file, encoding="utf-8-sig", errors="replace", newline=""
+        )
+
+        if file_format == "csv":
+            reader = csv.DictReader(text_file)
+
+            if not set(Task.model_fields) <= set(reader.fieldnames or []):
+                raise InvalidImportFile(
+                    status_code=400,
+                    detail="The CSV header must contain: "
+                    + ", ".join(Task.model_fields),
+                )
+
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(text_file, start=1):
+                if not line.strip():
+                    continue
+
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, None
+
+    def _insert_import_batch(
+        self, user_id: Any, batch: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """
+        Insert a batch of imported tasks,
+        skipping the ones that already exist
+
+        Parameters
+        ----------
+        user_id : Any
+            ID of the user
+        batch : List[Dict[str, Any]]
+            Tasks with different names
+
+        Returns
+        -------
+        Tuple[int, int]
+            Number of inserted and skipped tasks
+        """
+
+        existing_names = {
+            task["name"]
+            for task in self._tasks_collection.find(
+                {"user_id": user_id, "name": {"$in": [task["name"] for task in batch]}},
+                {"_id": 0, "name": 1},
+            )
+        }
+        new_tasks = [
+            {"user_id": user_id, **task}
+            for task in batch
+            if task["name"] not in existing_names
+        ]
+        skipped = len(batch) - len(new_tasks)
+
+        if not new_tasks:
+            return 0, skipped
+
+        try:
+            with STAGE_DURATION.time(stage="tasks_write"):
+                self._tasks_collection.insert_many(new_tasks, ordered=False)
+        except BulkWriteError as error:
+            duplicates = sum(
+                write_error["code"] == 11000
+                for write_error in error.details["writeErrors"]
+            )
+
+            if duplicates != len(error.details["writeErrors"]):
+                raise
+
+            return len(new_tasks) - duplicates, skipped + duplicates
+
+        return len(new_tasks), skipped
+
+    def import_tasks(
+        self, email: str, tasks_file: BinaryIO, file_format: str, token: str
+    ) -> Dict[str, Any]:
+        """
+        Add the tasks of an NDJSON or CSV file,
+        reading it row by row and inserting the
+        valid tasks in bounded batches
+
+        Tasks whose name already exists, in the
+        user's list or earlier in the file, are skipped
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        tasks_file : BinaryIO
+            NDJSON or CSV file
+        file_format : str
+            "ndjson" or "csv"
+        token : str
+            Bearer token
+
+        Returns
+        -------
+        Dict[str, Any]
+            Number of inserted, skipped and invalid
+            rows and the errors of the first invalid rows
+
+        Raises
+        ------
+        NotAuthorizedError
+            Error occurring when a request or an action
+            could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        InvalidImportFile
+            Error occurring when an imported file
+            cannot be read as NDJSON or CSV tasks
+        """
+
+        try:
+            self._auth.decode_token(token=token)
+        except TokenError:
+            raise NotAuthorizedError(status_code=401, detail="Not authorized")
+
+        user = self._get_user(email=email)
+
+        summary: Dict[str, Any] = {"inserted": 0, "skipped": 0, "invalid": 0}
+        errors: List[Dict[str, Any]] = []
+        seen_names: Set[str] = set()
+        batch: List[Dict[str, Any]] = []
+
+        def insert_batch() -> None:
+            inserted, skipped = self._insert_import_batch(user["_id"], batch)
+            summary["inserted"] += inserted
+            summary["skipped"] += skipped
+            batch.clear()
+
+        try:
+            for line_number, row in self._read_import_rows(tasks_file, file_format):
+                try:
+                    task = Task.model_validate(row).model_dump()
+                except ValidationError as error:
+                    summary["invalid"] += 1
+                    if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                        first_error = error.errors()[0]
+                        field = ".".join(str(loc) for loc in first_error["loc"])
+                        message = (
+                            "Invalid JSON"
+                            if row is None
+                            else f"{field or 'task'}: {first_error['msg']}"
+                        )
+                        errors.append({"line": line_number, "detail": message})
+                    continue
+
+                if task["name"] in seen_names:
+                    summary["skipped"] += 1
+                    continue
+
+                seen_names.add(task["name"])
+                batch.append(task)
+
+                if len(batch) >= TASKS_IMPORT_BATCH_SIZE:
+                    insert_batch()
+
+            if batch:
+                insert_batch()
+        finally:
+            if summary["inserted"]:
+                self._increase_version(user_id=user["_id"])
+                tasks_cache.delete(email)
+                # Clients reload the list instead of receiving every task
+                task_events.publish(
+                    email, {"type": "tasks_imported", "inserted": summary["inserted"]}
+                )
+
+        return {
+            "detail": f"Tasks imported for the user with ID {user['_id']}",
+            **summary,
+            "errors": errors,
+        }
+
+    def check_user(self, email: str, token: str) -> Optional[float]:
+        """
+        Check the token and that a user exists before
+        subscribing to the events of his tasks
+
+        Parameters
+        ----------
+        email : str
+            Email of the user
+        token : str
+            Bearer token
+
+        Returns
+        -------
+        Optional[float]
+            Expiration time of the token,
+            None if it does not expire
+
+        Raises
+        ------
+        NotAuthorizedError
+            Error occurring when a request or an action
+            could not be validated prior to being executed
+        UserDoesNotExists
+            Error occurring when a user
+            is not found in the database
+        """
+
+        try:
+            claims = self._auth.decode_token(token=token)
+        except TokenError:
+            raise NotAuthorizedError(status_code=401, detail="Not authorized")
+
+        self._get_user(email=email)
+
+        expiration = claims.get("exp")
+
+        return float(expiration) if isinstance(expiration, (int, float)) else None
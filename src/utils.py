@@ -1,6 +1,134 @@
-from typing import Any, Dict, Optional
+import os
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+import anyio
+from anyio.lowlevel import RunVar
 
 from src.database.Database import Database
+from src.metrics import Gauge, registry, timed
+
+T = TypeVar("T")
+
+DB_THREADPOOL_SIZE = int(
+    os.getenv("DB_THREADPOOL_SIZE", os.getenv("MONGODB_MAX_POOL_SIZE", 100))
+)
+
+_db_limiter: RunVar[anyio.CapacityLimiter] = RunVar("_db_limiter")
+
+
+def get_db_limiter() -> anyio.CapacityLimiter:
+    """
+    Get the capacity limiter that bounds the
+    number of threads doing database work in
+    the running event loop
+
+    Returns
+    -------
+    anyio.CapacityLimiter
+        Capacity limiter of the database threads
+    """
+
+    try:
+        return _db_limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(DB_THREADPOOL_SIZE)
+        _db_limiter.set(limiter)
+        return limiter
+
+
+def get_db_threads_in_use() -> float:
+    """
+    Get the number of threads doing database
+    work in the running event loop
+
+    Returns
+    -------
+    float
+        Threads in use, 0 outside of an event loop
+    """
+
+    try:
+        return get_db_limiter().borrowed_tokens
+    except RuntimeError:
+        return 0
+
+
+registry.register(
+    Gauge(
+        "db_threadpool_in_use",
+        "Threads doing database work",
+        function=get_db_threads_in_use,
+    )
+)
+registry.register(
+    Gauge(
+        "db_threadpool_size",
+        "Maximum number of threads doing database work",
+        function=lambda: DB_THREADPOOL_SIZE,
+    )
+)
+
+
+async def run_in_db_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking function that talks to the database
+    in a worker thread without blocking the event loop
+
+    Parameters
+    ----------
+    func : Callable[..., T]
+        Blocking function to be executed
+    *args : Any
+        Positional arguments of the function
+    **kwargs : Any
+        Keyword arguments of the function
+
+    Returns
+    -------
+    T
+        Value returned by the function
+    """
+
+    return await anyio.to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=get_db_limiter()
+    )
+
+
+async def iterate_in_db_pool(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Consume a blocking iterator that reads from
+    the database in worker threads, one item
+    at a time, without blocking the event loop
+
+    Parameters
+    ----------
+    iterator : Iterator[T]
+        Blocking iterator to be consumed
+
+    Yields
+    ------
+    T
+        Items of the iterator
+    """
+
+    sentinel = object()
+
+    try:
+        while True:
+            item = await run_in_db_pool(next, iterator, sentinel)
+
+            if item is sentinel:
+                break
+
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+
+        # Shielded so that the cursor is closed when the client disconnects
+        if close is not None:
+            with anyio.CancelScope(shield=True):
+                await run_in_db_pool(close)
 
 
 class Utils:
@@ -29,7 +157,10 @@ class Utils:
         self._db_client = Database().instantiate_client()
         self._users_collection = self._db_client["users_db"]["users_collection"]
 
-    def get_user(self, user_email: str) -> Optional[Dict[str, Any]]:
+    @timed("get_user")
+    def get_user(
+        self, user_email: str, projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get an user from the users collection
 
@@ -37,6 +168,9 @@ class Utils:
         ----------
         user_email : str
             Email of the user
+        projection : Optional[Dict[str, Any]]
+            Fields of the user to be returned,
+            all of them if not specified
 
         Returns
         -------
@@ -44,4 +178,4 @@ class Utils:
             Data of the user if exists
         """
 
-        return self._users_collection.find_one({"email": user_email})
+        return self._users_collection.find_one({"email": user_email}, projection)
@@ -0,0 +1,26 @@
+import pytest
+
+from src.database.indexes import missing_unique_indexes
+from src.rate_limit import rate_limit_backend
+from src.tasks.service import tasks_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_limits():
+    rate_limit_backend.clear()
+    yield
+    rate_limit_backend.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_tasks_cache():
+    tasks_cache.clear()
+    yield
+    tasks_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_missing_unique_indexes():
+    missing_unique_indexes.clear()
+    yield
+    missing_unique_indexes.clear()
@@ -0,0 +1,72 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.auth.auth import Auth, TokenCache, token_cache
+from src.auth.exceptions import TokenError
+
+MOCKED_SECRET_KEY = "mocked_secret_key"
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@patch.dict(os.environ, {"SECRET_KEY": MOCKED_SECRET_KEY})
+def test_decode_token_valid():
+    auth = Auth()
+    claims = auth.decode_token(auth.create_access_token())
+    assert claims["exp"] > time.time()
+
+
+@patch.dict(os.environ, {"SECRET_KEY": MOCKED_SECRET_KEY})
+def test_decode_token_invalid():
+    with pytest.raises(TokenError):
+        Auth().decode_token("mocked_token")
+
+
+@patch.dict(os.environ, {"SECRET_KEY": MOCKED_SECRET_KEY})
+def test_decode_token_cached():
+    auth = Auth()
+    token = auth.create_access_token()
+    auth.decode_token(token)
+    with patch("src.auth.auth.jwt.decode") as mocked_decode:
+        auth.decode_token(token)
+        assert not mocked_decode.called
+    assert token_cache.stats()["hits"] >= 1
+
+
+def test_token_cache_expired_token_is_not_returned():
+    cache = TokenCache(max_size=10)
+    cache.set("mocked_token", {"exp": time.time() - 1})
+    assert cache.get("mocked_token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_without_expiration_is_not_cached():
+    cache = TokenCache(max_size=10)
+    cache.set("mocked_token", {"sub": "mocked_email"})
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2)
+    expiration = time.time() + 60
+    cache.set("first_token", {"exp": expiration})
+    cache.set("second_token", {"exp": expiration})
+    cache.get("first_token")
+    cache.set("third_token", {"exp": expiration})
+    assert cache.get("second_token") is None
+    assert cache.get("first_token") == {"exp": expiration}
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "size": 2,
+        "max_size": 2,
+    }
@@ -0,0 +1,77 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.auth.exceptions import PasswordHashingUnavailable
+from src.auth.hashing import PasswordHasher
+from src.main import app
+
+test_client = TestClient(app)
+
+
+def test_password_hasher_hash_and_verify():
+    password_hasher = PasswordHasher(workers=1, queue_size=0)
+    with patch("src.auth.hashing.pwd_context.hash") as mocked_hash:
+        mocked_hash.return_value = "mocked_hash"
+        assert password_hasher.hash("mocked_password") == "mocked_hash"
+    with patch("src.auth.hashing.pwd_context.verify") as mocked_verify:
+        mocked_verify.return_value = True
+        assert password_hasher.verify("mocked_password", "mocked_hash")
+        mocked_verify.assert_called_once_with("mocked_password", "mocked_hash")
+    assert password_hasher.stats()["operations"] == 2
+    password_hasher.shutdown()
+
+
+def test_password_hasher_runs_on_pool_thread():
+    password_hasher = PasswordHasher(workers=1, queue_size=0)
+    with patch("src.auth.hashing.pwd_context.hash") as mocked_hash:
+        mocked_hash.side_effect = lambda password: threading.current_thread().name
+        assert password_hasher.hash("mocked_password").startswith("password-hashing")
+    password_hasher.shutdown()
+
+
+def test_password_hasher_rejects_when_saturated():
+    password_hasher = PasswordHasher(workers=1, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_hash(password: str) -> str:
+        started.set()
+        release.wait()
+        return "mocked_hash"
+
+    with patch("src.auth.hashing.pwd_context.hash", side_effect=blocking_hash):
+        worker = threading.Thread(target=password_hasher.hash, args=("password",))
+        worker.start()
+        started.wait()
+        assert password_hasher.stats()["in_progress"] == 1
+        with pytest.raises(PasswordHashingUnavailable):
+            password_hasher.hash("another_password")
+        release.set()
+        worker.join()
+
+    stats = password_hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
+    password_hasher.shutdown()
+
+
+def test_login_user_route_503_hashing_saturated():
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Utils.get_user") as mocked_get_user,
+        patch("src.auth.service.password_hasher.verify") as mocked_verify,
+    ):
+        mocked_get_user.return_value = {"password": "mocked_password"}
+        mocked_verify.side_effect = PasswordHashingUnavailable(
+            status_code=503,
+            detail="Service busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+        response = test_client.post(
+            "/auth/token",
+            data={"username": "mocked_email", "password": "mocked_password"},
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
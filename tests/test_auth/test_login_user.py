@@ -43,6 +43,26 @@ def test_login_user_wrong_password(mocked_user: LoginUser):
             user.login_user(mocked_user)
 
 
+def test_login_user_projection(mocked_user: LoginUser):
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Utils.get_user") as mocked_get_user,
+        patch("src.auth.service.pwd_context.verify") as mocked_verify,
+        patch("src.auth.auth.Auth.create_access_token"),
+    ):
+        mocked_get_user.return_value = {
+            "name": "mocked_name",
+            "email": "mocked_email",
+            "password": "mocked_password",
+        }
+        mocked_verify.return_value = True
+        User().login_user(mocked_user)
+        mocked_get_user.assert_called_once_with(
+            user_email=mocked_user.email,
+            projection={"_id": 0, "name": 1, "email": 1, "password": 1},
+        )
+
+
 def test_login_user_route_401_user_does_not_exists(mocked_user: LoginUser):
     with (
         patch("src.auth.service.Database.instantiate_client"),
@@ -1,12 +1,15 @@
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError
 
 from src.auth.exceptions import UserAlreadyExists
 from src.auth.schemas import RegisterUser
 from src.auth.service import User
+from src.database.indexes import USERS_EMAIL_INDEX
 from src.main import app
+from src.tasks.schemas import Task
 
 test_client = TestClient(app)
 
@@ -29,30 +32,24 @@ def test_register_user_already_exists(mocked_user: RegisterUser):
     with patch("src.auth.service.Database.instantiate_client"):
         with pytest.raises(UserAlreadyExists):
             user = User()
-            mock_get_user = Mock()
-            mock_get_user.return_value = {"found": True}
-            user._get_user = mock_get_user
+            user._users_collection.insert_one.side_effect = DuplicateKeyError("dup")
             user.register_user(mocked_user)
 
 
 def test_register_user_succesfull(mocked_user: RegisterUser):
-    with (
-        patch("src.auth.service.Database.instantiate_client"),
-        patch("src.auth.service.Utils.get_user") as mocked_get_user,
-    ):
+    with patch("src.auth.service.Database.instantiate_client"):
         user = User()
-        mocked_get_user.return_value = None
         mocked_id = "mocked_id"
         user._users_collection.insert_one.return_value.inserted_id = mocked_id
         assert user.register_user(mocked_user) == mocked_id
+        assert not user._users_collection.find_one.called
 
 
 def test_register_user_route_409(mocked_user: RegisterUser):
-    with (
-        patch("src.auth.service.Database.instantiate_client"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
-    ):
-        mock_get_user.return_value = {"found": True}
+    with patch("src.auth.service.Database.instantiate_client") as mock_db_client:
+        mock_db_client.return_value["users_db"][
+            "users_collection"
+        ].insert_one.side_effect = DuplicateKeyError("dup")
         response = test_client.post(
             "/auth/register",
             json={
@@ -66,15 +63,11 @@ def test_register_user_route_409(mocked_user: RegisterUser):
 
 
 def test_register_user_route_201(mocked_user: RegisterUser):
-    with (
-        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
-    ):
+    with patch("src.auth.service.Database.instantiate_client") as mock_db_client:
         mocked_id = "mocked_id"
         mock_db_client.return_value["users_db"][
             "users_collection"
         ].insert_one.return_value.inserted_id = mocked_id
-        mock_get_user.return_value = None
         response = test_client.post(
             "/auth/register",
             json={
@@ -85,3 +78,55 @@ def test_register_user_route_201(mocked_user: RegisterUser):
         )
         assert response.status_code == 201
         assert response.json() == {"detail": f"User registered with ID {mocked_id}"}
+
+
+def test_register_user_tasks_inserted(mocked_user: RegisterUser):
+    with patch("src.auth.service.Database.instantiate_client"):
+        user = User()
+        mocked_id = "mocked_id"
+        user._users_collection.insert_one.return_value.inserted_id = mocked_id
+        mocked_user.tasks = [
+            Task(name="Mocked task", description="Mocked", priority="Low")
+        ]
+        user.register_user(mocked_user)
+        assert "tasks" not in user._users_collection.insert_one.call_args.args[0]
+        user._tasks_collection.insert_many.assert_called_once_with(
+            [
+                {
+                    "user_id": mocked_id,
+                    "name": "Mocked task",
+                    "description": "Mocked",
+                    "priority": "Low",
+                }
+            ]
+        )
+
+
+def test_register_user_route_duplicate_task_names(mocked_user: RegisterUser):
+    with patch("src.auth.service.Database.instantiate_client") as mock_db_client:
+        task = {"name": "Mocked task", "description": "Mocked", "priority": "Low"}
+        response = test_client.post(
+            "/auth/register",
+            json={
+                "name": mocked_user.name,
+                "email": mocked_user.email,
+                "password": mocked_user.password.get_secret_value(),
+                "tasks": [task, task],
+            },
+        )
+        assert response.status_code == 422
+        assert not mock_db_client.return_value["users_db"][
+            "users_collection"
+        ].insert_one.called
+
+
+def test_register_user_checks_email_without_unique_index(mocked_user: RegisterUser):
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.missing_unique_indexes", {USERS_EMAIL_INDEX}),
+    ):
+        user = User()
+        user._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        with pytest.raises(UserAlreadyExists):
+            user.register_user(mocked_user)
+        assert not user._users_collection.insert_one.called
@@ -0,0 +1,95 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from src.cache import REDIS_SET_IF_GENERATION, InMemoryCacheBackend, RedisCacheBackend
+
+MOCKED_TASKS = [{"name": "Mocked task", "description": "Mocked", "priority": "Low"}]
+
+
+def test_in_memory_cache_hit_and_miss():
+    cache = InMemoryCacheBackend(ttl=60, max_entries=10)
+    assert cache.get("mocked_email") is None
+    cache.set("mocked_email", MOCKED_TASKS)
+    assert cache.get("mocked_email") == MOCKED_TASKS
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes"] > 0
+
+
+def test_in_memory_cache_expired_value_is_not_returned():
+    cache = InMemoryCacheBackend(ttl=0, max_entries=10)
+    cache.set("mocked_email", MOCKED_TASKS)
+    time.sleep(0.001)
+    assert cache.get("mocked_email") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCacheBackend(ttl=60, max_entries=2)
+    cache.set("first_email", MOCKED_TASKS)
+    cache.set("second_email", MOCKED_TASKS)
+    cache.get("first_email")
+    cache.set("third_email", MOCKED_TASKS)
+    assert cache.get("second_email") is None
+    assert cache.get("first_email") == MOCKED_TASKS
+    assert cache.stats()["evictions"] == 1
+
+
+def test_in_memory_cache_stale_generation_is_not_stored():
+    cache = InMemoryCacheBackend(ttl=60, max_entries=10)
+    generation = cache.generation("mocked_email")
+    cache.delete("mocked_email")
+    cache.set("mocked_email", MOCKED_TASKS, generation=generation)
+    assert cache.get("mocked_email") is None
+
+
+def test_in_memory_cache_generations_are_bounded():
+    with patch("src.cache.CACHE_MAX_GENERATIONS", 2):
+        cache = InMemoryCacheBackend(ttl=60, max_entries=10)
+        generation = cache.generation("first_email")
+        for email in ("first_email", "second_email", "third_email"):
+            cache.delete(email)
+        assert len(cache._generations) == 2
+        cache.set("first_email", MOCKED_TASKS, generation=generation)
+        assert cache.get("first_email") is None
+        cache.set("first_email", MOCKED_TASKS, generation=cache.generation(""))
+        assert cache.get("first_email") == MOCKED_TASKS
+
+
+def test_redis_cache_uses_client():
+    client = MagicMock()
+    cache = RedisCacheBackend(ttl=30, url="redis://mocked", client=client)
+    client.get.return_value = None
+    assert cache.get("mocked_email") is None
+    cache.set("mocked_email", MOCKED_TASKS)
+    client.set.assert_called_once_with(
+        "tasks:mocked_email",
+        '[{"name": "Mocked task", "description": "Mocked", "priority": "Low"}]',
+        ex=30,
+    )
+    client.get.return_value = client.set.call_args.args[1]
+    assert cache.get("mocked_email") == MOCKED_TASKS
+    cache.delete("mocked_email")
+    pipeline = client.pipeline.return_value
+    pipeline.incr.assert_called_once_with("generations:tasks:mocked_email")
+    pipeline.delete.assert_called_once_with("tasks:mocked_email")
+    pipeline.execute.assert_called_once()
+
+
+def test_redis_cache_checks_generation_in_redis():
+    client = MagicMock()
+    cache = RedisCacheBackend(ttl=30, url="redis://mocked", client=client)
+    client.get.return_value = b"3"
+    generation = cache.generation("mocked_email")
+    assert generation == 3
+    cache.set("mocked_email", MOCKED_TASKS, generation=generation)
+    client.eval.assert_called_once_with(
+        REDIS_SET_IF_GENERATION,
+        2,
+        "tasks:mocked_email",
+        "generations:tasks:mocked_email",
+        '[{"name": "Mocked task", "description": "Mocked", "priority": "Low"}]',
+        3,
+        30,
+    )
+    assert not client.set.called
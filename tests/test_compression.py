@@ -0,0 +1,93 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.compression import (
+    COMPRESSION_SAVED_BYTES,
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+
+LARGE_BODY = '{"name": "Task", "description": "Task", "priority": "Low"}\n' * 100
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500, encodings=["gzip"])
+
+
+@app.get("/large")
+def large():
+    return PlainTextResponse(LARGE_BODY, headers={"ETag": '"1"'})
+
+
+@app.get("/small")
+def small():
+    return PlainTextResponse("small")
+
+
+@app.get("/encoded")
+def encoded():
+    return PlainTextResponse(
+        gzip.compress(LARGE_BODY.encode()), headers={"Content-Encoding": "gzip"}
+    )
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse(iter([LARGE_BODY, LARGE_BODY]))
+
+
+test_client = TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str, expected: str):
+    assert negotiate_encoding(accept_encoding, ["br", "gzip"]) == expected
+
+
+def test_compression_large_response():
+    saved_bytes = COMPRESSION_SAVED_BYTES.get(encoding="gzip")
+    response = test_client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"1"'
+    assert int(response.headers["content-length"]) < len(LARGE_BODY)
+    assert response.text == LARGE_BODY
+    assert COMPRESSION_SAVED_BYTES.get(encoding="gzip") > saved_bytes
+
+
+def test_compression_not_accepted():
+    response = test_client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"1"'
+
+
+def test_compression_small_response_is_skipped():
+    response = test_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "small"
+
+
+def test_compression_encoded_response_is_skipped():
+    response = test_client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == LARGE_BODY
+
+
+def test_compression_streaming_response():
+    response = test_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == LARGE_BODY * 2
@@ -1,5 +1,5 @@
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 
@@ -9,6 +9,13 @@ from src.database.exceptions import ClientError, CredentialsNotFound, DatabaseEr
 MOCKED_ENV_VALUES = {"filled_value": "mocked_uri", "empty_value": str()}
 
 
+@pytest.fixture(autouse=True)
+def reset_client():
+    Database.close_client()
+    yield
+    Database.close_client()
+
+
 @patch.dict(os.environ, {"MONGODB_URI": MOCKED_ENV_VALUES["filled_value"]})
 def test_database_uri_value():
     assert Database()._MONGODB_URI == "mocked_uri"
@@ -41,3 +48,88 @@ def test_database_successful_connection():
     with patch("src.database.Database.MongoClient"):
         client = Database().instantiate_client()
     assert client._extract_mock_name() == "MongoClient()"
+
+
+@patch.dict(os.environ, {"MONGODB_URI": MOCKED_ENV_VALUES["filled_value"]})
+def test_database_client_is_shared():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        first_client = Database().instantiate_client()
+        second_client = Database().instantiate_client()
+    assert first_client is second_client
+    assert mocked_mongo_client.call_count == 1
+    assert mocked_mongo_client.return_value.admin.command.call_count == 1
+
+
+@patch.dict(
+    os.environ,
+    {
+        "MONGODB_URI": MOCKED_ENV_VALUES["filled_value"],
+        "MONGODB_MAX_POOL_SIZE": "50",
+        "MONGODB_MIN_POOL_SIZE": "5",
+        "MONGODB_MAX_IDLE_TIME_MS": "60000",
+        "MONGODB_WAIT_QUEUE_TIMEOUT_MS": "2000",
+    },
+)
+def test_database_pool_options():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        Database().instantiate_client()
+    mocked_mongo_client.assert_called_once_with(
+        "mocked_uri",
+        event_listeners=ANY,
+        maxPoolSize=50,
+        minPoolSize=5,
+        maxIdleTimeMS=60000,
+        waitQueueTimeoutMS=2000,
+    )
+
+
+@patch.dict(os.environ, {"MONGODB_URI": MOCKED_ENV_VALUES["filled_value"]})
+def test_database_close_client():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        Database().instantiate_client()
+        Database.close_client()
+        Database().instantiate_client()
+    assert mocked_mongo_client.return_value.close.called
+    assert mocked_mongo_client.call_count == 2
+
+
+@patch.dict(os.environ, {"MONGODB_URI": MOCKED_ENV_VALUES["filled_value"]})
+def test_database_ping_failed():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        database = Database()
+        database.instantiate_client()
+        mocked_mongo_client.return_value.admin.command.side_effect = Exception()
+        assert database.ping() is False
+
+
+def test_database_ping_without_client():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        assert Database().ping() is False
+        assert not mocked_mongo_client.called
+
+
+@patch.dict(
+    os.environ,
+    {
+        "MONGODB_URI": MOCKED_ENV_VALUES["filled_value"],
+        "MONGODB_MIN_POOL_SIZE": "3",
+    },
+)
+def test_database_warm_up():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        Database().warm_up()
+        # One ping when the client is created and one per minimum connection
+        assert mocked_mongo_client.return_value.admin.command.call_count == 4
+
+
+@patch.dict(
+    os.environ,
+    {
+        "MONGODB_URI": MOCKED_ENV_VALUES["filled_value"],
+        "MONGODB_MIN_POOL_SIZE": "0",
+    },
+)
+def test_database_warm_up_without_min_pool_size():
+    with patch("src.database.Database.MongoClient") as mocked_mongo_client:
+        Database().warm_up()
+        assert mocked_mongo_client.return_value.admin.command.call_count == 1
@@ -0,0 +1,197 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo import ASCENDING, DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from src.database.Database import Database
+from src.database.indexes import Indexes
+from src.database.memory import InMemoryClient, matches
+from src.main import app
+from src.tasks.migration import TasksMigration
+
+test_client = TestClient(app)
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_PASSWORD = "mocked_password"
+
+
+@pytest.fixture
+def memory_client():
+    with patch.dict(
+        os.environ, {"DATABASE_BACKEND": "memory", "SECRET_KEY": "mocked_secret_key"}
+    ):
+        Database.close_client()
+        client = Database().instantiate_client()
+        Indexes().sync()
+        yield client
+        Database.close_client()
+
+
+def test_database_memory_backend(memory_client):
+    assert isinstance(memory_client, InMemoryClient)
+    assert Database().ping() is True
+
+
+def test_matches_operators():
+    document = {"name": "b", "priority": "Low", "tags": ["x"]}
+    assert matches(document, {"name": {"$in": ["a", "b"]}, "tags": "x"})
+    assert matches(document, {"$or": [{"name": {"$gt": "c"}}, {"priority": "Low"}]})
+    assert matches(document, {"name": {"$regex": "^b"}, "done": {"$exists": False}})
+    assert not matches(document, {"$and": [{"name": "b"}, {"name": {"$lt": "a"}}]})
+
+
+def test_unique_indexes(memory_client):
+    tasks_collection = memory_client["users_db"]["tasks_collection"]
+    tasks_collection.insert_one({"user_id": 1, "name": "a"})
+    tasks_collection.insert_one({"user_id": 2, "name": "a"})
+    tasks_collection.insert_one({"user_id": 1, "name": "b"})
+    with pytest.raises(DuplicateKeyError):
+        tasks_collection.insert_one({"user_id": 1, "name": "a"})
+    with pytest.raises(DuplicateKeyError):
+        tasks_collection.update_one(
+            {"user_id": 1, "name": "b"}, {"$set": {"name": "a"}}
+        )
+    assert tasks_collection.find_one({"user_id": 1, "name": "b"}, {"_id": 0}) == {
+        "user_id": 1,
+        "name": "b",
+    }
+
+
+def test_find_sort_limit_and_projection(memory_client):
+    tasks_collection = memory_client["users_db"]["tasks_collection"]
+    tasks_collection.insert_many(
+        [
+            {"user_id": 1, "name": name, "priority": priority}
+            for name, priority in (("c", "Low"), ("a", "High"), ("b", "Low"))
+        ]
+    )
+    tasks = list(
+        tasks_collection.find({"user_id": 1}, {"_id": 0, "name": 1})
+        .sort([("priority", ASCENDING), ("name", -1)])
+        .limit(2)
+    )
+    assert tasks == [{"name": "a"}, {"name": "c"}]
+    assert tasks_collection.find_one({"user_id": 2}) is None
+
+
+def test_bulk_write(memory_client):
+    tasks_collection = memory_client["users_db"]["tasks_collection"]
+    tasks_collection.insert_one({"user_id": 1, "name": "a"})
+    with pytest.raises(BulkWriteError) as error:
+        tasks_collection.bulk_write(
+            [
+                InsertOne({"user_id": 1, "name": "a"}),
+                UpdateOne({"user_id": 1, "name": "a"}, {"$set": {"priority": "Low"}}),
+                InsertOne({"user_id": 1, "name": "b"}),
+            ],
+            ordered=False,
+        )
+    assert [
+        (write_error["index"], write_error["code"])
+        for write_error in error.value.details["writeErrors"]
+    ] == [(0, 11000)]
+    result = tasks_collection.bulk_write(
+        [
+            DeleteOne({"user_id": 1, "name": "b"}),
+            UpdateOne(
+                {"user_id": 1, "name": "c"}, {"$setOnInsert": {"done": 0}}, upsert=True
+            ),
+        ]
+    )
+    assert result.deleted_count == 1
+    assert list(result.upserted_ids) == [1]
+    assert tasks_collection.count_documents({"user_id": 1}) == 2
+
+
+def test_hot_queries_use_indexes(memory_client):
+    plans = Indexes().explain_hot_queries()
+    assert all("COLLSCAN" not in plan["stages"] for plan in plans.values())
+
+
+def test_name_lookups_use_unique_index(memory_client):
+    tasks_collection = memory_client["users_db"]["tasks_collection"]
+    plan = tasks_collection.find({"user_id": 1, "name": "a"}).explain()
+    assert plan["queryPlanner"]["winningPlan"]["inputStage"]["indexName"] == (
+        "user_id_1_name_1"
+    )
+
+
+def test_migration(memory_client):
+    users_collection = memory_client["users_db"]["users_collection"]
+    user_id = users_collection.insert_one(
+        {"email": MOCKED_EMAIL, "tasks": [{"name": "a"}, {"name": "b"}]}
+    ).inserted_id
+    assert TasksMigration(batch_size=10).run() == {"users": 1, "tasks": 2}
+    assert "tasks" not in users_collection.find_one({"_id": user_id})
+
+
+def test_http_flow(memory_client):
+    task = {"name": "Task", "description": "Description", "priority": "Low"}
+    response = test_client.post(
+        "/auth/register",
+        json={"name": "Mocked", "email": MOCKED_EMAIL, "password": MOCKED_PASSWORD},
+    )
+    assert response.status_code == 201
+    response = test_client.post(
+        "/auth/token", data={"username": MOCKED_EMAIL, "password": MOCKED_PASSWORD}
+    )
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = test_client.patch(
+        f"/tasks/add_task?user_email={MOCKED_EMAIL}", headers=headers, json=task
+    )
+    assert response.status_code == 200
+    response = test_client.patch(
+        f"/tasks/add_task?user_email={MOCKED_EMAIL}", headers=headers, json=task
+    )
+    assert response.status_code == 409
+
+    response = test_client.post(
+        f"/tasks/get_tasks?user_email={MOCKED_EMAIL}", headers=headers
+    )
+    assert response.json()["tasks"] == [task]
+    etag = response.headers["ETag"]
+    response = test_client.post(
+        f"/tasks/get_tasks?user_email={MOCKED_EMAIL}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    response = test_client.patch(
+        f"/tasks/add_task?user_email={MOCKED_EMAIL}",
+        headers=headers,
+        json={**task, "name": "Other"},
+    )
+    response = test_client.patch(
+        f"/tasks/update_task?user_email={MOCKED_EMAIL}&task_name=Other",
+        headers=headers,
+        json={"name": "Task"},
+    )
+    assert response.status_code == 409
+    response = test_client.patch(
+        f"/tasks/update_task?user_email={MOCKED_EMAIL}&task_name=Other",
+        headers=headers,
+        json={"priority": "High"},
+    )
+    assert response.json()["task"] == {**task, "name": "Other", "priority": "High"}
+    response = test_client.patch(
+        f"/tasks/update_task?user_email={MOCKED_EMAIL}&task_name=Missing",
+        headers=headers,
+        json={"priority": "High"},
+    )
+    assert response.status_code == 404
+
+    for task_name in ("Task", "Other"):
+        response = test_client.patch(
+            f"/tasks/delete_task?user_email={MOCKED_EMAIL}&task_name={task_name}",
+            headers=headers,
+        )
+        assert response.status_code == 200
+    response = test_client.post(
+        f"/tasks/get_tasks?user_email={MOCKED_EMAIL}", headers=headers
+    )
+    assert response.json()["tasks"] == []
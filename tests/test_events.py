@@ -0,0 +1,199 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import anyio
+from fastapi.testclient import TestClient
+
+from src.events import (
+    LocalEventBroker,
+    RedisEventBroker,
+    TaskEventsHub,
+    stream_events,
+)
+from src.main import app
+from src.tasks.router import task_events_stream
+from src.tasks.service import Tasks
+
+test_client = TestClient(app)
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_TOKEN = "mocked_token"
+
+
+def test_hub_delivers_events_to_subscriptions():
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker())
+        subscription = hub.subscribe(MOCKED_EMAIL)
+        other_subscription = hub.subscribe("other_email")
+        hub.publish(MOCKED_EMAIL, {"type": "task_deleted", "name": "Task"})
+        assert await subscription.get(timeout=1) == [
+            {"type": "task_deleted", "name": "Task"}
+        ]
+        assert await other_subscription.get(timeout=0) == []
+
+    anyio.run(main)
+
+
+def test_hub_delivers_events_published_from_threads():
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker())
+        subscription = hub.subscribe(MOCKED_EMAIL)
+        thread = threading.Thread(
+            target=hub.publish,
+            args=(MOCKED_EMAIL, {"type": "task_deleted", "name": "Task"}),
+        )
+        thread.start()
+        events = await subscription.get(timeout=5)
+        thread.join()
+        assert events == [{"type": "task_deleted", "name": "Task"}]
+
+    anyio.run(main)
+
+
+def test_hub_does_not_publish_without_subscriptions():
+    broker = MagicMock(is_shared=False)
+    hub = TaskEventsHub(broker=broker)
+    hub.publish(MOCKED_EMAIL, {"type": "task_deleted", "name": "Task"})
+    assert not broker.publish.called
+
+
+def test_hub_max_subscriptions():
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker(), max_subscriptions=1)
+        subscription = hub.subscribe(MOCKED_EMAIL)
+        assert hub.subscribe(MOCKED_EMAIL) is None
+        hub.unsubscribe(subscription)
+        assert hub.subscriptions() == 0
+        assert hub.subscribe(MOCKED_EMAIL) is not None
+
+    anyio.run(main)
+
+
+def test_subscription_overflow_closes_stream():
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker(), buffer_size=2)
+        subscription = hub.subscribe(MOCKED_EMAIL)
+        for index in range(3):
+            hub.publish(MOCKED_EMAIL, {"type": "task_deleted", "name": str(index)})
+        assert subscription.overflowed
+        return [event async for event in stream_events(subscription)]
+
+    assert anyio.run(main) == [b": connected\n\n", b"event: overflow\ndata: {}\n\n"]
+
+
+def test_stream_events_until_closed():
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker())
+        subscription = hub.subscribe(MOCKED_EMAIL)
+        hub.publish(MOCKED_EMAIL, {"type": "task_deleted", "name": "Task"})
+        hub.close()
+        return [event async for event in stream_events(subscription)]
+
+    assert anyio.run(main) == [
+        b": connected\n\n",
+        b'event: task_deleted\ndata: {"type":"task_deleted","name":"Task"}\n\n',
+    ]
+
+
+def test_stream_events_until_token_expires():
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker())
+        subscription = hub.subscribe(MOCKED_EMAIL)
+        return [
+            event
+            async for event in stream_events(
+                subscription, keep_alive=5, expires_at=time.time() + 0.1
+            )
+        ]
+
+    assert anyio.run(main) == [b": connected\n\n", b"event: auth_expired\ndata: {}\n\n"]
+
+
+def test_redis_broker_publishes_to_user_channel():
+    client = MagicMock()
+    broker = RedisEventBroker(url="redis://mocked", client=client)
+    broker.publish(MOCKED_EMAIL, {"type": "task_deleted", "name": "Task"})
+    client.publish.assert_called_once_with(
+        f"task_events:{MOCKED_EMAIL}", '{"type": "task_deleted", "name": "Task"}'
+    )
+
+
+def test_check_user_returns_token_expiration():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token", return_value={"exp": 1000}),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        assert tasks.check_user(email=MOCKED_EMAIL, token=MOCKED_TOKEN) == 1000.0
+
+
+def test_task_events_route_401():
+    with patch("src.auth.service.Database.instantiate_client"):
+        response = test_client.get(
+            f"/tasks/events?user_email={MOCKED_EMAIL}",
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+        )
+        assert response.status_code == 401
+
+
+def test_task_events_route_429():
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.router.task_events") as mock_task_events,
+    ):
+        mock_task_events.subscribe.return_value = None
+        response = test_client.get(
+            f"/tasks/events?user_email={MOCKED_EMAIL}",
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+        )
+        assert response.status_code == 429
+
+
+def test_task_events_route_200():
+    async def mocked_stream_events(subscription, expires_at):
+        yield b'event: task_deleted\ndata: {"type":"task_deleted","name":"Task"}\n\n'
+
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.router.task_events") as mock_task_events,
+        patch("src.tasks.router.stream_events", mocked_stream_events),
+    ):
+        response = test_client.get(
+            f"/tasks/events?user_email={MOCKED_EMAIL}",
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: task_deleted" in response.text
+        mock_task_events.subscribe.assert_called_once_with(MOCKED_EMAIL)
+        mock_task_events.unsubscribe.assert_called_once_with(
+            mock_task_events.subscribe.return_value
+        )
+
+
+def test_task_events_route_unsubscribes_when_client_leaves_before_start():
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            await anyio.sleep(1)
+
+    async def main():
+        hub = TaskEventsHub(broker=LocalEventBroker(), max_subscriptions=1)
+        with (
+            patch("src.tasks.router.Tasks"),
+            patch("src.tasks.router.task_events", hub),
+        ):
+            for _ in range(3):
+                response = await task_events_stream(
+                    user_email=MOCKED_EMAIL, token=MOCKED_TOKEN
+                )
+                await response({"type": "http"}, receive, send)
+        return hub.subscriptions()
+
+    assert anyio.run(main) == 0
@@ -0,0 +1,92 @@
+import signal
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from src.main import app, install_shutdown_hook
+
+test_client = TestClient(app)
+
+
+def test_health_check_route_200():
+    with patch("src.main.Database.ping") as mocked_ping:
+        mocked_ping.return_value = True
+        response = test_client.get("/healthz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+        assert set(response.json()["pool"]) == {
+            "open_connections",
+            "checked_out_connections",
+            "db_threads_in_use",
+            "requests_in_flight",
+        }
+
+
+def test_health_check_route_503():
+    with patch("src.main.Database.ping") as mocked_ping:
+        mocked_ping.return_value = False
+        response = test_client.get("/healthz")
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
+
+
+def test_readiness_check_route_starting():
+    with (
+        patch.object(app.state, "status", "starting"),
+        patch("src.main.Database.ping") as mocked_ping,
+    ):
+        response = test_client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+        assert not mocked_ping.called
+
+
+def test_readiness_check_route_200():
+    with (
+        patch.object(app.state, "status", "ready"),
+        patch("src.main.Database.ping") as mocked_ping,
+    ):
+        mocked_ping.return_value = True
+        response = test_client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+
+def test_lifespan_warms_up_and_drains():
+    with (
+        patch("src.main.Database.warm_up") as mocked_warm_up,
+        patch("src.main.Indexes") as mocked_indexes,
+        patch("src.main.password_hasher") as mocked_password_hasher,
+        patch("src.main.Database.close_client") as mocked_close_client,
+        patch("src.main.Database.ping", return_value=True),
+    ):
+        with TestClient(app) as client:
+            assert client.get("/readyz").status_code == 200
+        mocked_warm_up.assert_called_once()
+        mocked_indexes.return_value.sync.assert_called_once()
+        mocked_password_hasher.warm_up.assert_called_once()
+        mocked_password_hasher.shutdown.assert_called_once()
+        mocked_close_client.assert_called_once()
+        assert app.state.status == "draining"
+
+
+def test_shutdown_hook_drains_on_signal():
+    signals = []
+    original_handler = signal.signal(
+        signal.SIGTERM, lambda signum, frame: signals.append(signum)
+    )
+    try:
+        with patch("src.main.task_events") as mocked_task_events:
+            with patch.object(app.state, "status", "ready"):
+                loop = MagicMock()
+                install_shutdown_hook(loop)
+                signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+                assert test_client.get("/readyz").json()["status"] == "draining"
+            assert not mocked_task_events.close.called
+            loop.call_soon_threadsafe.assert_called_once_with(
+                mocked_task_events.close
+            )
+            assert signals == [signal.SIGTERM]
+    finally:
+        signal.signal(signal.SIGTERM, original_handler)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
@@ -0,0 +1,128 @@
+from unittest.mock import MagicMock, patch
+
+from pymongo.errors import DuplicateKeyError
+
+from src.database.indexes import INDEXES, Indexes, missing_unique_indexes
+
+
+def index_information(collection_name: str, **overrides) -> dict:
+    information = {"_id_": {"key": [("_id", 1)]}}
+    for index_model in INDEXES[collection_name]:
+        document = index_model.document
+        information[document["name"]] = {
+            "key": list(document["key"].items()),
+            "unique": document.get("unique", False),
+        }
+    information.update(overrides)
+    return information
+
+
+def mocked_collections(information_by_collection: dict) -> dict:
+    collections = {}
+    for collection_name, information in information_by_collection.items():
+        collection = MagicMock()
+        collection.index_information.return_value = information
+        collection.create_indexes.side_effect = lambda models: [
+            model.document["name"] for model in models
+        ]
+        collections[collection_name] = collection
+    return collections
+
+
+def test_indexes_sync_creates_missing_indexes():
+    with patch("src.database.indexes.Database.instantiate_client"):
+        indexes = Indexes()
+        collections = mocked_collections(
+            {"users_collection": {"_id_": {}}, "tasks_collection": {"_id_": {}}}
+        )
+        indexes._database = collections
+        report = indexes.sync()
+        assert report == {
+            "created": [
+                "users_collection.email_1",
+                "tasks_collection.user_id_1_name_1",
+                "tasks_collection.user_id_1_priority_1_name_1",
+            ],
+            "drift": [],
+        }
+
+
+def test_indexes_sync_is_idempotent():
+    with patch("src.database.indexes.Database.instantiate_client"):
+        indexes = Indexes()
+        collections = mocked_collections(
+            {
+                "users_collection": index_information("users_collection"),
+                "tasks_collection": index_information("tasks_collection"),
+            }
+        )
+        indexes._database = collections
+        assert indexes.sync() == {"created": [], "drift": []}
+        assert not collections["users_collection"].create_indexes.called
+        assert not collections["tasks_collection"].create_indexes.called
+
+
+def test_indexes_sync_reports_drift():
+    with patch("src.database.indexes.Database.instantiate_client"):
+        indexes = Indexes()
+        indexes._database = mocked_collections(
+            {
+                "users_collection": index_information(
+                    "users_collection",
+                    email_1={"key": [("email", 1)]},
+                    name_1={"key": [("name", 1)]},
+                ),
+                "tasks_collection": index_information("tasks_collection"),
+            }
+        )
+        assert indexes.sync()["drift"] == [
+            "users_collection.email_1 differs in uniqueness",
+            "users_collection.name_1 is not declared",
+        ]
+
+
+def test_indexes_sync_reports_index_that_cannot_be_built():
+    with patch("src.database.indexes.Database.instantiate_client"):
+        indexes = Indexes()
+        collections = mocked_collections(
+            {"users_collection": {"_id_": {}}, "tasks_collection": {"_id_": {}}}
+        )
+        collections["users_collection"].create_indexes.side_effect = (
+            DuplicateKeyError("E11000 duplicate key error")
+        )
+        indexes._database = collections
+        report = indexes.sync()
+        assert report["created"] == [
+            "tasks_collection.user_id_1_name_1",
+            "tasks_collection.user_id_1_priority_1_name_1",
+        ]
+        assert report["drift"] == [
+            "users_collection.email_1 could not be created: "
+            "E11000 duplicate key error"
+        ]
+        assert missing_unique_indexes == {"users_collection.email_1"}
+
+        collections["users_collection"].create_indexes.side_effect = None
+        indexes.sync()
+        assert missing_unique_indexes == set()
+
+
+def test_indexes_explain_hot_queries():
+    with patch("src.database.indexes.Database.instantiate_client"):
+        indexes = Indexes()
+        collection = MagicMock()
+        collection.find.return_value.explain.return_value = {
+            "queryPlanner": {
+                "winningPlan": {
+                    "stage": "FETCH",
+                    "inputStage": {"stage": "IXSCAN", "indexName": "email_1"},
+                }
+            }
+        }
+        collection.find.return_value.sort.return_value = collection.find.return_value
+        indexes._database = {
+            "users_collection": collection,
+            "tasks_collection": collection,
+        }
+        plans = indexes.explain_hot_queries()
+        assert plans["get_user"] == {"stages": "FETCH <- IXSCAN", "index": "email_1"}
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.metrics import (
+    HTTP_REQUEST_DURATION,
+    STAGE_DURATION,
+    Counter,
+    Gauge,
+    Histogram,
+    timed,
+)
+
+test_client = TestClient(app)
+
+
+def test_counter_render():
+    counter = Counter("mocked_total", "Mocked counter", labelnames=("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    assert counter.render() == (
+        "# HELP mocked_total Mocked counter\n"
+        "# TYPE mocked_total counter\n"
+        'mocked_total{kind="a"} 3'
+    )
+
+
+def test_gauge_function():
+    gauge = Gauge("mocked_gauge", "Mocked gauge", function=lambda: 7)
+    assert gauge.render().endswith("mocked_gauge 7")
+
+
+def test_histogram_buckets():
+    histogram = Histogram("mocked_seconds", "Mocked histogram", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    assert histogram.render().splitlines()[2:] == [
+        'mocked_seconds_bucket{le="0.1"} 1',
+        'mocked_seconds_bucket{le="1"} 2',
+        'mocked_seconds_bucket{le="+Inf"} 2',
+        "mocked_seconds_sum 0.55",
+        "mocked_seconds_count 2",
+    ]
+
+
+def test_timed_records_stage():
+    @timed("mocked_stage")
+    def mocked_stage():
+        return "mocked_result"
+
+    assert mocked_stage() == "mocked_result"
+    assert 'stage_duration_seconds_count{stage="mocked_stage"} 1' in (
+        STAGE_DURATION.render()
+    )
+
+
+def test_metrics_route_200():
+    with patch("src.main.Database.ping") as mocked_ping:
+        mocked_ping.return_value = True
+        test_client.get("/healthz")
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/healthz",'
+        'status="200"}'
+    ) in response.text
+    for metric_name in (
+        "http_requests_in_flight",
+        "stage_duration_seconds",
+        "mongodb_connections",
+        "db_threadpool_in_use",
+        "password_hashing_queue_depth",
+        "token_cache_hits_total",
+    ):
+        assert f"# TYPE {metric_name} " in response.text
+
+
+def test_metrics_middleware_unmatched_route():
+    test_client.get("/mocked_missing_route")
+    assert 'route="unmatched",status="404"' in HTTP_REQUEST_DURATION.render()
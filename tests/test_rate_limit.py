@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.rate_limit import (
+    LOGIN_EMAIL_RATE_LIMIT,
+    RATE_LIMIT_REJECTED,
+    TASKS_EMAIL_RATE_LIMIT,
+    InMemoryRateLimitBackend,
+    RateLimit,
+    RedisRateLimitBackend,
+)
+
+test_client = TestClient(app)
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_TOKEN = "mocked_token"
+
+
+def test_rate_limit_parse():
+    assert RateLimit._parse("30/minute") == (0.5, 30)
+    assert RateLimit._parse("") == (0.0, 0)
+
+
+def test_in_memory_backend_token_bucket():
+    backend = InMemoryRateLimitBackend()
+    assert backend.acquire("key", rate=1, capacity=2) == 0
+    assert backend.acquire("key", rate=1, capacity=2) == 0
+    assert 0 < backend.acquire("key", rate=1, capacity=2) <= 1
+    assert backend.acquire("other_key", rate=1, capacity=2) == 0
+
+
+def test_in_memory_backend_max_keys():
+    backend = InMemoryRateLimitBackend(max_keys=1)
+    backend.acquire("first_key", rate=1, capacity=1)
+    backend.acquire("second_key", rate=1, capacity=1)
+    assert backend.acquire("first_key", rate=1, capacity=1) == 0
+
+
+def test_redis_backend_uses_script():
+    client = MagicMock()
+    client.eval.return_value = b"0.5"
+    backend = RedisRateLimitBackend(url="redis://mocked", client=client)
+    assert backend.acquire("key", rate=1, capacity=2) == 0.5
+    assert client.eval.call_args.args[2] == "rate_limit:key"
+
+
+def test_login_rate_limited_before_bcrypt():
+    rejected = RATE_LIMIT_REJECTED.get(rule="login_email")
+    with (
+        patch.object(LOGIN_EMAIL_RATE_LIMIT, "capacity", 1),
+        patch("src.auth.router.User") as mock_user,
+    ):
+        mock_user.return_value.login_user.return_value = {
+            "user_data": {},
+            "token": MOCKED_TOKEN,
+        }
+        form = {"username": MOCKED_EMAIL, "password": "mocked_password"}
+        assert test_client.post("/auth/token", data=form).status_code == 200
+        response = test_client.post("/auth/token", data=form)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert mock_user.return_value.login_user.call_count == 1
+        assert (
+            test_client.post(
+                "/auth/token", data={**form, "username": "other_email"}
+            ).status_code
+            == 200
+        )
+    assert RATE_LIMIT_REJECTED.get(rule="login_email") == rejected + 1
+
+
+def test_tasks_rate_limited_before_database():
+    with (
+        patch.object(TASKS_EMAIL_RATE_LIMIT, "capacity", 1),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_collection = mock_db_client.return_value["users_db"]["users_collection"]
+        mocked_collection.find_one.return_value = None
+        headers = {"Authorization": f"Bearer {MOCKED_TOKEN}"}
+        url = f"/tasks/get_tasks?user_email={MOCKED_EMAIL}"
+        assert test_client.post(url, headers=headers).status_code == 404
+        assert test_client.post(url, headers=headers).status_code == 429
+        assert mocked_collection.find_one.call_count == 1
+
+
+def test_tasks_email_not_charged_without_valid_token():
+    with (
+        patch.object(TASKS_EMAIL_RATE_LIMIT, "capacity", 1),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+    ):
+        mocked_collection = mock_db_client.return_value["users_db"]["users_collection"]
+        mocked_collection.find_one.return_value = None
+        headers = {"Authorization": f"Bearer {MOCKED_TOKEN}"}
+        url = f"/tasks/get_tasks?user_email={MOCKED_EMAIL}"
+        assert test_client.post(url, headers=headers).status_code == 401
+        assert test_client.post(url, headers=headers).status_code == 401
+        with patch("src.auth.auth.Auth.decode_token"):
+            assert test_client.post(url, headers=headers).status_code == 404
@@ -0,0 +1,106 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.server import (
+    SERVER_MAX_REQUESTS,
+    STARTUP_FAILURE,
+    WorkerSupervisor,
+    get_worker_config,
+    get_worker_count,
+    get_worker_environment,
+    run_worker,
+)
+
+SHARED_STORES = {
+    "TASKS_CACHE_BACKEND": "redis",
+    "TASK_EVENTS_BACKEND": "redis",
+    "RATE_LIMIT_BACKEND": "redis",
+}
+
+
+def test_get_worker_environment_splits_pools():
+    with patch.dict(os.environ, {}, clear=True):
+        assert get_worker_environment(workers=4, db_connections=100, cpus=8) == {
+            "MONGODB_MAX_POOL_SIZE": "25",
+            "PASSWORD_HASHING_WORKERS": "2",
+        }
+
+
+def test_get_worker_environment_keeps_set_variables():
+    with patch.dict(os.environ, {"MONGODB_MAX_POOL_SIZE": "10"}, clear=True):
+        assert get_worker_environment(workers=16, db_connections=100, cpus=8) == {
+            "PASSWORD_HASHING_WORKERS": "1",
+        }
+
+
+def test_get_worker_config():
+    config = get_worker_config()
+    assert config.loop == "uvloop"
+    assert config.http == "httptools"
+    assert config.limit_max_requests >= SERVER_MAX_REQUESTS
+
+
+def test_get_worker_count_one_with_memory_stores():
+    with (
+        patch.dict(os.environ, {**SHARED_STORES, "RATE_LIMIT_BACKEND": "memory"}),
+        patch("src.server.os.cpu_count", return_value=8),
+    ):
+        os.environ.pop("WEB_CONCURRENCY", None)
+        assert get_worker_count() == 1
+
+
+def test_get_worker_count_one_per_cpu_with_shared_stores():
+    with (
+        patch.dict(os.environ, SHARED_STORES),
+        patch("src.server.os.cpu_count", return_value=8),
+    ):
+        os.environ.pop("WEB_CONCURRENCY", None)
+        assert get_worker_count() == 8
+
+
+def test_get_worker_count_web_concurrency():
+    with patch.dict(os.environ, {"WEB_CONCURRENCY": "3"}):
+        assert get_worker_count() == 3
+
+
+def test_run_worker_exits_when_startup_fails():
+    server = MagicMock(started=False)
+
+    with pytest.raises(SystemExit) as error:
+        run_worker(server, sockets=[])
+
+    assert error.value.code == STARTUP_FAILURE
+    server.run.assert_called_once_with(sockets=[])
+
+
+def test_run_worker_returns_after_serving():
+    server = MagicMock(started=True)
+
+    run_worker(server, sockets=[])
+
+    server.run.assert_called_once_with(sockets=[])
+
+
+def test_check_workers_replaces_finished_worker():
+    supervisor = WorkerSupervisor(workers=1)
+    supervisor._processes = [MagicMock(exitcode=0, **{"is_alive.return_value": False})]
+
+    with patch.object(supervisor, "_start_worker") as start_worker:
+        assert supervisor._check_workers()
+
+    start_worker.assert_called_once_with(0)
+
+
+def test_check_workers_stops_on_failed_worker():
+    supervisor = WorkerSupervisor(workers=2)
+    supervisor._processes = [
+        MagicMock(**{"is_alive.return_value": True}),
+        MagicMock(exitcode=STARTUP_FAILURE, **{"is_alive.return_value": False}),
+    ]
+
+    with patch.object(supervisor, "_start_worker") as start_worker:
+        assert not supervisor._check_workers()
+
+    start_worker.assert_not_called()
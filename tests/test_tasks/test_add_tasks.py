@@ -2,9 +2,11 @@ from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError
 
+from src.database.indexes import TASKS_NAME_INDEX
 from src.main import app
-from src.tasks.exceptions import TaskAlreadyExists
+from src.tasks.exceptions import TaskAlreadyExists, UserDoesNotExists
 from src.tasks.schemas import Task
 from src.tasks.service import Tasks
 
@@ -27,41 +29,83 @@ def test_add_task_already_exists(task: Task):
     with (
         patch("src.tasks.service.Database.instantiate_client"),
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.insert_one.side_effect = DuplicateKeyError("dup")
+        with pytest.raises(TaskAlreadyExists):
+            tasks.add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+
+
+def test_add_task_checks_name_without_unique_index(task: Task):
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.missing_unique_indexes", {TASKS_NAME_INDEX}),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        with pytest.raises(TaskAlreadyExists):
+            tasks.add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+        tasks._tasks_collection.find_one.assert_called_with(
+            {"user_id": "mocked_id", "name": task.name}, {"_id": 1}
+        )
+        assert not tasks._tasks_collection.insert_one.called
+
+
+def test_add_task_dual_mode_migrates_user(task: Task):
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.TasksMigration.migrate_user") as mock_migrate_user,
+    ):
+        tasks = Tasks()
+        tasks._dual_read = True
+        tasks._users_collection.find_one.return_value = {
             "_id": "mocked_id",
             "tasks": [{"name": "Mocked task"}],
         }
+        tasks._tasks_collection.insert_one.side_effect = DuplicateKeyError("dup")
         with pytest.raises(TaskAlreadyExists):
-            Tasks().add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+            tasks.add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+        mock_migrate_user.assert_called_once_with(user_id="mocked_id")
 
 
-def test_add_task_update_called(task: Task):
+def test_add_task_user_does_not_exists(task: Task):
     with (
         patch("src.tasks.service.Database.instantiate_client"),
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
         tasks = Tasks()
-        mock_get_user.return_value = {
-            "_id": "mocked_id",
-            "tasks": [{"name": "Different mocked task"}],
-        }
-        Tasks().add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
-        assert tasks._users_collection.update_one.called
+        tasks._users_collection.find_one.return_value = None
+        with pytest.raises(UserDoesNotExists):
+            tasks.add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+
+
+def test_add_task_insert_called(task: Task):
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks.add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+        tasks._tasks_collection.insert_one.assert_called_once_with(
+            {"user_id": "mocked_id", **task.model_dump()}
+        )
+        tasks._users_collection.update_one.assert_called_once_with(
+            {"_id": "mocked_id"}, {"$inc": {"tasks_version": 1}}
+        )
 
 
 def test_add_task_route_409(task: Task):
     with (
-        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {
-            "_id": "mocked_id",
-            "tasks": [{"name": "Mocked task"}],
-        }
+        mocked_collection = mock_db_client.return_value["users_db"]["tasks_collection"]
+        mocked_collection.find_one.return_value = {"_id": "mocked_id"}
+        mocked_collection.insert_one.side_effect = DuplicateKeyError("dup")
         response = test_client.patch(
             f"/tasks/add_task?user_email={MOCKED_EMAIL}",
             headers={
@@ -76,15 +120,13 @@ def test_add_task_route_409(task: Task):
 
 def test_add_task_route_200(task: Task):
     with (
-        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
         mocked_id = "mocked_id"
-        mock_get_user.return_value = {
-            "_id": mocked_id,
-            "tasks": [{"name": "Different mocked task"}],
-        }
+        mock_db_client.return_value["users_db"][
+            "users_collection"
+        ].find_one.return_value = {"_id": mocked_id}
         response = test_client.patch(
             f"/tasks/add_task?user_email={MOCKED_EMAIL}",
             headers={
@@ -97,3 +139,17 @@ def test_add_task_route_200(task: Task):
         assert response.json() == {
             "detail": f"Tasks updated for the user with ID {mocked_id}"
         }
+
+
+def test_add_task_publishes_event(task: Task):
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.task_events") as mock_task_events,
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks.add_task(email=MOCKED_EMAIL, new_task=task, token=MOCKED_TOKEN)
+        mock_task_events.publish.assert_called_once_with(
+            MOCKED_EMAIL, {"type": "task_added", "task": task.model_dump()}
+        )
@@ -0,0 +1,185 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.auth.exceptions import TokenError
+from src.main import app
+from src.tasks.exceptions import NotAuthorizedError
+from src.tasks.schemas import BulkTaskOperations
+from src.tasks.service import Tasks
+
+test_client = TestClient(app)
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_TOKEN = "mocked_token"
+
+
+def mocked_task(name: str) -> dict:
+    return {"name": name, "description": "Mocked", "priority": "Low"}
+
+
+def test_bulk_tasks_invalid_token():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token") as mocked_decode_token,
+    ):
+        mocked_decode_token.side_effect = TokenError
+        with pytest.raises(NotAuthorizedError):
+            Tasks().bulk_tasks(email=MOCKED_EMAIL, operations=[], token=MOCKED_TOKEN)
+
+
+def test_bulk_tasks_results():
+    operations = BulkTaskOperations(
+        operations=[
+            {"op": "add", "task": mocked_task("a")},
+            {"op": "add", "task": mocked_task("c")},
+            {"op": "delete", "name": "b"},
+            {"op": "delete", "name": "z"},
+            {"op": "update", "name": "d", "task": mocked_task("e")},
+        ]
+    ).operations
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.task_events") as mock_task_events,
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value = [
+            {"name": "a"},
+            {"name": "b"},
+            {"name": "d"},
+        ]
+        response = tasks.bulk_tasks(
+            email=MOCKED_EMAIL, operations=operations, token=MOCKED_TOKEN
+        )
+        assert [result["status_code"] for result in response["results"]] == [
+            409,
+            200,
+            200,
+            404,
+            200,
+        ]
+        tasks._tasks_collection.bulk_write.assert_called_once_with(
+            [
+                InsertOne({"user_id": "mocked_id", **mocked_task("c")}),
+                DeleteOne({"user_id": "mocked_id", "name": "b"}),
+                UpdateOne(
+                    {"user_id": "mocked_id", "name": "d"}, {"$set": mocked_task("e")}
+                ),
+            ],
+            ordered=False,
+        )
+        tasks._users_collection.update_one.assert_called_once_with(
+            {"_id": "mocked_id"}, {"$inc": {"tasks_version": 1}}
+        )
+        events = [call.args[1] for call in mock_task_events.publish.mock_calls]
+        assert [event["type"] for event in events] == [
+            "task_added",
+            "task_deleted",
+            "task_updated",
+        ]
+
+
+def test_bulk_tasks_duplicate_key_error():
+    operations = BulkTaskOperations(
+        operations=[
+            {"op": "add", "task": mocked_task("a")},
+            {"op": "add", "task": mocked_task("b")},
+        ]
+    ).operations
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value = []
+        tasks._tasks_collection.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000}]}
+        )
+        response = tasks.bulk_tasks(
+            email=MOCKED_EMAIL, operations=operations, token=MOCKED_TOKEN
+        )
+        assert response["results"] == [
+            {"op": "add", "name": "a", "status_code": 200, "detail": "Task added"},
+            {
+                "op": "add",
+                "name": "b",
+                "status_code": 409,
+                "detail": "Task already exists",
+            },
+        ]
+
+
+def test_bulk_tasks_all_failed_keeps_version():
+    operations = BulkTaskOperations(
+        operations=[{"op": "add", "task": mocked_task("a")}]
+    ).operations
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.tasks_cache") as mock_tasks_cache,
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value = []
+        tasks._tasks_collection.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": 11000}]}
+        )
+        response = tasks.bulk_tasks(
+            email=MOCKED_EMAIL, operations=operations, token=MOCKED_TOKEN
+        )
+        assert response["results"][0]["status_code"] == 409
+        tasks._users_collection.update_one.assert_not_called()
+        mock_tasks_cache.delete.assert_not_called()
+
+
+def test_bulk_tasks_route_422_same_task_twice():
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        response = test_client.patch(
+            f"/tasks/bulk_tasks?user_email={MOCKED_EMAIL}",
+            headers={
+                "accept": "application/json",
+                "Authorization": f"Bearer {MOCKED_TOKEN}",
+            },
+            json={
+                "operations": [
+                    {"op": "delete", "name": "a"},
+                    {"op": "update", "name": "b", "task": mocked_task("a")},
+                ]
+            },
+        )
+        assert response.status_code == 422
+
+
+def test_bulk_tasks_route_200():
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_id = "mocked_id"
+        mocked_collection = mock_db_client.return_value["users_db"]["users_collection"]
+        mocked_collection.find_one.return_value = {"_id": mocked_id}
+        mocked_collection.find.return_value = []
+        response = test_client.patch(
+            f"/tasks/bulk_tasks?user_email={MOCKED_EMAIL}",
+            headers={
+                "accept": "application/json",
+                "Authorization": f"Bearer {MOCKED_TOKEN}",
+            },
+            json={"operations": [{"op": "add", "task": mocked_task("a")}]},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "detail": f"Tasks updated for the user with ID {mocked_id}",
+            "results": [
+                {"op": "add", "name": "a", "status_code": 200, "detail": "Task added"}
+            ],
+        }
@@ -4,7 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
-from src.tasks.exceptions import TaskDoesNotExist
+from src.tasks.exceptions import TaskDoesNotExist, UserDoesNotExists
 from src.tasks.service import Tasks
 
 MOCKED_EMAIL = "mocked_email"
@@ -19,47 +19,82 @@ def test_delete_task_does_not_exist():
     with (
         patch("src.tasks.service.Database.instantiate_client"),
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {
-            "_id": "mocked_id",
-            "tasks": [{"name": "Different mocked task"}],
-        }
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.delete_one.return_value.deleted_count = 0
         with pytest.raises(TaskDoesNotExist):
-            Tasks().delete_task(
+            tasks.delete_task(
                 email=MOCKED_EMAIL, task_name=MOCKED_TASK_NAME, token=MOCKED_TOKEN
             )
 
 
-def test_delete_task_update_called():
+def test_delete_task_user_does_not_exists():
     with (
         patch("src.tasks.service.Database.instantiate_client"),
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
         tasks = Tasks()
-        mock_get_user.return_value = {
+        tasks._users_collection.find_one.return_value = None
+        with pytest.raises(UserDoesNotExists):
+            tasks.delete_task(
+                email=MOCKED_EMAIL, task_name=MOCKED_TASK_NAME, token=MOCKED_TOKEN
+            )
+
+
+def test_delete_task_delete_called():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.delete_one.return_value.deleted_count = 1
+
+        tasks.delete_task(
+            email=MOCKED_EMAIL, task_name=MOCKED_TASK_NAME, token=MOCKED_TOKEN
+        )
+
+        tasks._tasks_collection.delete_one.assert_called_once_with(
+            {"user_id": "mocked_id", "name": MOCKED_TASK_NAME}
+        )
+        tasks._users_collection.update_one.assert_called_once_with(
+            {"_id": "mocked_id"}, {"$inc": {"tasks_version": 1}}
+        )
+
+
+def test_delete_task_dual_mode_migrates_user():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.TasksMigration.migrate_user") as mock_migrate_user,
+    ):
+        tasks = Tasks()
+        tasks._dual_read = True
+        tasks._users_collection.find_one.return_value = {
             "_id": "mocked_id",
             "tasks": [{"name": MOCKED_TASK_NAME}],
         }
+        tasks._tasks_collection.delete_one.return_value.deleted_count = 1
 
         tasks.delete_task(
             email=MOCKED_EMAIL, task_name=MOCKED_TASK_NAME, token=MOCKED_TOKEN
         )
 
-        assert tasks._users_collection.update_one.called
+        mock_migrate_user.assert_called_once_with(user_id="mocked_id")
+        tasks._users_collection.update_one.assert_called_once_with(
+            {"_id": "mocked_id"}, {"$inc": {"tasks_version": 1}}
+        )
 
 
 def test_delete_task_route_404():
     with (
-        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {
-            "_id": "mocked_id",
-            "tasks": [{"name": "Different mocked task"}],
-        }
+        mocked_collection = mock_db_client.return_value["users_db"]["tasks_collection"]
+        mocked_collection.find_one.return_value = {"_id": "mocked_id"}
+        mocked_collection.delete_one.return_value.deleted_count = 0
         response = test_client.patch(
             (
                 f"/tasks/delete_task?user_email={MOCKED_EMAIL}"
@@ -76,15 +111,13 @@ def test_delete_task_route_404():
 
 def test_delete_task_route_200():
     with (
-        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
         mocked_id = "mocked_id"
-        mock_get_user.return_value = {
-            "_id": mocked_id,
-            "tasks": [{"name": MOCKED_TASK_NAME}],
-        }
+        mocked_collection = mock_db_client.return_value["users_db"]["tasks_collection"]
+        mocked_collection.find_one.return_value = {"_id": mocked_id}
+        mocked_collection.delete_one.return_value.deleted_count = 1
         response = test_client.patch(
             (
                 f"/tasks/delete_task?user_email={MOCKED_EMAIL}"
@@ -99,3 +132,19 @@ def test_delete_task_route_200():
         assert response.json() == {
             "detail": f"Tasks updated for the user with ID {mocked_id}"
         }
+
+
+def test_delete_task_not_found_publishes_nothing():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.task_events") as mock_task_events,
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.delete_one.return_value.deleted_count = 0
+        with pytest.raises(TaskDoesNotExist):
+            tasks.delete_task(
+                email=MOCKED_EMAIL, task_name=MOCKED_TASK_NAME, token=MOCKED_TOKEN
+            )
+        assert not mock_task_events.publish.called
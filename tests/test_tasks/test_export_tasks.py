@@ -0,0 +1,106 @@
+import gzip
+import json
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.auth.exceptions import TokenError
+from src.main import app
+from src.tasks.exceptions import NotAuthorizedError
+from src.tasks.service import Tasks
+
+test_client = TestClient(app)
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_TOKEN = "mocked_token"
+MOCKED_TASKS = [
+    {"name": f"Mocked task {index}", "description": "Mocked", "priority": "Low"}
+    for index in range(3)
+]
+MOCKED_NDJSON = "".join(
+    json.dumps(task, separators=(",", ":")) + "\n" for task in MOCKED_TASKS
+)
+
+
+def test_export_tasks_invalid_token():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token") as mocked_decode_token,
+    ):
+        mocked_decode_token.side_effect = TokenError
+        with pytest.raises(NotAuthorizedError):
+            Tasks().export_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN)
+
+
+def test_export_tasks_chunks():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.TASKS_EXPORT_BATCH_SIZE", 2),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks_cursor = tasks._tasks_collection.find.return_value.sort.return_value
+        tasks_cursor.batch_size.return_value.__iter__.return_value = MOCKED_TASKS
+        chunks = list(tasks.export_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN))
+        assert len(chunks) == 2
+        assert b"".join(chunks).decode() == MOCKED_NDJSON
+        tasks_cursor.batch_size.assert_called_once_with(2)
+        tasks_cursor.batch_size.return_value.close.assert_called_once()
+
+
+def test_export_tasks_gzip():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks_cursor = tasks._tasks_collection.find.return_value.sort.return_value
+        tasks_cursor.batch_size.return_value.__iter__.return_value = MOCKED_TASKS
+        chunks = tasks.export_tasks(
+            email=MOCKED_EMAIL, token=MOCKED_TOKEN, compress=True
+        )
+        assert gzip.decompress(b"".join(chunks)).decode() == MOCKED_NDJSON
+
+
+def test_export_tasks_route_401():
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token") as mocked_decode_token,
+    ):
+        mocked_decode_token.side_effect = TokenError
+        response = test_client.post(
+            f"/tasks/export_tasks?user_email={MOCKED_EMAIL}",
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+        )
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Not authorized"}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, content_encoding",
+    [("identity", None), ("gzip", "gzip"), ("gzip;q=0", None), ("*", "gzip")],
+)
+def test_export_tasks_route_200(accept_encoding: str, content_encoding: Optional[str]):
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_collection = mock_db_client.return_value["users_db"]["users_collection"]
+        mocked_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks_cursor = mocked_collection.find.return_value.sort.return_value
+        tasks_cursor.batch_size.return_value.__iter__.return_value = MOCKED_TASKS
+        response = test_client.post(
+            f"/tasks/export_tasks?user_email={MOCKED_EMAIL}",
+            headers={
+                "Accept-Encoding": accept_encoding,
+                "Authorization": f"Bearer {MOCKED_TOKEN}",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers.get("content-encoding") == content_encoding
+        assert response.text == MOCKED_NDJSON
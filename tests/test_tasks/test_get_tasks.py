@@ -5,13 +5,19 @@ from fastapi.testclient import TestClient
 
 from src.auth.exceptions import TokenError
 from src.main import app
-from src.tasks.exceptions import NotAuthorizedError, UserDoesNotExists
+from src.tasks.exceptions import (
+    InvalidCursor,
+    NotAuthorizedError,
+    TasksNotModified,
+    UserDoesNotExists,
+)
 from src.tasks.service import Tasks
 
 test_client = TestClient(app)
 
 MOCKED_EMAIL = "mocked_email"
 MOCKED_TOKEN = "mocked_token"
+MOCKED_TASK = {"name": "Mocked task", "description": "Mocked", "priority": "Low"}
 
 
 def test_get_user_tasks_invalid_token():
@@ -28,11 +34,152 @@ def test_get_user_tasks_user_does_not_exists():
     with (
         patch("src.tasks.service.Database.instantiate_client"),
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {}
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = None
         with pytest.raises(UserDoesNotExists):
-            Tasks().get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN)
+            tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN)
+
+
+def test_get_user_tasks_from_tasks_collection():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value.sort.return_value = [MOCKED_TASK]
+        assert tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN) == {
+            "tasks": [MOCKED_TASK],
+            "next_cursor": None,
+            "etag": '"0"',
+        }
+        tasks._tasks_collection.find.assert_called_once_with(
+            {"user_id": "mocked_id"}, {"_id": 0, "user_id": 0}
+        )
+        tasks._tasks_collection.find.return_value.sort.assert_called_once_with(
+            [("name", 1)]
+        )
+
+
+def test_get_user_tasks_filters():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value.sort.return_value = []
+        tasks.get_user_tasks(
+            email=MOCKED_EMAIL,
+            token=MOCKED_TOKEN,
+            priority="Low",
+            name_prefix="Mocked.",
+            sort="-priority",
+        )
+        tasks._tasks_collection.find.assert_called_once_with(
+            {
+                "user_id": "mocked_id",
+                "priority": "Low",
+                "name": {"$regex": "^Mocked\\."},
+            },
+            {"_id": 0, "user_id": 0},
+        )
+        tasks._tasks_collection.find.return_value.sort.assert_called_once_with(
+            [("priority", -1), ("name", -1)]
+        )
+
+
+def test_get_user_tasks_pagination():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        page = [{"name": "a", "priority": "Low"}, {"name": "b", "priority": "Low"}]
+        find = tasks._tasks_collection.find
+        find.return_value.sort.return_value.limit.return_value = page
+
+        first_page = tasks.get_user_tasks(
+            email=MOCKED_EMAIL, token=MOCKED_TOKEN, limit=1, sort="priority"
+        )
+        find.return_value.sort.return_value.limit.assert_called_with(2)
+        assert first_page["tasks"] == page[:1]
+        assert first_page["next_cursor"]
+
+        find.return_value.sort.return_value.limit.return_value = page[1:]
+        second_page = tasks.get_user_tasks(
+            email=MOCKED_EMAIL,
+            token=MOCKED_TOKEN,
+            limit=1,
+            cursor=first_page["next_cursor"],
+            sort="priority",
+        )
+        assert second_page["tasks"] == page[1:]
+        assert second_page["next_cursor"] is None
+        assert second_page["etag"] not in ('"0"', first_page["etag"])
+        assert find.call_args.args[0] == {
+            "$and": [
+                {"user_id": "mocked_id"},
+                {
+                    "$or": [
+                        {"priority": {"$gt": "Low"}},
+                        {"priority": "Low", "name": {"$gt": "a"}},
+                    ]
+                },
+            ]
+        }
+
+
+@pytest.mark.parametrize("cursor", ["not_a_cursor", "bnVsbA=="])
+def test_get_user_tasks_invalid_cursor(cursor: str):
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        with pytest.raises(InvalidCursor):
+            tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN, cursor=cursor)
+
+
+def test_get_user_tasks_dual_mode_migrates_user():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.TasksMigration.migrate_user") as mock_migrate_user,
+    ):
+        tasks = Tasks()
+        tasks._dual_read = True
+        tasks._users_collection.find_one.return_value = {
+            "_id": "mocked_id",
+            "tasks": [MOCKED_TASK],
+        }
+        tasks._tasks_collection.find.return_value.sort.return_value = [MOCKED_TASK]
+        assert tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN) == {
+            "tasks": [MOCKED_TASK],
+            "next_cursor": None,
+            "etag": '"0"',
+        }
+        mock_migrate_user.assert_called_once_with(user_id="mocked_id")
+
+
+def test_get_user_tasks_collection_mode():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.TasksMigration.migrate_user") as mock_migrate_user,
+    ):
+        tasks = Tasks()
+        tasks._dual_read = False
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value.sort.return_value = []
+        tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN)
+        tasks._users_collection.find_one.assert_called_once_with(
+            {"email": MOCKED_EMAIL}, {"_id": 1, "tasks_version": 1}
+        )
+        assert not mock_migrate_user.called
 
 
 def test_get_user_tasks_route_401():
@@ -54,11 +201,12 @@ def test_get_user_tasks_route_401():
 
 def test_get_user_tasks_route_404():
     with (
-        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {}
+        mock_db_client.return_value["users_db"][
+            "users_collection"
+        ].find_one.return_value = None
         response = test_client.post(
             f"/tasks/get_tasks?user_email={MOCKED_EMAIL}",
             headers={
@@ -72,11 +220,12 @@ def test_get_user_tasks_route_404():
 
 def test_get_user_tasks_route_200():
     with (
-        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
         patch("src.auth.auth.Auth.decode_token"),
-        patch("src.auth.service.Utils.get_user") as mock_get_user,
     ):
-        mock_get_user.return_value = {"tasks": {}}
+        mocked_collection = mock_db_client.return_value["users_db"]["tasks_collection"]
+        mocked_collection.find_one.return_value = {"_id": "mocked_id"}
+        mocked_collection.find.return_value.sort.return_value = [MOCKED_TASK]
         response = test_client.post(
             f"/tasks/get_tasks?user_email={MOCKED_EMAIL}",
             headers={
@@ -85,4 +234,164 @@ def test_get_user_tasks_route_200():
             },
         )
         assert response.status_code == 200
-        assert response.json() == {"tasks": {}}
+        assert response.json() == {"tasks": [MOCKED_TASK], "next_cursor": None}
+
+
+def test_get_user_tasks_route_400_invalid_cursor():
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mock_db_client.return_value["users_db"][
+            "users_collection"
+        ].find_one.return_value = {"_id": "mocked_id"}
+        response = test_client.post(
+            f"/tasks/get_tasks?user_email={MOCKED_EMAIL}&cursor=not_a_cursor",
+            headers={
+                "accept": "application/json",
+                "Authorization": f"Bearer {MOCKED_TOKEN}",
+            },
+        )
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_get_user_tasks_route_422_invalid_sort():
+    response = test_client.post(
+        f"/tasks/get_tasks?user_email={MOCKED_EMAIL}&sort=description",
+        headers={
+            "accept": "application/json",
+            "Authorization": f"Bearer {MOCKED_TOKEN}",
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_get_user_tasks_served_from_cache():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value.sort.return_value = [MOCKED_TASK]
+        tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN)
+        assert tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN) == {
+            "tasks": [MOCKED_TASK],
+            "next_cursor": None,
+            "etag": '"0"',
+        }
+        tasks._users_collection.find_one.assert_called_once()
+        tasks._tasks_collection.find.assert_called_once()
+
+
+def test_get_user_tasks_invalidated_on_write():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value.sort.return_value = [MOCKED_TASK]
+        tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN)
+        tasks.delete_task(
+            email=MOCKED_EMAIL, task_name=MOCKED_TASK["name"], token=MOCKED_TOKEN
+        )
+        tasks._users_collection.find_one.return_value["tasks_version"] = 1
+        tasks._tasks_collection.find.return_value.sort.return_value = []
+        assert tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN) == {
+            "tasks": [],
+            "next_cursor": None,
+            "etag": '"1"',
+        }
+
+
+def test_get_user_tasks_pages_are_not_cached():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        limit = tasks._tasks_collection.find.return_value.sort.return_value.limit
+        limit.return_value = [MOCKED_TASK]
+        tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN, limit=10)
+        tasks.get_user_tasks(email=MOCKED_EMAIL, token=MOCKED_TOKEN, limit=10)
+        assert tasks._tasks_collection.find.call_count == 2
+
+
+def test_get_user_tasks_not_modified_without_loading_tasks():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {
+            "_id": "mocked_id",
+            "tasks_version": 3,
+        }
+        with pytest.raises(TasksNotModified) as exc_info:
+            tasks.get_user_tasks(
+                email=MOCKED_EMAIL, token=MOCKED_TOKEN, if_none_match='W/"3"'
+            )
+        assert exc_info.value.headers == {"ETag": '"3"'}
+        assert not tasks._tasks_collection.find.called
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [{"limit": 1}, {"limit": 1, "cursor": "mocked_cursor"}, {"priority": "High"}],
+)
+def test_get_user_tasks_pages_have_their_own_etag(parameters):
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.Tasks._decode_cursor", return_value={}),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {
+            "_id": "mocked_id",
+            "tasks_version": 5,
+        }
+        response = tasks.get_user_tasks(
+            email=MOCKED_EMAIL, token=MOCKED_TOKEN, if_none_match='"5"', **parameters
+        )
+        assert response["etag"].startswith('"5-')
+        with pytest.raises(TasksNotModified):
+            tasks.get_user_tasks(
+                email=MOCKED_EMAIL,
+                token=MOCKED_TOKEN,
+                if_none_match=response["etag"],
+                **parameters,
+            )
+
+
+def test_get_user_tasks_route_etag():
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_collection = mock_db_client.return_value["users_db"]["users_collection"]
+        mocked_collection.find_one.return_value = {
+            "_id": "mocked_id",
+            "tasks_version": 2,
+        }
+        mocked_collection.find.return_value.sort.return_value = [MOCKED_TASK]
+        headers = {
+            "accept": "application/json",
+            "Authorization": f"Bearer {MOCKED_TOKEN}",
+        }
+        response = test_client.post(
+            f"/tasks/get_tasks?user_email={MOCKED_EMAIL}", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"2"'
+        assert response.json() == {"tasks": [MOCKED_TASK], "next_cursor": None}
+
+        response = test_client.post(
+            f"/tasks/get_tasks?user_email={MOCKED_EMAIL}",
+            headers={**headers, "If-None-Match": '"2"'},
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"2"'
+        assert response.content == b""
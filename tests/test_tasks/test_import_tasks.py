@@ -0,0 +1,167 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo.errors import BulkWriteError
+
+from src.auth.exceptions import TokenError
+from src.main import app
+from src.tasks.exceptions import InvalidImportFile, NotAuthorizedError
+from src.tasks.service import Tasks
+
+test_client = TestClient(app)
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_TOKEN = "mocked_token"
+MOCKED_NDJSON = b"""{"name": "a", "description": "Mocked", "priority": "Low"}
+{"name": "b", "description": "Mocked", "priority": "Low"}
+
+{"name": "a", "description": "Duplicated", "priority": "Low"}
+{"name": "c"}
+not json
+{"name": "d", "description": "Mocked", "priority": "High"}
+"""
+MOCKED_CSV = b"""name,description,priority
+a,Mocked,Low
+b,Mocked,High
+"""
+
+
+def test_import_tasks_invalid_token():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token") as mocked_decode_token,
+    ):
+        mocked_decode_token.side_effect = TokenError
+        with pytest.raises(NotAuthorizedError):
+            Tasks().import_tasks(
+                email=MOCKED_EMAIL,
+                tasks_file=io.BytesIO(MOCKED_NDJSON),
+                file_format="ndjson",
+                token=MOCKED_TOKEN,
+            )
+
+
+def test_import_tasks_ndjson_summary():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.TASKS_IMPORT_BATCH_SIZE", 2),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value = [{"name": "b"}]
+        response = tasks.import_tasks(
+            email=MOCKED_EMAIL,
+            tasks_file=io.BytesIO(MOCKED_NDJSON),
+            file_format="ndjson",
+            token=MOCKED_TOKEN,
+        )
+        assert response["inserted"] == 2
+        assert response["skipped"] == 2
+        assert response["invalid"] == 2
+        assert [error["line"] for error in response["errors"]] == [5, 6]
+        assert response["errors"][1]["detail"] == "Invalid JSON"
+        assert tasks._tasks_collection.insert_many.call_count == 2
+        tasks._users_collection.update_one.assert_called_once_with(
+            {"_id": "mocked_id"}, {"$inc": {"tasks_version": 1}}
+        )
+
+
+def test_import_tasks_csv():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value = []
+        response = tasks.import_tasks(
+            email=MOCKED_EMAIL,
+            tasks_file=io.BytesIO(MOCKED_CSV),
+            file_format="csv",
+            token=MOCKED_TOKEN,
+        )
+        assert (response["inserted"], response["skipped"], response["invalid"]) == (
+            2,
+            0,
+            0,
+        )
+        tasks._tasks_collection.insert_many.assert_called_once_with(
+            [
+                {
+                    "user_id": "mocked_id",
+                    "name": "a",
+                    "description": "Mocked",
+                    "priority": "Low",
+                },
+                {
+                    "user_id": "mocked_id",
+                    "name": "b",
+                    "description": "Mocked",
+                    "priority": "High",
+                },
+            ],
+            ordered=False,
+        )
+
+
+def test_import_tasks_csv_missing_columns():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        with pytest.raises(InvalidImportFile):
+            tasks.import_tasks(
+                email=MOCKED_EMAIL,
+                tasks_file=io.BytesIO(b"name,priority\na,Low\n"),
+                file_format="csv",
+                token=MOCKED_TOKEN,
+            )
+
+
+def test_import_tasks_duplicate_key_error():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find.return_value = []
+        tasks._tasks_collection.insert_many.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": 11000}]}
+        )
+        response = tasks.import_tasks(
+            email=MOCKED_EMAIL,
+            tasks_file=io.BytesIO(MOCKED_CSV),
+            file_format="csv",
+            token=MOCKED_TOKEN,
+        )
+        assert (response["inserted"], response["skipped"]) == (1, 1)
+
+
+def test_import_tasks_route_200():
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_id = "mocked_id"
+        mocked_collection = mock_db_client.return_value["users_db"]["users_collection"]
+        mocked_collection.find_one.return_value = {"_id": mocked_id}
+        mocked_collection.find.return_value = []
+        response = test_client.patch(
+            f"/tasks/import_tasks?user_email={MOCKED_EMAIL}",
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+            files={"file": ("tasks.csv", MOCKED_CSV, "text/csv")},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "detail": f"Tasks imported for the user with ID {mocked_id}",
+            "inserted": 2,
+            "skipped": 0,
+            "invalid": 0,
+            "errors": [],
+        }
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock, patch
+
+from src.tasks.migration import TasksMigration
+
+MOCKED_USER_ID = "mocked_id"
+MOCKED_TASKS = [
+    {"name": "First task", "description": "", "priority": "Low"},
+    {"name": "Second task", "description": "", "priority": "High"},
+]
+
+
+def test_migrate_user_already_migrated():
+    with patch("src.tasks.migration.Database.instantiate_client"):
+        migration = TasksMigration()
+        migration._users_collection.find_one.return_value = None
+        assert migration.migrate_user(user_id=MOCKED_USER_ID) == 0
+        assert not migration._tasks_collection.bulk_write.called
+
+
+def test_migrate_user_copies_and_unsets_tasks():
+    with patch("src.tasks.migration.Database.instantiate_client"):
+        migration = TasksMigration()
+        migration._users_collection.find_one.return_value = {"tasks": MOCKED_TASKS}
+        migration._tasks_collection.bulk_write.return_value.upserted_ids = {
+            0: "first_id",
+            1: "second_id",
+        }
+        migration._users_collection.update_one.return_value.modified_count = 1
+
+        assert migration.migrate_user(user_id=MOCKED_USER_ID) == 2
+
+        operations = migration._tasks_collection.bulk_write.call_args.args[0]
+        assert [operation._filter for operation in operations] == [
+            {"user_id": MOCKED_USER_ID, "name": "First task"},
+            {"user_id": MOCKED_USER_ID, "name": "Second task"},
+        ]
+        migration._users_collection.update_one.assert_called_once_with(
+            {"_id": MOCKED_USER_ID, "tasks": MOCKED_TASKS},
+            {"$unset": {"tasks": ""}},
+        )
+
+
+def test_migrate_user_retries_when_tasks_change():
+    with patch("src.tasks.migration.Database.instantiate_client"):
+        migration = TasksMigration()
+        migration._users_collection.find_one.side_effect = [
+            {"tasks": MOCKED_TASKS},
+            {"tasks": MOCKED_TASKS[1:]},
+        ]
+        migration._tasks_collection.bulk_write.side_effect = [
+            MagicMock(upserted_ids={0: "first_id", 1: "second_id"}),
+            MagicMock(upserted_ids={}),
+        ]
+        migration._users_collection.update_one.side_effect = [
+            MagicMock(modified_count=0),
+            MagicMock(modified_count=1),
+        ]
+
+        assert migration.migrate_user(user_id=MOCKED_USER_ID) == 1
+
+        migration._tasks_collection.delete_many.assert_called_once_with(
+            {"_id": {"$in": ["first_id"]}}
+        )
+
+
+def test_migration_run_in_batches():
+    with patch("src.tasks.migration.Database.instantiate_client"):
+        migration = TasksMigration(batch_size=2)
+        cursor = migration._users_collection.find.return_value.sort.return_value
+        cursor.limit.return_value.__iter__.side_effect = [
+            iter([{"_id": 1}, {"_id": 2}]),
+            iter([{"_id": 3}]),
+            iter([]),
+        ]
+        with patch.object(migration, "migrate_user", return_value=3) as migrate:
+            assert migration.run() == {"users": 3, "tasks": 9}
+        assert [call.kwargs["user_id"] for call in migrate.call_args_list] == [1, 2, 3]
+        last_query = migration._users_collection.find.call_args.args[0]
+        assert last_query == {"tasks": {"$exists": True}, "_id": {"$gt": 3}}
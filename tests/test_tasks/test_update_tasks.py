@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.database.indexes import TASKS_NAME_INDEX
+from src.main import app
+from src.tasks.exceptions import TaskAlreadyExists, TaskDoesNotExist
+from src.tasks.schemas import TaskUpdate
+from src.tasks.service import Tasks
+
+MOCKED_EMAIL = "mocked_email"
+MOCKED_TOKEN = "mocked_token"
+MOCKED_TASK_NAME = "mocked_task_name"
+MOCKED_TASK = {"name": "new_name", "description": "mocked", "priority": "High"}
+
+
+test_client = TestClient(app)
+
+
+def test_update_task_sets_only_given_fields():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.task_events") as mock_task_events,
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find_one_and_update.return_value = MOCKED_TASK
+
+        response = tasks.update_task(
+            email=MOCKED_EMAIL,
+            task_name=MOCKED_TASK_NAME,
+            task_update=TaskUpdate(name="new_name", priority="High"),
+            token=MOCKED_TOKEN,
+        )
+
+        assert response["task"] == MOCKED_TASK
+        tasks._tasks_collection.find_one_and_update.assert_called_once_with(
+            {"user_id": "mocked_id", "name": MOCKED_TASK_NAME},
+            {"$set": {"name": "new_name", "priority": "High"}},
+            projection={"_id": 0, "user_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        tasks._users_collection.update_one.assert_called_once_with(
+            {"_id": "mocked_id"}, {"$inc": {"tasks_version": 1}}
+        )
+        mock_task_events.publish.assert_called_once_with(
+            MOCKED_EMAIL,
+            {"type": "task_updated", "name": MOCKED_TASK_NAME, "task": MOCKED_TASK},
+        )
+
+
+def test_update_task_does_not_exist():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find_one_and_update.return_value = None
+        with pytest.raises(TaskDoesNotExist):
+            tasks.update_task(
+                email=MOCKED_EMAIL,
+                task_name=MOCKED_TASK_NAME,
+                task_update=TaskUpdate(priority="High"),
+                token=MOCKED_TOKEN,
+            )
+        assert not tasks._users_collection.update_one.called
+
+
+def test_update_task_name_already_exists():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        tasks._tasks_collection.find_one_and_update.side_effect = DuplicateKeyError(
+            "E11000"
+        )
+        with pytest.raises(TaskAlreadyExists):
+            tasks.update_task(
+                email=MOCKED_EMAIL,
+                task_name=MOCKED_TASK_NAME,
+                task_update=TaskUpdate(name="new_name"),
+                token=MOCKED_TOKEN,
+            )
+
+
+def test_update_task_checks_new_name_without_unique_index():
+    with (
+        patch("src.tasks.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+        patch("src.tasks.service.missing_unique_indexes", {TASKS_NAME_INDEX}),
+    ):
+        tasks = Tasks()
+        tasks._users_collection.find_one.return_value = {"_id": "mocked_id"}
+        with pytest.raises(TaskAlreadyExists):
+            tasks.update_task(
+                email=MOCKED_EMAIL,
+                task_name=MOCKED_TASK_NAME,
+                task_update=TaskUpdate(name="new_name"),
+                token=MOCKED_TOKEN,
+            )
+        assert not tasks._tasks_collection.find_one_and_update.called
+
+
+def test_update_task_route_422():
+    with (
+        patch("src.auth.service.Database.instantiate_client"),
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        response = test_client.patch(
+            (
+                f"/tasks/update_task?user_email={MOCKED_EMAIL}"
+                f"&task_name={MOCKED_TASK_NAME}"
+            ),
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+            json={},
+        )
+        assert response.status_code == 422
+
+
+def test_update_task_route_404():
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_collection = mock_db_client.return_value["users_db"]["tasks_collection"]
+        mocked_collection.find_one.return_value = {"_id": "mocked_id"}
+        mocked_collection.find_one_and_update.return_value = None
+        response = test_client.patch(
+            (
+                f"/tasks/update_task?user_email={MOCKED_EMAIL}"
+                f"&task_name={MOCKED_TASK_NAME}"
+            ),
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+            json={"priority": "High"},
+        )
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Task does not exist"}
+
+
+def test_update_task_route_200():
+    with (
+        patch("src.auth.service.Database.instantiate_client") as mock_db_client,
+        patch("src.auth.auth.Auth.decode_token"),
+    ):
+        mocked_id = "mocked_id"
+        mocked_collection = mock_db_client.return_value["users_db"]["tasks_collection"]
+        mocked_collection.find_one.return_value = {"_id": mocked_id}
+        mocked_collection.find_one_and_update.return_value = MOCKED_TASK
+        response = test_client.patch(
+            (
+                f"/tasks/update_task?user_email={MOCKED_EMAIL}"
+                f"&task_name={MOCKED_TASK_NAME}"
+            ),
+            headers={"Authorization": f"Bearer {MOCKED_TOKEN}"},
+            json={"name": "new_name", "priority": "High"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "detail": f"Tasks updated for the user with ID {mocked_id}",
+            "task": MOCKED_TASK,
+        }
@@ -0,0 +1,97 @@
+import threading
+import time
+from unittest.mock import patch
+
+import anyio
+
+from src.utils import (
+    DB_THREADPOOL_SIZE,
+    Utils,
+    get_db_limiter,
+    iterate_in_db_pool,
+    run_in_db_pool,
+)
+
+MOCKED_EMAIL = "mocked_email"
+
+
+def test_run_in_db_pool_runs_in_worker_thread():
+    async def main():
+        return await run_in_db_pool(threading.get_ident)
+
+    assert anyio.run(main) != threading.get_ident()
+
+
+def test_run_in_db_pool_keyword_arguments():
+    async def main():
+        return await run_in_db_pool(dict, name="mocked_name")
+
+    assert anyio.run(main) == {"name": "mocked_name"}
+
+
+def test_iterate_in_db_pool_runs_in_worker_thread():
+    def blocking_iterator():
+        yield threading.get_ident()
+        yield threading.get_ident()
+
+    async def main():
+        return [item async for item in iterate_in_db_pool(blocking_iterator())]
+
+    thread_ids = anyio.run(main)
+    assert len(thread_ids) == 2
+    assert threading.get_ident() not in thread_ids
+
+
+def test_iterate_in_db_pool_closes_iterator_when_cancelled():
+    class BlockingIterator:
+        closed = False
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            time.sleep(0.01)
+            return "item"
+
+        def close(self):
+            self.closed = True
+
+    iterator = BlockingIterator()
+
+    async def consume():
+        async for _ in iterate_in_db_pool(iterator):
+            pass
+
+    async def main():
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(consume)
+            await anyio.sleep(0.05)
+            task_group.cancel_scope.cancel()
+
+    anyio.run(main)
+    assert iterator.closed
+
+
+def test_db_limiter_size():
+    async def main():
+        return get_db_limiter().total_tokens
+
+    assert anyio.run(main) == DB_THREADPOOL_SIZE
+
+
+def test_get_user_full_document():
+    with patch("src.utils.Database.instantiate_client"):
+        utils = Utils()
+        utils.get_user(user_email=MOCKED_EMAIL)
+        utils._users_collection.find_one.assert_called_once_with(
+            {"email": MOCKED_EMAIL}, None
+        )
+
+
+def test_get_user_projection():
+    with patch("src.utils.Database.instantiate_client"):
+        utils = Utils()
+        utils.get_user(user_email=MOCKED_EMAIL, projection={"_id": 1})
+        utils._users_collection.find_one.assert_called_once_with(
+            {"email": MOCKED_EMAIL}, {"_id": 1}
+        )